@@ -9,6 +9,7 @@ from fastapi.responses import HTMLResponse, StreamingResponse
 
 from ..core.logging import configure_logging
 from ..exec.order_interface import get_positions
+from ..exec.runner import current_runner
 from ..monitor import monitor
 
 app = FastAPI(title="LeekBot API")
@@ -141,6 +142,30 @@ async def positions(account: str, venue: str) -> Dict:
     return {"positions": get_positions(account, venue)}
 
 
+@app.get("/metrics")
+async def metrics() -> Dict:
+    runner = current_runner()
+    if runner is None:
+        return {"metrics": {}, "strategies": {}}
+    return {"metrics": runner.metrics.snapshot(), "strategies": runner.metrics.attribution()}
+
+
+@app.get("/metrics/equity")
+async def metrics_equity() -> Dict[str, list]:
+    runner = current_runner()
+    if runner is None:
+        return {"equity": []}
+    return {"equity": [[ts.isoformat(), value] for ts, value in runner.metrics.curve()]}
+
+
+@app.get("/metrics/latency")
+async def metrics_latency() -> Dict[str, list]:
+    runner = current_runner()
+    if runner is None or runner.budget is None:
+        return {"strategies": []}
+    return {"strategies": runner.budget.rows()}
+
+
 @app.get("/logs/today")
 async def logs() -> Dict[str, str]:
     path = Path("./logs/leekbot.log")
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from ..core.profiler import StrategyProfiler
+from ..storage.barstore import META_FILE, is_store_dir, load_bars
+from ..strat.base import load_strategy
+from .engine import BacktestEngine, BacktestResult
+from .orderbook import ExecutionModel
+from .vectorized import VectorizedBacktestEngine
+
+# bump whenever a change to the engines alters the trades or metrics they produce:
+# 4: PairsStatArb samples each pair's spread once both legs have a new close
+# 5: vectorized rolling kernels accumulate in blocks, which can move values at rounding level
+# 6: the event engine hands the trailing partial higher-timeframe bar to its subscribers
+ENGINE_VERSION = "6"
+
+# strategy params naming a file whose contents, not its path, decide the result
+FILE_PARAMS = ("pairs_file",)
+
+_DIGESTS: Dict[Tuple[str, int, int], str] = {}
+
+
+def fingerprint(path: str | Path) -> str:
+    """Content id of one symbol's bars: the store segment digest, or a CSV's sha256."""
+
+    path = Path(path)
+    if is_store_dir(path):
+        meta = json.loads((path / META_FILE).read_text(encoding="utf-8"))
+        return f"segment:{meta['segment']}"
+    stat = path.stat()
+    memo = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    digest = _DIGESTS.get(memo)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for block in iter(lambda: fh.read(1 << 20), b""):
+                sha.update(block)
+        digest = _DIGESTS[memo] = f"sha256:{sha.hexdigest()}"
+    return digest
+
+
+def _strategy_spec(strategies: Dict[str, Dict]) -> Dict[str, Dict]:
+    """``strategies`` with every :data:`FILE_PARAMS` path replaced by its :func:`fingerprint`."""
+
+    return {
+        name: {
+            param: fingerprint(value) if param in FILE_PARAMS and value else value
+            for param, value in (config or {}).items()
+        }
+        for name, config in strategies.items()
+    }
+
+
+def cache_key(
+    paths: Dict[str, Path],
+    strategies: Dict[str, Dict],
+    execution: ExecutionModel | None = None,
+    vectorized: bool = False,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> str:
+    spec = {
+        "version": ENGINE_VERSION,
+        "engine": "vectorized" if vectorized else "event",
+        "data": {symbol: fingerprint(path) for symbol, path in paths.items()},
+        "range": [start, end],
+        "strategies": _strategy_spec(strategies),
+        "execution": None if vectorized else asdict(execution or ExecutionModel()),
+    }
+    blob = json.dumps(spec, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class BacktestCache:
+    """On-disk store of pickled :class:`BacktestResult` objects addressed by :func:`cache_key`.
+
+    Entries live in ``<root>/<key[:2]>/<key>.pkl``; a hit refreshes the entry's mtime and
+    writing past ``max_bytes`` evicts the least recently used entries. Lifetime hit/miss counts
+    are kept in ``stats.json`` next to them, :attr:`session` counts this instance only.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int = 1 << 30) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.session = CacheStats()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.pkl"
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def _entries(self) -> List[Path]:
+        return list(self.root.glob("*/*.pkl")) if self.root.exists() else []
+
+    def _bump(self, **counts: int) -> None:
+        for name, value in counts.items():
+            setattr(self.session, name, getattr(self.session, name) + value)
+        totals = asdict(self.stats())
+        for name, value in counts.items():
+            totals[name] += value
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / "stats.json").write_text(json.dumps(totals), encoding="utf-8")
+
+    def stats(self) -> CacheStats:
+        path = self.root / "stats.json"
+        if not path.exists():
+            return CacheStats()
+        return CacheStats(**json.loads(path.read_text(encoding="utf-8")))
+
+    def size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def get(self, key: str) -> BacktestResult | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                result = pickle.load(fh)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            self._bump(misses=1)
+            return None
+        os.utime(path)
+        self._bump(hits=1)
+        return result
+
+    def put(self, key: str, result: BacktestResult) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_suffix(".tmp")
+        with open(staging, "wb") as fh:
+            pickle.dump(result, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(staging, path)
+        self.evict()
+
+    def evict(self) -> int:
+        entries = [(entry.stat(), entry) for entry in self._entries()]
+        total = sum(stat.st_size for stat, _ in entries)
+        removed = 0
+        for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= stat.st_size
+            removed += 1
+        if removed:
+            self._bump(evictions=removed)
+        return removed
+
+    def clear(self) -> None:
+        for entry in self._entries():
+            entry.unlink()
+        (self.root / "stats.json").unlink(missing_ok=True)
+
+
+def run_backtest(
+    paths: Dict[str, Path],
+    strategies: Dict[str, Dict],
+    execution: ExecutionModel | None = None,
+    vectorized: bool = False,
+    cache: BacktestCache | None = None,
+    profiler: StrategyProfiler | None = None,
+    checkpoints: str | Path | None = None,
+    checkpoint_every: int = 10_000,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> Tuple[BacktestResult, bool]:
+    """Backtest ``strategies`` (name -> config) over ``paths``; returns ``(result, cache_hit)``.
+
+    Only the bars with ``start <= timestamp <= end`` are loaded, when those bounds are given.
+
+    With a cache, a hit skips loading the bars and running the engine entirely. Profiled runs
+    always execute (and are not stored) since the profile is what they are for. With a
+    ``checkpoints`` directory the event engine checkpoints there under the run's cache key, and
+    an interrupted identical run resumes from its last checkpoint, which is removed on success.
+    """
+
+    if profiler is not None:
+        cache = None
+    if vectorized:
+        checkpoints = None
+    key = None
+    if cache is not None or checkpoints is not None:
+        key = cache_key(paths, strategies, execution, vectorized, start, end)
+    if cache is not None and key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, True
+    data = {symbol: load_bars(path, start, end) for symbol, path in paths.items()}
+    checkpoint = Path(checkpoints) / f"{key}.ckpt" if checkpoints is not None else None
+    engine: Any
+    if checkpoint is not None and checkpoint.exists():
+        engine = BacktestEngine.resume(checkpoint, data, profiler)
+    else:
+        strats = {name: load_strategy(name, dict(cfg or {})) for name, cfg in strategies.items()}
+        if vectorized:
+            engine = VectorizedBacktestEngine(data, strats)
+        else:
+            engine = BacktestEngine(data, strats, execution=execution, profiler=profiler)
+    if checkpoint is not None:
+        result = engine.run(checkpoint=checkpoint, checkpoint_every=checkpoint_every)
+        checkpoint.unlink(missing_ok=True)
+    else:
+        result = engine.run()
+    if cache is not None and key is not None:
+        cache.put(key, result)
+    return result, False
@@ -1,78 +1,403 @@
 from __future__ import annotations
 
-import csv
-from dataclasses import dataclass
+import copy
+import os
+import pickle
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Tuple
 
-from ..core.dataframe import MiniDataFrame
-from ..strat.base import Strategy, load_strategy
-from .metrics import Metrics
+import numpy as np
+
+from ..core.cross_section import CrossSection
+from ..core.dataframe import (
+    BarFrame,
+    MiniDataFrame,
+    as_bar_frame,
+    to_epoch_ns,
+)
+from ..core.events import Bar, BarSlice
+from ..core.features import FeatureStore
+from ..core.profiler import StrategyProfiler
+from ..core.resample import Resampler
+from ..storage.barstore import BarStore, load_bars
+from ..strat.base import Strategy, batched, load_strategy
+from .metrics import MetricsAccumulator
+from .orderbook import ExecutionModel, Fill, OrderBook
+from .timeline import Timeline
+
+# bump whenever the engine state captured by a checkpoint changes shape
+CHECKPOINT_VERSION = 4
 
 
 @dataclass
 class BacktestResult:
     trades: List[Dict]
     metrics: Dict[str, float]
+    attribution: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    equity_curve: List[Tuple[datetime, float]] = field(default_factory=list)
+
+
+def _bound_store(strategy: object) -> FeatureStore | None:
+    """The shared store ``strategy`` was bound to by an engine or runner, if any."""
+
+    if getattr(strategy, "_owns_features", True):
+        return None
+    return getattr(strategy, "feature_store", None)
 
 
 class BacktestEngine:
-    def __init__(self, data: Dict[str, MiniDataFrame], strategies: Dict[str, Strategy]) -> None:
-        self.data = data
+    """Event-driven replay of ``data`` through ``strategies``.
+
+    The whole replay state (timeline cursors, strategies, resting orders, positions, cash, trades
+    and metrics) lives on the engine, so :meth:`run` can stop at ``until`` and be called again to
+    continue, :meth:`checkpoint` can write it to disk for :meth:`resume`, and :meth:`fork` can
+    copy a warmed-up engine into independent variants.
+
+    Cross-sectional strategies (see :class:`~leekbot.strat.base.CrossSectionalStrategy`) get
+    :attr:`section`, the latest bar of every symbol, once per timestamp instead of the bars;
+    strategies that implement ``on_bars`` get each timestamp's bars in one call.
+    """
+
+    def __init__(
+        self,
+        data: Dict[str, BarFrame | MiniDataFrame],
+        strategies: Dict[str, Strategy],
+        equity: float = 100000.0,
+        positions: Dict[str, float] | None = None,
+        metrics: MetricsAccumulator | None = None,
+        execution: ExecutionModel | None = None,
+        profiler: StrategyProfiler | None = None,
+        calendar: str | None = None,
+    ) -> None:
+        self.data: Dict[str, BarFrame] = {
+            symbol: as_bar_frame(frame) for symbol, frame in data.items()
+        }
         self.strategies = strategies
         self.trades: List[Dict] = []
-        self.equity = 100000.0
+        self.equity = equity
+        self.positions: Dict[str, float] = {sym: 0 for sym in self.data}
+        self.positions.update(positions or {})
+        self.metrics = metrics if metrics is not None else MetricsAccumulator(equity)
+        self.book = OrderBook(execution)
+        self.profiler = profiler
+        # strategies as the run loop calls them: timed proxies only when profiling
+        self._dispatch = strategies if profiler is None else profiler.wrap_all(strategies)
+        self.cursors: List[int] = [0] * len(self.data)
+        self.last_bar: Dict[str, Dict] = {}
+        self.warmup_until: int | None = None
+        self.calendar = calendar
+        self.resampler = self._resampler()
+        # features every strategy reads, computed once per bar; a strategy carried over from an
+        # earlier engine (the next walk-forward window) brings its store and the state in it
+        carried = [store for store in map(_bound_store, strategies.values()) if store is not None]
+        self.features = carried[0] if carried else FeatureStore()
+        for strat in strategies.values():
+            if getattr(strat, "feature_specs", None) and _bound_store(strat) is not self.features:
+                strat.bind_features(self.features)
+        self.section = CrossSection(self.data) if self._cross_sectional() else None
+
+    def _cross_sectional(self) -> set:
+        return {
+            name for name, strat in self.strategies.items() if getattr(strat, "cross_sectional", 0)
+        }
+
+    def _resampler(self) -> Resampler | None:
+        """One shared resampler for every timeframe any strategy subscribed to, if any."""
 
-    def run(self) -> BacktestResult:
-        symbols = list(self.data.keys())
-        index = sorted(set().union(*[df.index for df in self.data.values()]))
-        positions: Dict[str, float] = {sym: 0 for sym in symbols}
-        for ts in index:
+        wanted = [
+            tf for strat in self.strategies.values() for tf in getattr(strat, "timeframes", ())
+        ]
+        if not wanted:
+            return None
+        resampler = Resampler(wanted, self.calendar)
+        # bars are taken to span the smallest gap between them
+        gaps = [np.diff(frame.epochs[:1024]) for frame in self.data.values()]
+        spans = [int(gap[gap > 0].min()) for gap in gaps if np.any(gap > 0)]
+        if spans:
+            resampler.base_ns = min(spans)
+        return resampler
+
+    def _apply_fill(self, fill: Fill, ts: datetime) -> None:
+        order = fill.order
+        trade = {
+            "timestamp": ts,
+            "symbol": order.symbol,
+            "side": order.side,
+            "qty": fill.qty,
+            "price": fill.price,
+            "strategy": order.strategy,
+            "commission": fill.commission,
+        }
+        self.trades.append(trade)
+        qty = fill.qty if order.side == "BUY" else -fill.qty
+        self.positions[order.symbol] = self.positions.get(order.symbol, 0) + qty
+        self.equity -= qty * fill.price + fill.commission
+        self.metrics.on_fill(
+            order.strategy, order.symbol, order.side, fill.qty, fill.price, fill.commission
+        )
+        strat = self._dispatch.get(order.strategy)
+        if strat is not None:
+            strat.on_fill(dict(trade), {"equity": self.equity, "positions": self.positions})
+
+    def run(
+        self,
+        trade_from: datetime | int | None = None,
+        until: datetime | int | None = None,
+        checkpoint: str | Path | None = None,
+        checkpoint_every: int = 10_000,
+    ) -> BacktestResult:
+        """Replay the remaining bars through the strategies.
+
+        Orders go through :attr:`book`: market orders and limit/stop orders already through their
+        price fill at the bar close, the rest wait for a later bar's range to reach them. Bars
+        before ``trade_from`` only warm the strategies up: their orders are discarded and they
+        are not marked into :attr:`metrics`.
+
+        The replay stops before the first timestamp at or after ``until``; a later call carries
+        on from there. With ``checkpoint`` the state is written to that path every
+        ``checkpoint_every`` timestamps.
+
+        When the data ends inside a higher-timeframe bucket, the partial bar is passed to its
+        subscribers after the last timestamp, as a live feed's final flush would.
+        """
+
+        timeline = Timeline(self.data, self.cursors)
+        self.cursors = timeline.cursors
+        symbols = timeline.symbols
+        frames = timeline.frames
+        positions = self.positions
+        metrics = self.metrics
+        book = self.book
+        last_bar = self.last_bar
+        if trade_from is not None:
+            self.warmup_until = _epoch(trade_from)
+        warmup_until = self.warmup_until
+        until_epoch = None if until is None else _epoch(until)
+        resampler = self.resampler
+        features = self.features if len(self.features) else None
+        section = self.section
+        cross = self._cross_sectional()
+        batch = {name for name, strat in self.strategies.items() if batched(strat)}
+        subscribed = {
+            name: set(getattr(strat, "timeframes", ())) for name, strat in self.strategies.items()
+        }
+        countdown = checkpoint_every
+        for epoch, members in timeline.iterate(until_epoch):
+            first_slot, first_row = members[0]
+            ts = frames[first_slot].timestamp(first_row)
+            bars: List[Bar] = []
+            for slot, row in members:
+                bar = timeline.bar(slot, row, ts)
+                last_bar[symbols[slot]] = bar
+                bars.append(bar)
+                if features is not None:
+                    features.update(bar)
+            if section is not None:
+                section.begin(epoch)
+                section.write([slot for slot, _ in members], bars)
+            higher: List[Bar] = []
+            if resampler is not None:
+                for bar in bars:
+                    for done in resampler.update(
+                        bar["symbol"],
+                        epoch,
+                        bar["open"],
+                        bar["high"],
+                        bar["low"],
+                        bar["close"],
+                        bar["volume"],
+                    ):
+                        higher.append(done.to_bar())
+            trading = warmup_until is None or epoch >= warmup_until
+            if trading:
+                for bar in bars:
+                    metrics.mark(bar["symbol"], bar["close"])
+                    if book.orders:
+                        for fill in book.match(bar["symbol"], bar):
+                            self._apply_fill(fill, ts)
             account_state = {"equity": self.equity, "positions": positions}
-            for name, strat in self.strategies.items():
-                for symbol in symbols:
-                    if ts not in self.data[symbol].index:
-                        continue
-                    bar = dict(self.data[symbol].loc[ts])
-                    bar["symbol"] = symbol
-                    strat.on_bar(bar, account_state)
+            bar_slice = BarSlice(ts, bars) if batch else None
+            for name, strat in self._dispatch.items():
+                if name in cross:
+                    strat.on_cross_section(section, account_state)
+                elif name in batch:
+                    strat.on_bars(bar_slice, account_state)
+                else:
+                    for bar in bars:
+                        strat.on_bar(bar, account_state)
+                if higher and subscribed[name]:
+                    for bar in higher:
+                        if bar["timeframe"] in subscribed[name]:
+                            strat.on_bar(bar, account_state)
                 intents = strat.get_orders()
+                if not trading:
+                    continue
                 for intent in intents:
-                    price = bar["close"] if intent.price is None else intent.price
-                    trade = {
-                        "timestamp": ts,
-                        "symbol": intent.symbol,
-                        "side": intent.side,
-                        "qty": intent.qty,
-                        "price": price,
-                        "strategy": name,
-                    }
-                    self.trades.append(trade)
-                    qty = intent.qty if intent.side == "BUY" else -intent.qty
-                    positions[intent.symbol] = positions.get(intent.symbol, 0) + qty
-                    self.equity -= qty * price
-        metrics = Metrics(self.trades).compute()
-        return BacktestResult(self.trades, metrics)
+                    _, fills = book.submit(name, intent, last_bar.get(intent.symbol))
+                    for fill in fills:
+                        self._apply_fill(fill, ts)
+            if trading:
+                metrics.sample(epoch)
+            if checkpoint is not None:
+                countdown -= 1
+                if countdown <= 0:
+                    self.checkpoint(checkpoint)
+                    countdown = checkpoint_every
+        if resampler is not None and resampler.open and self.finished:
+            self._flush_higher([done.to_bar() for done in resampler.flush()], subscribed)
+        return BacktestResult(
+            self.trades, metrics.snapshot(), metrics.attribution(), metrics.curve()
+        )
+
+    def _flush_higher(self, higher: List[Bar], subscribed: Dict[str, set]) -> None:
+        """Hand the buckets still open at the end of the data to their subscribers."""
+
+        ts = max(bar["timestamp"] for bar in self.last_bar.values())
+        trading = self.warmup_until is None or _epoch(ts) >= self.warmup_until
+        account_state = {"equity": self.equity, "positions": self.positions}
+        for name, strat in self._dispatch.items():
+            wanted = [bar for bar in higher if bar["timeframe"] in subscribed[name]]
+            if not wanted:
+                continue
+            for bar in wanted:
+                strat.on_bar(bar, account_state)
+            intents = strat.get_orders()
+            if not trading:
+                continue
+            for intent in intents:
+                _, fills = self.book.submit(name, intent, self.last_bar.get(intent.symbol))
+                for fill in fills:
+                    self._apply_fill(fill, ts)
+
+    @property
+    def finished(self) -> bool:
+        return all(pos >= len(frame) for pos, frame in zip(self.cursors, self.data.values()))
+
+    def _layout(self) -> Dict[str, Tuple[int, int, int]]:
+        # enough to tell whether a checkpoint's cursors index into the same bars
+        return {
+            symbol: (
+                (len(frame), int(frame.epochs[0]), int(frame.epochs[-1]))
+                if len(frame)
+                else (0, 0, 0)
+            )
+            for symbol, frame in self.data.items()
+        }
+
+    def state(self) -> Dict[str, Any]:
+        """Everything :meth:`run` mutates; the bar data is not part of it."""
+
+        return {
+            "version": CHECKPOINT_VERSION,
+            "layout": self._layout(),
+            "cursors": list(self.cursors),
+            "warmup_until": self.warmup_until,
+            "last_bar": self.last_bar,
+            "strategies": self.strategies,
+            "book": self.book,
+            "positions": self.positions,
+            "equity": self.equity,
+            "trades": self.trades,
+            "metrics": self.metrics,
+            "calendar": self.calendar,
+            "resampler": self.resampler,
+            "features": self.features,
+            "section": self.section,
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {state.get('version')}")
+        if state["layout"] != self._layout():
+            raise ValueError("Checkpoint was taken over different bar data")
+        self.cursors = list(state["cursors"])
+        self.warmup_until = state["warmup_until"]
+        self.last_bar = state["last_bar"]
+        self.strategies = state["strategies"]
+        self.book = state["book"]
+        self.positions = state["positions"]
+        self.equity = state["equity"]
+        self.trades = state["trades"]
+        self.metrics = state["metrics"]
+        self.calendar = state["calendar"]
+        self.resampler = state["resampler"]
+        self.features = state["features"]
+        self.section = state["section"]
+        profiler = self.profiler
+        self._dispatch = self.strategies if profiler is None else profiler.wrap_all(self.strategies)
+
+    def checkpoint(self, path: str | Path) -> None:
+        """Atomically write :meth:`state` to ``path``; a crash mid-write keeps the previous one."""
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_suffix(path.suffix + ".tmp")
+        with open(staging, "wb") as fh:
+            # one pickle, so shared references (book.bar is a last_bar entry) stay shared
+            pickle.dump(self.state(), fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(staging, path)
+
+    @classmethod
+    def resume(
+        cls,
+        path: str | Path,
+        data: Dict[str, BarFrame | MiniDataFrame],
+        profiler: StrategyProfiler | None = None,
+    ) -> BacktestEngine:
+        """Rebuild an engine from a :meth:`checkpoint` over the same ``data``; ``run()`` continues."""
+
+        with open(path, "rb") as fh:
+            state = pickle.load(fh)
+        engine = cls(data, {}, profiler=profiler)
+        engine.restore(state)
+        return engine
+
+    def fork(self, overrides: Dict[str, Dict] | None = None) -> BacktestEngine:
+        """Independent copy of this engine at its current position, sharing only the bar data.
+
+        ``overrides`` maps strategy names to parameters set on the copied (already warmed-up)
+        strategy. Only parameters read on every bar, such as thresholds, take effect this way;
+        ones that size internal buffers when the strategy is built need a fresh run.
+        """
+
+        engine = BacktestEngine(self.data, {}, profiler=self.profiler)
+        engine.restore(copy.deepcopy(self.state()))
+        for name, params in (overrides or {}).items():
+            strat = engine.strategies[name]
+            strat.config = {**strat.config, **params}
+            for key, value in params.items():
+                setattr(strat, key, value)
+        return engine
 
     @classmethod
-    def from_csv(cls, paths: Dict[str, Path], strategies: Dict[str, Dict]) -> BacktestEngine:
-        data: Dict[str, MiniDataFrame] = {}
-        for symbol, path in paths.items():
-            with open(path, encoding="utf-8") as fh:
-                reader = csv.DictReader(fh)
-                rows: List[Dict[str, float]] = []
-                index: List[datetime] = []
-                for row in reader:
-                    ts = datetime.fromisoformat(row[reader.fieldnames[0]])
-                    index.append(ts)
-                    rows.append(
-                        {
-                            key: float(value)
-                            for key, value in row.items()
-                            if key != reader.fieldnames[0]
-                        }
-                    )
-                data[symbol] = MiniDataFrame(rows, index)
+    def from_csv(
+        cls,
+        paths: Dict[str, Path],
+        strategies: Dict[str, Dict],
+        execution: ExecutionModel | None = None,
+    ) -> BacktestEngine:
+        """Build an engine from CSV files or bar store symbol directories."""
+
+        data = {symbol: load_bars(path) for symbol, path in paths.items()}
+        strats = {name: load_strategy(name, cfg) for name, cfg in strategies.items()}
+        return cls(data, strats, execution=execution)
+
+    @classmethod
+    def from_store(
+        cls,
+        root: str | Path,
+        strategies: Dict[str, Dict],
+        symbols: List[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> BacktestEngine:
+        store = BarStore(root)
+        data = {symbol: store.open(symbol, start, end) for symbol in symbols or store.symbols()}
         strats = {name: load_strategy(name, cfg) for name, cfg in strategies.items()}
         return cls(data, strats)
+
+
+def _epoch(value: datetime | int) -> int:
+    return value if isinstance(value, int) else to_epoch_ns(value)
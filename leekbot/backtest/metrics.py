@@ -1,44 +1,305 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..core.dataframe import from_epoch_ns, to_epoch_ns
+
+_NS_PER_YEAR = 365.25 * 24 * 3600 * 1e9
+
+
+@dataclass(slots=True)
+class StrategyBook:
+    """Cash, inventory and realized results of the fills attributed to one strategy."""
+
+    cash: float = 0.0
+    positions: Dict[str, float] = field(default_factory=dict)
+    avg_price: Dict[str, float] = field(default_factory=dict)
+    realized: float = 0.0
+    commission: float = 0.0
+    notional: float = 0.0
+    fills: int = 0
+    wins: int = 0
+    losses: int = 0
+
+    def fill(self, symbol: str, qty: float, price: float, commission: float) -> float:
+        """Apply a signed fill and return the PnL it realized (net of ``commission``)."""
+
+        held = self.positions.get(symbol, 0.0)
+        avg = self.avg_price.get(symbol, price)
+        realized = -commission
+        if held and (held > 0) != (qty > 0):
+            closed = min(abs(qty), abs(held))
+            realized += closed * (price - avg) * (1 if held > 0 else -1)
+        total = held + qty
+        if total == 0:
+            self.avg_price.pop(symbol, None)
+        elif held == 0 or (held > 0) != (total > 0):
+            self.avg_price[symbol] = price
+        elif (held > 0) == (qty > 0):
+            self.avg_price[symbol] = (avg * held + price * qty) / total
+        self.positions[symbol] = total
+        self.cash -= qty * price + commission
+        self.commission += commission
+        self.notional += abs(qty) * price
+        self.fills += 1
+        self.realized += realized
+        if realized > 0:
+            self.wins += 1
+        elif realized < 0:
+            self.losses += 1
+        return realized
+
+    def pnl(self, marks: Dict[str, float]) -> float:
+        value = sum(qty * marks.get(symbol, 0.0) for symbol, qty in self.positions.items() if qty)
+        return self.cash + value
+
+
+class MetricsAccumulator:
+    """Constant-memory running performance statistics over fills and mark-to-market samples.
+
+    :meth:`on_fill` books a fill against its strategy, :meth:`mark` moves a symbol's price and
+    :meth:`sample` records the marked account equity for a timestamp. Returns between samples feed
+    a Welford mean/variance (plus a downside sum for Sortino) and a running peak tracks drawdown
+    depth and duration, so :meth:`snapshot` costs O(strategies) however long the run. The equity
+    curve keeps at most ``max_points`` samples by halving its resolution whenever it fills up.
+
+    Annualization uses ``periods_per_year`` if given, otherwise the observed sampling rate.
+    """
+
+    def __init__(
+        self,
+        equity: float = 100000.0,
+        periods_per_year: float | None = None,
+        max_points: int = 4096,
+    ) -> None:
+        self.start_equity = equity
+        self.periods_per_year = periods_per_year
+        self.max_points = max_points
+        self.cash = equity
+        self.positions: Dict[str, float] = {}
+        self.marks: Dict[str, float] = {}
+        self.books: Dict[str, StrategyBook] = {}
+        self.equity_curve: List[Tuple[int, float]] = []
+        self._stride = 1
+        self._value = 0.0
+        self._last_equity = equity
+        self._samples = 0
+        self._returns = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._downside = 0.0
+        self._first_ts: int | None = None
+        self._last_ts: int | None = None
+        self._peak = equity
+        self._peak_ts: int | None = None
+        self._max_dd = 0.0
+        self._max_dd_pct = 0.0
+        self._max_dd_ns = 0
+        self._notional = 0.0
+        self._fills = 0
+        self._wins = 0
+        self._losses = 0
+
+    @property
+    def equity(self) -> float:
+        """Current marked equity, including fills and marks not yet sampled."""
+
+        return self.cash + self._value
+
+    def on_fill(
+        self,
+        strategy: str,
+        symbol: str,
+        side: str,
+        qty: float,
+        price: float,
+        commission: float = 0.0,
+    ) -> float:
+        signed = qty if side.upper() == "BUY" else -qty
+        book = self.books.get(strategy)
+        if book is None:
+            book = self.books[strategy] = StrategyBook()
+        realized = book.fill(symbol, signed, price, commission)
+        if symbol not in self.marks:
+            self.marks[symbol] = price
+        self.positions[symbol] = self.positions.get(symbol, 0.0) + signed
+        self.cash -= signed * price + commission
+        self._value += signed * self.marks[symbol]
+        self._notional += abs(signed) * price
+        self._fills += 1
+        if realized > 0:
+            self._wins += 1
+        elif realized < 0:
+            self._losses += 1
+        return realized
+
+    def mark(self, symbol: str, price: float) -> None:
+        held = self.positions.get(symbol)
+        if held:
+            self._value += held * (price - self.marks[symbol])
+        self.marks[symbol] = price
+
+    def sample(self, timestamp: datetime | int) -> float:
+        ts = int(timestamp) if isinstance(timestamp, (int, np.integer)) else to_epoch_ns(timestamp)
+        equity = self.cash + self._value
+        if self._first_ts is None:
+            self._first_ts = ts
+            self._peak_ts = ts
+        if self._last_equity > 0:
+            ret = equity / self._last_equity - 1.0
+            self._returns += 1
+            delta = ret - self._mean
+            self._mean += delta / self._returns
+            self._m2 += delta * (ret - self._mean)
+            if ret < 0:
+                self._downside += ret * ret
+        self._last_equity = equity
+        self._last_ts = ts
+        if equity >= self._peak:
+            self._peak = equity
+            self._peak_ts = ts
+        else:
+            drawdown = equity - self._peak
+            if drawdown < self._max_dd:
+                self._max_dd = drawdown
+            if self._peak > 0 and drawdown / self._peak < self._max_dd_pct:
+                self._max_dd_pct = drawdown / self._peak
+            if ts - self._peak_ts > self._max_dd_ns:
+                self._max_dd_ns = ts - self._peak_ts
+        if self._samples % self._stride == 0:
+            self._record(ts, equity)
+        self._samples += 1
+        return equity
+
+    def sample_batch(self, epochs: np.ndarray, equity: np.ndarray) -> None:
+        """Fold a whole equity series into the running statistics in O(1) Python calls.
+
+        Produces the same statistics as calling :meth:`sample` for each element, for engines that
+        already hold the marked equity path as an array.
+        """
+
+        epochs = np.asarray(epochs, dtype=np.int64)
+        equity = np.asarray(equity, dtype=np.float64)
+        n = len(equity)
+        if n == 0:
+            return
+        if self._first_ts is None:
+            self._first_ts = int(epochs[0])
+            self._peak_ts = int(epochs[0])
+        previous = np.concatenate(([self._last_equity], equity[:-1]))
+        valid = previous > 0
+        returns = equity[valid] / previous[valid] - 1.0
+        if len(returns):
+            count = len(returns)
+            mean = float(returns.mean())
+            m2 = float(np.sum((returns - mean) ** 2))
+            total = self._returns + count
+            delta = mean - self._mean
+            self._mean += delta * count / total
+            self._m2 += m2 + delta * delta * self._returns * count / total
+            self._returns = total
+            self._downside += float(np.sum(np.minimum(returns, 0.0) ** 2))
+
+        peaks = np.maximum.accumulate(np.concatenate(([self._peak], equity)))[1:]
+        drawdowns = equity - peaks
+        self._max_dd = min(self._max_dd, float(drawdowns.min()))
+        positive = peaks > 0
+        if positive.any():
+            self._max_dd_pct = min(
+                self._max_dd_pct, float((drawdowns[positive] / peaks[positive]).min())
+            )
+        at_peak = equity >= peaks
+        last_peak = np.maximum.accumulate(np.where(at_peak, np.arange(n), -1))
+        peak_ts = np.where(last_peak >= 0, epochs[np.maximum(last_peak, 0)], self._peak_ts)
+        self._max_dd_ns = max(self._max_dd_ns, int(np.max(epochs - peak_ts)))
+        self._peak = float(peaks[-1])
+        self._peak_ts = int(peak_ts[-1])
+
+        counts = self._samples + np.arange(n)
+        keep = np.flatnonzero(counts % self._stride == 0)
+        for pos in keep.tolist():
+            if (self._samples + pos) % self._stride == 0:
+                self._record(int(epochs[pos]), float(equity[pos]))
+        self._samples += n
+        self._last_equity = float(equity[-1])
+        self._last_ts = int(epochs[-1])
+
+    def _record(self, ts: int, equity: float) -> None:
+        self.equity_curve.append((ts, equity))
+        if len(self.equity_curve) > self.max_points:
+            self.equity_curve = self.equity_curve[::2]
+            self._stride *= 2
+
+    def _annualization(self) -> float:
+        if self.periods_per_year is not None:
+            return self.periods_per_year
+        if self._first_ts is None or self._last_ts is None or self._last_ts <= self._first_ts:
+            return 252.0
+        return (self._samples - 1) / ((self._last_ts - self._first_ts) / _NS_PER_YEAR)
+
+    def snapshot(self) -> Dict[str, float]:
+        equity = self.cash + self._value
+        scale = math.sqrt(self._annualization())
+        std = math.sqrt(self._m2 / self._returns) if self._returns else 0.0
+        downside = math.sqrt(self._downside / self._returns) if self._returns else 0.0
+        closed = self._wins + self._losses
+        return {
+            "pnl": equity - self.start_equity,
+            "equity": equity,
+            "return": equity / self.start_equity - 1.0 if self.start_equity else 0.0,
+            "sharpe": self._mean / std * scale if std > 0 else 0.0,
+            "sortino": self._mean / downside * scale if downside > 0 else 0.0,
+            "volatility": std * scale,
+            "max_dd": self._max_dd,
+            "max_dd_pct": self._max_dd_pct,
+            "max_dd_duration": self._max_dd_ns / 1e9,
+            "win_rate": self._wins / closed if closed else 0.0,
+            "fills": float(self._fills),
+            "turnover": self._notional / self.start_equity if self.start_equity else 0.0,
+            "samples": float(self._samples),
+        }
+
+    def attribution(self) -> Dict[str, Dict[str, float]]:
+        result: Dict[str, Dict[str, float]] = {}
+        for name, book in self.books.items():
+            closed = book.wins + book.losses
+            result[name] = {
+                "pnl": book.pnl(self.marks),
+                "realized": book.realized,
+                "commission": book.commission,
+                "fills": float(book.fills),
+                "turnover": book.notional / self.start_equity if self.start_equity else 0.0,
+                "win_rate": book.wins / closed if closed else 0.0,
+            }
+        return result
+
+    def curve(self) -> List[Tuple[datetime, float]]:
+        return [(from_epoch_ns(ts), equity) for ts, equity in self.equity_curve]
 
 
 @dataclass
 class Metrics:
+    """Summary statistics of a finished trade list, marking each symbol at its latest fill."""
+
     trades: List[Dict]
+    equity: float = 100000.0
 
     def compute(self) -> Dict[str, float]:
-        if not self.trades:
-            return {"pnl": 0.0, "sharpe": 0.0, "max_dd": 0.0, "win_rate": 0.0}
-        pnl_values = []
+        acc = MetricsAccumulator(self.equity)
         for trade in self.trades:
-            sign = 1 if trade["side"].upper() == "SELL" else -1
-            pnl_values.append(sign * trade["price"] * trade["qty"])
-        total_pnl = sum(pnl_values)
-        mean = total_pnl / len(pnl_values)
-        variance = sum((p - mean) ** 2 for p in pnl_values) / max(len(pnl_values), 1)
-        std = variance**0.5 or 1e-9
-        sharpe = mean / std * (252**0.5)
-        cumulative = []
-        running = 0.0
-        max_peak = float("-inf")
-        max_drawdown = 0.0
-        wins = 0
-        for pnl in pnl_values:
-            running += pnl
-            cumulative.append(running)
-            if pnl > 0:
-                wins += 1
-            if running > max_peak:
-                max_peak = running
-            drawdown = running - max_peak
-            if drawdown < max_drawdown:
-                max_drawdown = drawdown
-        win_rate = wins / len(pnl_values)
-        return {
-            "pnl": float(total_pnl),
-            "sharpe": float(sharpe),
-            "max_dd": float(max_drawdown),
-            "win_rate": float(win_rate),
-        }
+            acc.mark(trade["symbol"], trade["price"])
+            acc.on_fill(
+                trade.get("strategy", ""),
+                trade["symbol"],
+                trade["side"],
+                trade["qty"],
+                trade["price"],
+                trade.get("commission", 0.0),
+            )
+            acc.sample(trade["timestamp"])
+        return acc.snapshot()
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Tuple
+
+from ..core.utils import OrderIntent
+
+
+@dataclass(slots=True)
+class ExecutionModel:
+    """Slippage, commission and partial-fill assumptions for simulated fills.
+
+    ``slippage_bps`` moves market and stop fills against the order; limit fills never trade
+    through their limit. Each fill pays ``commission_per_unit * qty + commission_pct * notional``
+    but at least ``min_commission``. ``participation`` caps the quantity filled per bar at that
+    fraction of the bar's volume (``None`` fills in full); the remainder keeps resting.
+    """
+
+    slippage_bps: float = 0.0
+    commission_per_unit: float = 0.0
+    commission_pct: float = 0.0
+    min_commission: float = 0.0
+    participation: float | None = None
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any] | None) -> ExecutionModel:
+        return cls(**(raw or {}))
+
+    def slip(self, side: str, price: float) -> float:
+        if not self.slippage_bps:
+            return price
+        shift = price * self.slippage_bps / 10_000
+        return price + shift if side == "BUY" else price - shift
+
+    def commission(self, qty: float, price: float) -> float:
+        fee = self.commission_per_unit * qty + self.commission_pct * qty * price
+        return max(fee, self.min_commission) if qty else 0.0
+
+    def capacity(self, volume: float) -> float:
+        return float("inf") if self.participation is None else self.participation * volume
+
+
+@dataclass(slots=True)
+class PendingOrder:
+    order_id: int
+    strategy: str
+    symbol: str
+    side: str
+    qty: float
+    order_type: str
+    limit: float | None = None
+    stop: float | None = None
+    tag: str | None = None
+    filled: float = 0.0
+    active: bool = True
+
+    @property
+    def remaining(self) -> float:
+        return self.qty - self.filled
+
+
+@dataclass(slots=True)
+class Fill:
+    order: PendingOrder
+    qty: float
+    price: float
+    commission: float
+
+
+_Entry = Tuple[float, int, PendingOrder]
+
+
+@dataclass(slots=True)
+class _SymbolBook:
+    # heaps are keyed so the order closest to triggering is always on top
+    buy_limit: List[_Entry] = field(default_factory=list)  # highest limit first
+    sell_limit: List[_Entry] = field(default_factory=list)  # lowest limit first
+    buy_stop: List[_Entry] = field(default_factory=list)  # lowest stop first
+    sell_stop: List[_Entry] = field(default_factory=list)  # highest stop first
+    market: Deque[PendingOrder] = field(default_factory=deque)
+    bar: Dict[str, float] | None = None
+    available: float = 0.0
+
+
+class OrderBook:
+    """Resting simulated orders per symbol, indexed by trigger price.
+
+    Limit and stop orders sit in four heaps per symbol (buy/sell x limit/stop), so matching a bar
+    only pops the orders its high/low actually reached: O(k log n) for k fills among n resting
+    orders, and nothing at all for symbols without a bar. Cancelled orders are dropped lazily
+    when they surface. Stop-limit orders (``stop_limit`` with ``stop`` and ``price``) move to the
+    limit heaps once triggered.
+    """
+
+    def __init__(self, execution: ExecutionModel | None = None) -> None:
+        self.execution = execution or ExecutionModel()
+        self.books: Dict[str, _SymbolBook] = {}
+        self.orders: Dict[int, PendingOrder] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def _book(self, symbol: str) -> _SymbolBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = _SymbolBook()
+        return book
+
+    def submit(
+        self, strategy: str, intent: OrderIntent, last_bar: Dict[str, float] | None
+    ) -> Tuple[PendingOrder, List[Fill]]:
+        """Accept an order; it fills at once if marketable against ``last_bar``, else rests."""
+
+        self._seq += 1
+        order_type = intent.order_type.lower()
+        if order_type not in ("limit", "stop", "stop_limit"):
+            order_type = "market"
+        limit = intent.price if order_type in ("limit", "stop_limit") else None
+        stop = None
+        if order_type in ("stop", "stop_limit"):
+            stop = intent.stop if intent.stop is not None else intent.price
+        order = PendingOrder(
+            self._seq,
+            strategy,
+            intent.symbol,
+            intent.side.upper(),
+            intent.qty,
+            order_type,
+            limit,
+            stop,
+            intent.tag,
+        )
+        book = self._book(order.symbol)
+        fills: List[Fill] = []
+        if last_bar is not None:
+            if book.bar is not last_bar:
+                self._open_bar(book, last_bar)
+            close = last_bar["close"]
+            if order.stop is not None and self._stop_hit(order, close, close):
+                self._trigger(order)
+            if order.order_type == "market":
+                self._fill(book, order, close, fills, slip=True)
+            elif order.order_type == "limit" and self._limit_hit(order, close, close):
+                self._fill(book, order, close, fills, slip=False)
+        if order.remaining > 0:
+            self.orders[order.order_id] = order
+            self._rest(book, order)
+        return order, fills
+
+    def cancel(self, order_id: int) -> bool:
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        order.active = False
+        return True
+
+    def match(self, symbol: str, bar: Dict[str, float]) -> List[Fill]:
+        """Fill the resting orders of ``symbol`` that ``bar`` trades through."""
+
+        book = self._book(symbol)
+        self._open_bar(book, bar)
+        fills: List[Fill] = []
+        open_, high, low = bar["open"], bar["high"], bar["low"]
+        while book.market and book.available > 0:
+            order = book.market[0]
+            if order.active:
+                self._fill(book, order, open_, fills, slip=True)
+                if order.remaining > 0:
+                    break
+            book.market.popleft()
+        for heap, sign in ((book.buy_stop, 1.0), (book.sell_stop, -1.0)):
+            while heap and book.available > 0:
+                key, _, order = heap[0]
+                if not order.active:
+                    heapq.heappop(heap)
+                    continue
+                if (high < key) if sign > 0 else (low > -key):
+                    break
+                heapq.heappop(heap)
+                self._trigger(order)
+                if order.order_type == "limit":
+                    self._rest(book, order)
+                    continue
+                price = max(order.stop, open_) if sign > 0 else min(order.stop, open_)
+                self._fill(book, order, price, fills, slip=True)
+                if order.remaining > 0:
+                    book.market.append(order)
+        for heap, sign in ((book.buy_limit, 1.0), (book.sell_limit, -1.0)):
+            while heap and book.available > 0:
+                key, _, order = heap[0]
+                if not order.active:
+                    heapq.heappop(heap)
+                    continue
+                if (low > -key) if sign > 0 else (high < key):
+                    break
+                price = min(order.limit, open_) if sign > 0 else max(order.limit, open_)
+                self._fill(book, order, price, fills, slip=False)
+                if order.remaining > 0:
+                    break
+                heapq.heappop(heap)
+        return fills
+
+    def _open_bar(self, book: _SymbolBook, bar: Dict[str, float]) -> None:
+        book.bar = bar
+        book.available = self.execution.capacity(bar.get("volume", 0.0))
+
+    @staticmethod
+    def _stop_hit(order: PendingOrder, high: float, low: float) -> bool:
+        return high >= order.stop if order.side == "BUY" else low <= order.stop
+
+    @staticmethod
+    def _limit_hit(order: PendingOrder, high: float, low: float) -> bool:
+        return low <= order.limit if order.side == "BUY" else high >= order.limit
+
+    @staticmethod
+    def _trigger(order: PendingOrder) -> None:
+        order.order_type = "limit" if order.limit is not None else "market"
+        order.stop = order.stop if order.order_type == "market" else None
+
+    def _rest(self, book: _SymbolBook, order: PendingOrder) -> None:
+        entry_id = order.order_id
+        if order.order_type == "market":
+            book.market.append(order)
+        elif order.order_type == "limit":
+            if order.side == "BUY":
+                heapq.heappush(book.buy_limit, (-order.limit, entry_id, order))
+            else:
+                heapq.heappush(book.sell_limit, (order.limit, entry_id, order))
+        elif order.side == "BUY":
+            heapq.heappush(book.buy_stop, (order.stop, entry_id, order))
+        else:
+            heapq.heappush(book.sell_stop, (-order.stop, entry_id, order))
+
+    def _fill(
+        self, book: _SymbolBook, order: PendingOrder, price: float, fills: List[Fill], slip: bool
+    ) -> None:
+        if self.execution.participation is None:
+            qty = order.remaining
+        else:
+            qty = min(order.remaining, book.available)
+            if qty <= 0:
+                return
+            book.available -= qty
+        if slip:
+            price = self.execution.slip(order.side, price)
+        order.filled += qty
+        if order.remaining <= 0:
+            order.active = False
+            self.orders.pop(order.order_id, None)
+        fills.append(Fill(order, qty, price, self.execution.commission(qty, price)))
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+import yaml
+
+from ..core.dataframe import BarFrame
+from ..storage.barstore import load_bars
+from ..strat.base import load_strategy
+from .engine import BacktestEngine
+from .vectorized import VectorizedBacktestEngine
+
+
+@dataclass(slots=True)
+class SearchSpace:
+    """Parameter grid or random search space for one strategy.
+
+    ``grid`` maps a parameter to the list of values to try (full cartesian product); ``random``
+    maps a parameter to ``{"low": .., "high": ..}`` (ints when both bounds are ints) or
+    ``{"choices": [...]}`` and draws ``samples`` combinations with ``seed``. ``params`` holds the
+    fixed part of the strategy config shared by every combination.
+    """
+
+    strategy: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    grid: Dict[str, List[Any]] = field(default_factory=dict)
+    random: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    samples: int = 20
+    seed: int = 0
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> SearchSpace:
+        if "strategy" not in raw:
+            raise ValueError("Search space must name a strategy")
+        if not raw.get("grid") and not raw.get("random"):
+            raise ValueError("Search space needs a grid or a random section")
+        return cls(
+            strategy=raw["strategy"],
+            params=dict(raw.get("params") or {}),
+            grid=dict(raw.get("grid") or {}),
+            random=dict(raw.get("random") or {}),
+            samples=int(raw.get("samples", 20)),
+            seed=int(raw.get("seed", 0)),
+        )
+
+    @classmethod
+    def from_yaml(cls, path: str | Path) -> SearchSpace:
+        with open(path, encoding="utf-8") as fh:
+            return cls.from_dict(yaml.safe_load(fh) or {})
+
+    def _draw(self, rng: random.Random) -> Dict[str, Any]:
+        drawn: Dict[str, Any] = {}
+        for name, spec in self.random.items():
+            if "choices" in spec:
+                drawn[name] = rng.choice(list(spec["choices"]))
+            elif isinstance(spec["low"], int) and isinstance(spec["high"], int):
+                drawn[name] = rng.randint(spec["low"], spec["high"])
+            else:
+                drawn[name] = rng.uniform(float(spec["low"]), float(spec["high"]))
+        return drawn
+
+    def candidates(self) -> Iterator[Dict[str, Any]]:
+        names = list(self.grid)
+        grid_points = [
+            dict(zip(names, values)) for values in itertools.product(*self.grid.values())
+        ]
+        if not self.random:
+            for point in grid_points:
+                yield {**self.params, **point}
+            return
+        rng = random.Random(self.seed)
+        for point in grid_points:
+            for _ in range(self.samples):
+                yield {**self.params, **point, **self._draw(rng)}
+
+
+@dataclass(slots=True)
+class SweepResult:
+    params: Dict[str, Any]
+    metrics: Dict[str, float]
+    trades: int
+
+    def to_row(self) -> Dict[str, Any]:
+        return {**self.params, **self.metrics, "trades": self.trades}
+
+
+_WORKER_DATA: Dict[str, BarFrame] = {}
+
+
+def _init_worker(paths: Dict[str, Path]) -> None:
+    # each worker loads the bars once (bar stores are only mapped) and reuses them for every run
+    _WORKER_DATA.clear()
+    _WORKER_DATA.update({symbol: load_bars(path) for symbol, path in paths.items()})
+
+
+def _evaluate(
+    strategy: str,
+    params: Dict[str, Any],
+    vectorized: bool,
+    start: int | None = None,
+    end: int | None = None,
+) -> SweepResult:
+    data = _WORKER_DATA
+    if start is not None or end is not None:
+        data = {symbol: frame.between(start, end) for symbol, frame in data.items()}
+    engine_cls = VectorizedBacktestEngine if vectorized else BacktestEngine
+    engine = engine_cls(data, {strategy: load_strategy(strategy, dict(params))})
+    result = engine.run()
+    return SweepResult(params, result.metrics, len(result.trades))
+
+
+def run_sweep(
+    paths: Dict[str, Path],
+    space: SearchSpace,
+    objective: str = "sharpe",
+    processes: int | None = None,
+    vectorized: bool = False,
+    minimize: bool = False,
+    on_result: Callable[[SweepResult], None] | None = None,
+) -> List[SweepResult]:
+    """Backtest every combination in ``space`` and return results best-first by ``objective``.
+
+    Combinations fan out over a process pool (``processes`` defaults to the CPU count; 1 runs
+    in-process). ``on_result`` is called as each combination finishes, in completion order.
+    """
+
+    workers = processes or os.cpu_count() or 1
+    results: List[SweepResult] = []
+    candidates = list(space.candidates())
+    if workers <= 1:
+        _init_worker(paths)
+        for params in candidates:
+            result = _evaluate(space.strategy, params, vectorized)
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(candidates)) or 1,
+            initializer=_init_worker,
+            initargs=(paths,),
+        ) as pool:
+            futures = [
+                pool.submit(_evaluate, space.strategy, params, vectorized) for params in candidates
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+    results.sort(key=lambda res: res.metrics.get(objective, 0.0), reverse=not minimize)
+    return results
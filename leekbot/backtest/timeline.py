@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import heapq
+from datetime import datetime
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from ..core.dataframe import OHLCV, BarFrame
+from ..core.events import Bar
+
+TimelineSlice = Tuple[int, List[Tuple[int, int]]]
+# rows converted at a time per symbol: small, as every symbol holds one chunk
+_CHUNK = 32
+
+
+class Timeline:
+    """K-way merge of per-symbol bar cursors.
+
+    Iterating yields ``(epoch_ns, [(slot, row), ...])`` once per distinct timestamp, where ``slot``
+    is the symbol's position in :attr:`symbols` and ``row`` its bar number in that frame. Each bar
+    is visited exactly once and only the k cursor heads are ever held in the heap, so a run costs
+    O(n log k) for n bars over k symbols.
+
+    :meth:`bar` builds the shared :class:`Bar` of a visited row from columns converted to Python
+    floats a few rows at a time, rather than indexing every column of the frame for every bar.
+    """
+
+    def __init__(self, data: Dict[str, BarFrame], cursors: Sequence[int] | None = None) -> None:
+        self.symbols: List[str] = list(data)
+        self.frames: List[BarFrame] = [data[symbol] for symbol in self.symbols]
+        self._epochs = [frame.epochs for frame in self.frames]
+        self._lengths = [len(frame) for frame in self.frames]
+        self.cursors: List[int] = list(cursors) if cursors is not None else [0] * len(self.frames)
+        self._heap: List[Tuple[int, int]] = [
+            (int(self._epochs[slot][pos]), slot)
+            for slot, pos in enumerate(self.cursors)
+            if pos < self._lengths[slot]
+        ]
+        heapq.heapify(self._heap)
+        self._names = [("symbol", "timestamp", *frame.columns) for frame in self.frames]
+        self._ohlcv = [tuple(frame.columns) == OHLCV for frame in self.frames]
+        # per slot: the first row of its converted chunk and the chunk's column lists
+        self._chunks: List[Tuple[int, List[List[float]]]] = [(0, [[]])] * len(self.frames)
+
+    def __len__(self) -> int:
+        return sum(self._lengths)
+
+    def remaining(self) -> int:
+        return sum(length - pos for length, pos in zip(self._lengths, self.cursors))
+
+    def bar(self, slot: int, row: int, ts: datetime) -> Bar:
+        start, columns = self._chunks[slot]
+        pos = row - start
+        if not 0 <= pos < len(columns[0]):
+            start, pos = row, 0
+            values = self.frames[slot].columns.values()
+            columns = [column[row : row + _CHUNK].tolist() for column in values]
+            self._chunks[slot] = (start, columns)
+        symbol = self.symbols[slot]
+        if self._ohlcv[slot]:
+            open_, high, low, close, volume = columns
+            return Bar(
+                symbol=symbol,
+                timestamp=ts,
+                open=open_[pos],
+                high=high[pos],
+                low=low[pos],
+                close=close[pos],
+                volume=volume[pos],
+            )
+        return Bar(zip(self._names[slot], (symbol, ts, *[column[pos] for column in columns])))
+
+    def __iter__(self) -> Iterator[TimelineSlice]:
+        return self.iterate()
+
+    def iterate(self, until: int | None = None) -> Iterator[TimelineSlice]:
+        """Like iterating the timeline, but stop before the first timestamp at or after ``until``.
+
+        Cursors only advance past timestamps actually yielded, so iteration can pick up again
+        from :attr:`cursors` later.
+        """
+
+        heap = self._heap
+        cursors = self.cursors
+        epochs = self._epochs
+        lengths = self._lengths
+        while heap and (until is None or heap[0][0] < until):
+            epoch = heap[0][0]
+            members: List[Tuple[int, int]] = []
+            while heap and heap[0][0] == epoch:
+                slot = heap[0][1]
+                row = cursors[slot]
+                members.append((slot, row))
+                row += 1
+                cursors[slot] = row
+                if row < lengths[slot]:
+                    heapq.heapreplace(heap, (int(epochs[slot][row]), slot))
+                else:
+                    heapq.heappop(heap)
+            yield epoch, members
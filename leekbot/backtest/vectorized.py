@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..core.dataframe import (
+    BarFrame,
+    MiniDataFrame,
+    as_bar_frame,
+    datetimes_from_epochs,
+)
+from ..storage.barstore import load_bars
+from ..strat.base import Strategy, load_strategy
+from .engine import BacktestResult
+from .metrics import MetricsAccumulator
+
+
+def position_path(side: np.ndarray, limit: int = 1) -> np.ndarray:
+    """Positions reached by stepping one unit toward each signal, clamped to ``[-limit, limit]``.
+
+    This is the rule every vectorized strategy's ``on_bar`` follows (buy one if not already long,
+    sell one if not already short). The per-bar transitions are composed with a parallel prefix
+    scan, so the path costs O(n log n) array operations and no Python work per bar.
+    """
+
+    n = len(side)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    states = np.arange(-limit, limit + 1)
+    table = np.clip(states[None, :] + np.asarray(side, dtype=np.int64)[:, None], -limit, limit)
+    table += limit
+    step = 1
+    while step < n:
+        table[step:] = np.take_along_axis(table[step:], table[:-step], axis=1)
+        step *= 2
+    return table[:, limit] - limit
+
+
+class VectorizedBacktestEngine:
+    """Array-at-a-time backtester driven by :meth:`Strategy.generate_signals`.
+
+    Each strategy trades one unit per signal exactly as its ``on_bar`` does and fills at the bar
+    close (or the signal's order price), producing the same trades as :class:`BacktestEngine`
+    when one strategy runs per symbol. Positions are tracked per strategy and symbol, so
+    strategies sharing a symbol do not see each other's fills the way they do in the event loop.
+    """
+
+    def __init__(
+        self, data: Dict[str, BarFrame | MiniDataFrame], strategies: Dict[str, Strategy]
+    ) -> None:
+        self.data: Dict[str, BarFrame] = {
+            symbol: as_bar_frame(frame) for symbol, frame in data.items()
+        }
+        self.strategies = strategies
+        self.trades: List[Dict] = []
+        self.equity = 100000.0
+        self.metrics = MetricsAccumulator(self.equity)
+
+    def _equity_path(
+        self, grid: np.ndarray, holdings: Dict[str, np.ndarray], cash: List[np.ndarray]
+    ) -> np.ndarray:
+        """Cash plus inventory marked at the latest close, at every timestamp of ``grid``."""
+
+        equity = np.full(len(grid), self.metrics.start_equity)
+        for symbol, held in holdings.items():
+            frame = self.data[symbol]
+            rows = np.searchsorted(frame.epochs, grid, side="right") - 1
+            seen = rows >= 0
+            equity[seen] += held[rows[seen]] * frame["close"][rows[seen]]
+        for flows in cash:
+            equity += flows
+        return equity
+
+    def run(self) -> BacktestResult:
+        epochs: List[np.ndarray] = []
+        keys: List[np.ndarray] = []
+        sides: List[np.ndarray] = []
+        prices: List[np.ndarray] = []
+        stamps: List[datetime] = []
+        owners: List[Tuple[str, str]] = []
+        holdings: Dict[str, np.ndarray] = {}
+        flows: List[Tuple[str, np.ndarray, np.ndarray]] = []
+        for strat_order, (name, strat) in enumerate(self.strategies.items()):
+            for sym_order, (symbol, frame) in enumerate(self.data.items()):
+                signals = strat.generate_signals(frame)
+                if signals is None:
+                    raise ValueError(f"Strategy {name} has no vectorized implementation")
+                path = position_path(signals.side)
+                change = np.diff(path, prepend=0)
+                rows = np.flatnonzero(change)
+                fill = frame["close"][rows]
+                if signals.price is not None:
+                    override = signals.price[rows]
+                    fill = np.where(np.isnan(override), fill, override)
+                epochs.append(frame.epochs[rows])
+                keys.append(np.full(len(rows), strat_order * len(self.data) + sym_order))
+                sides.append(change[rows])
+                prices.append(fill)
+                stamps.extend(datetimes_from_epochs(frame.epochs[rows], frame.tz))
+                owners.extend([(name, symbol)] * len(rows))
+                held = holdings.get(symbol)
+                holdings[symbol] = path if held is None else held + path
+                flows.append((symbol, rows, change[rows] * fill))
+        metrics = self.metrics
+        if stamps:
+            all_sides = np.concatenate(sides)
+            all_prices = np.concatenate(prices)
+            order = np.lexsort((np.concatenate(keys), np.concatenate(epochs)))
+            self.equity -= float(np.sum(all_sides[order] * all_prices[order]))
+            for pos, side, price in zip(
+                order.tolist(), all_sides[order].tolist(), all_prices[order].tolist()
+            ):
+                name, symbol = owners[pos]
+                side_name = "BUY" if side > 0 else "SELL"
+                metrics.on_fill(name, symbol, side_name, abs(side), price)
+                self.trades.append(
+                    {
+                        "timestamp": stamps[pos],
+                        "symbol": symbol,
+                        "side": side_name,
+                        "qty": abs(side),
+                        "price": price,
+                        "strategy": name,
+                    }
+                )
+        grid = np.unique(np.concatenate([frame.epochs for frame in self.data.values()]))
+        cash: List[np.ndarray] = []
+        for symbol, rows, spent in flows:
+            # cumulative cash paid for the fills at or before each grid timestamp
+            paid = np.concatenate(([0.0], np.cumsum(spent)))
+            filled = np.searchsorted(self.data[symbol].epochs[rows], grid, side="right")
+            cash.append(-paid[filled])
+        for symbol, frame in self.data.items():
+            if len(frame):
+                metrics.mark(symbol, float(frame["close"][-1]))
+        metrics.sample_batch(grid, self._equity_path(grid, holdings, cash))
+        return BacktestResult(
+            self.trades, metrics.snapshot(), metrics.attribution(), metrics.curve()
+        )
+
+    @classmethod
+    def from_csv(
+        cls, paths: Dict[str, Path], strategies: Dict[str, Dict]
+    ) -> VectorizedBacktestEngine:
+        data = {symbol: load_bars(path) for symbol, path in paths.items()}
+        strats = {name: load_strategy(name, cfg) for name, cfg in strategies.items()}
+        return cls(data, strats)
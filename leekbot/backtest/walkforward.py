@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ..core.dataframe import BarFrame
+from ..storage.barstore import load_bars
+from ..strat.base import Strategy, load_strategy
+from . import sweep
+from .engine import BacktestEngine
+from .metrics import Metrics, MetricsAccumulator
+from .sweep import SearchSpace, SweepResult
+
+
+@dataclass(slots=True)
+class Fold:
+    """One walk-forward step; bounds are inclusive epoch-ns timestamps."""
+
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+@dataclass(slots=True)
+class FoldResult:
+    fold: Fold
+    params: Dict[str, Any]
+    in_sample: Dict[str, float]
+    out_of_sample: Dict[str, float]
+    trades: int
+
+
+@dataclass
+class WalkForwardResult:
+    folds: List[FoldResult]
+    trades: List[Dict]
+    equity_curve: List[Tuple[datetime, float]] = field(default_factory=list)
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+
+def make_folds(
+    epochs: np.ndarray, train_bars: int, test_bars: int, step: int | None = None
+) -> List[Fold]:
+    """Roll a ``train_bars`` in-sample window followed by ``test_bars`` out of sample."""
+
+    step = step or test_bars
+    folds: List[Fold] = []
+    start = 0
+    while start + train_bars + test_bars <= len(epochs):
+        test_start = start + train_bars
+        folds.append(
+            Fold(
+                index=len(folds),
+                train_start=int(epochs[start]),
+                train_end=int(epochs[test_start - 1]),
+                test_start=int(epochs[test_start]),
+                test_end=int(epochs[test_start + test_bars - 1]),
+            )
+        )
+        start += step
+    return folds
+
+
+class WalkForwardRunner:
+    """Rolling in-sample optimization with stitched out-of-sample evaluation.
+
+    Every (fold, parameter set) in-sample backtest runs in a process pool whose workers parse the
+    CSVs once and carve each fold out of the loaded frames with zero-copy views. Out-of-sample
+    windows then run in order on one account: when a fold keeps the previous fold's parameters
+    the already-warm strategy instance simply continues, otherwise a fresh instance is warmed on
+    the ``warmup_bars`` bars preceding the test window before it may trade.
+    """
+
+    def __init__(
+        self,
+        paths: Dict[str, Path],
+        space: SearchSpace,
+        train_bars: int,
+        test_bars: int,
+        step: int | None = None,
+        objective: str = "sharpe",
+        minimize: bool = False,
+        processes: int | None = None,
+        warmup_bars: int | None = None,
+        vectorized: bool = False,
+        equity: float = 100000.0,
+    ) -> None:
+        if step is not None and step < test_bars:
+            raise ValueError(
+                "step must be at least test_bars so out-of-sample windows do not overlap"
+            )
+        self.paths = paths
+        self.space = space
+        self.train_bars = train_bars
+        self.test_bars = test_bars
+        self.step = step
+        self.objective = objective
+        self.minimize = minimize
+        self.processes = processes or os.cpu_count() or 1
+        self.warmup_bars = train_bars if warmup_bars is None else warmup_bars
+        self.vectorized = vectorized
+        self.equity = equity
+
+    def _best(self, results: List[SweepResult]) -> SweepResult:
+        ranked = sorted(
+            results,
+            key=lambda res: res.metrics.get(self.objective, 0.0),
+            reverse=not self.minimize,
+        )
+        return ranked[0]
+
+    def optimize(self, folds: List[Fold], data: Dict[str, BarFrame]) -> List[SweepResult]:
+        candidates = list(self.space.candidates())
+        jobs = [(fold.index, params) for fold in folds for params in candidates]
+        by_fold: Dict[int, List[SweepResult]] = {fold.index: [] for fold in folds}
+        if self.processes <= 1:
+            sweep._WORKER_DATA.clear()
+            sweep._WORKER_DATA.update(data)
+            for fold_index, params in jobs:
+                fold = folds[fold_index]
+                by_fold[fold_index].append(
+                    sweep._evaluate(
+                        self.space.strategy,
+                        params,
+                        self.vectorized,
+                        fold.train_start,
+                        fold.train_end,
+                    )
+                )
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(self.processes, len(jobs)) or 1,
+                initializer=sweep._init_worker,
+                initargs=(self.paths,),
+            ) as pool:
+                futures = [
+                    (
+                        fold_index,
+                        pool.submit(
+                            sweep._evaluate,
+                            self.space.strategy,
+                            params,
+                            self.vectorized,
+                            folds[fold_index].train_start,
+                            folds[fold_index].train_end,
+                        ),
+                    )
+                    for fold_index, params in jobs
+                ]
+                for fold_index, future in futures:
+                    by_fold[fold_index].append(future.result())
+        return [self._best(by_fold[fold.index]) for fold in folds]
+
+    def run(self) -> WalkForwardResult:
+        data = {symbol: load_bars(path) for symbol, path in self.paths.items()}
+        epochs = np.unique(np.concatenate([frame.epochs for frame in data.values()]))
+        folds = make_folds(epochs, self.train_bars, self.test_bars, self.step)
+        chosen = self.optimize(folds, data)
+
+        name = self.space.strategy
+        strategy: Strategy | None = None
+        previous: Dict[str, Any] | None = None
+        next_bar = -1
+        equity = self.equity
+        positions: Dict[str, float] = {}
+        trades: List[Dict] = []
+        metrics = MetricsAccumulator(self.equity)
+        fold_results: List[FoldResult] = []
+        for fold, best in zip(folds, chosen):
+            start = fold.test_start
+            first = int(np.searchsorted(epochs, fold.test_start))
+            if strategy is None or best.params != previous or first != next_bar:
+                strategy = load_strategy(name, dict(best.params))
+                start = int(epochs[max(first - self.warmup_bars, 0)])
+            window = {symbol: frame.between(start, fold.test_end) for symbol, frame in data.items()}
+            engine = BacktestEngine(
+                window, {name: strategy}, equity=equity, positions=positions, metrics=metrics
+            )
+            result = engine.run(trade_from=fold.test_start)
+            equity, positions = engine.equity, engine.positions
+            trades.extend(result.trades)
+            fold_results.append(
+                FoldResult(
+                    fold,
+                    best.params,
+                    best.metrics,
+                    Metrics(result.trades, self.equity).compute(),
+                    len(result.trades),
+                )
+            )
+            previous = best.params
+            next_bar = first + self.test_bars
+        return WalkForwardResult(
+            folds=fold_results,
+            trades=trades,
+            equity_curve=metrics.curve(),
+            metrics=metrics.snapshot(),
+        )
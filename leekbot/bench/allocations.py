@@ -0,0 +1,109 @@
+"""Cost of handing every bar to many strategies.
+
+Run with ``python -m leekbot.bench.allocations --strategies 1,4,16``. ``shared`` is the engine
+as it runs, building one immutable :class:`~leekbot.core.events.Bar` per bar for every
+strategy; ``copies`` wraps each strategy so it gets its own ``dict(bar)``, one allocation per
+bar per strategy as the engine used to do. Columns: nanoseconds per bar, then bar objects
+allocated per bar and the bytes they take, counted in a second replay whose strategies keep
+every bar they are given alive (so each allocation stays distinct and traced).
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Dict, List
+
+from ..backtest.engine import BacktestEngine
+from ..core.utils import OrderIntent
+from ..strat.base import Strategy
+from .synthetic import synthetic_universe
+
+MODES = ("shared", "copies")
+
+
+class ReaderStrategy(Strategy):
+    """Reads two fields of every bar; with ``keep`` it also holds on to every bar object."""
+
+    def __init__(self, name: str, config: Dict | None = None) -> None:
+        super().__init__(name, config)
+        self.last: Dict[str, float] = {}
+        self.kept: List[Dict] | None = [] if self.config.get("keep") else None
+
+    def on_bar(self, bar: Dict, account_state: Dict) -> None:
+        self.last[bar["symbol"]] = bar["close"]
+        if self.kept is not None:
+            self.kept.append(bar)
+
+    def get_orders(self) -> List[OrderIntent]:
+        return []
+
+
+class _Copying:
+    """Passes the wrapped strategy a private copy of every bar."""
+
+    def __init__(self, strategy: Strategy) -> None:
+        self.strategy = strategy
+
+    def __getattr__(self, attr: str) -> object:
+        return getattr(self.strategy, attr)
+
+    def on_bar(self, bar: Dict, account_state: Dict) -> None:
+        self.strategy.on_bar(dict(bar), account_state)
+
+
+def _engine(
+    mode: str, strategies: int, symbols: int, bars: int, keep: bool = False
+) -> BacktestEngine:
+    data = synthetic_universe(symbols, bars)
+    strats = {f"reader{i}": ReaderStrategy(f"reader{i}", {"keep": keep}) for i in range(strategies)}
+    engine = BacktestEngine(data, strats)
+    if mode == "copies":
+        engine._dispatch = {name: _Copying(strat) for name, strat in strats.items()}
+    return engine
+
+
+def run(mode: str, strategies: int, symbols: int = 20, bars: int = 5000) -> Dict[str, float]:
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode}; expected one of {MODES}")
+    engine = _engine(mode, strategies, symbols, bars)
+    started = time.perf_counter_ns()
+    engine.run()
+    elapsed = time.perf_counter_ns() - started
+    counted = min(bars, 1000)
+    engine = _engine(mode, strategies, symbols, counted, keep=True)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    engine.run()
+    kept = [bar for strat in engine.strategies.values() for bar in strat.kept]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    total = symbols * counted
+    return {
+        "ns_per_bar": elapsed / (symbols * bars),
+        "objects_per_bar": len({id(bar) for bar in kept}) / total,
+        "bytes_per_bar": retained / total,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strategies", default="1,4,16")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--bars", type=int, default=5000)
+    args = parser.parse_args()
+    print(f"{'strategies':>10}{'mode':>8}{'ns/bar':>10}{'objects/bar':>12}{'bytes/bar':>10}")
+    for count in (int(value) for value in args.strategies.split(",")):
+        for mode in MODES:
+            stats = run(mode, count, args.symbols, args.bars)
+            print(
+                f"{count:>10}{mode:>8}{stats['ns_per_bar']:>10.0f}"
+                f"{stats['objects_per_bar']:>12.1f}{stats['bytes_per_bar']:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Cross-section latency of a live universe scan.
+
+Run with ``python -m leekbot.bench.cross_section --symbols 5000 --minutes 200``. Each minute
+feeds every symbol's bar through :class:`LiveRunner` running the cross-sectional momentum
+strategy, then flushes the cross-section; the report is the time per minute against the one
+minute a live 1-minute feed allows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict
+
+import numpy as np
+
+from ..core.dataframe import datetimes_from_epochs
+from ..core.events import BarEvent, EventType
+from ..exec.runner import LiveRunner
+from ..strat.xsec_momentum import CrossSectionalMomentum
+from .synthetic import synthetic_universe
+
+
+def run(symbols: int, minutes: int, lookback: int = 60, top_n: int = 50) -> Dict[str, float]:
+    data = synthetic_universe(symbols, minutes)
+    strat = CrossSectionalMomentum("xsec", {"lookback": lookback, "top_n": top_n, "rebalance": 1})
+    runner = LiveRunner({"xsec": strat})
+    names = list(data)
+    frames = [data[name] for name in names]
+    stamps = datetimes_from_epochs(frames[0].epochs)
+    columns = [[frame[field].tolist() for frame in frames] for field in ("open", "high", "low")]
+    closes = [frame["close"].tolist() for frame in frames]
+    volumes = [frame["volume"].tolist() for frame in frames]
+    elapsed = []
+    for minute, ts in enumerate(stamps):
+        events = [
+            BarEvent(
+                EventType.BAR,
+                ts,
+                name,
+                columns[0][i][minute],
+                columns[1][i][minute],
+                columns[2][i][minute],
+                closes[i][minute],
+                volumes[i][minute],
+                "1m",
+            )
+            for i, name in enumerate(names)
+        ]
+        started = time.perf_counter()
+        for event in events:
+            runner.on_bar(event)
+        runner.flush()
+        elapsed.append(time.perf_counter() - started)
+    per_minute = np.array(elapsed) * 1e3
+    return {
+        "symbols": float(symbols),
+        "mean_ms": float(per_minute.mean()),
+        "p99_ms": float(np.quantile(per_minute, 0.99)),
+        "max_ms": float(per_minute.max()),
+        "budget_used": float(per_minute.max() / 60_000),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--minutes", type=int, default=200)
+    args = parser.parse_args()
+    stats = run(args.symbols, args.minutes)
+    print(
+        f"{int(stats['symbols'])} symbols: {stats['mean_ms']:.1f} ms/minute mean, "
+        f"{stats['p99_ms']:.1f} p99, {stats['max_ms']:.1f} max "
+        f"({stats['budget_used']:.2%} of the minute)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Memory and iteration benchmark: MiniDataFrame (row dicts) vs BarFrame (columns).
+
+Run with ``python -m leekbot.bench.dataframe --bars 200000``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from ..core.dataframe import OHLCV, BarFrame, MiniDataFrame
+
+
+def synthetic_columns(bars: int, seed: int = 7) -> Tuple[List[datetime], Dict[str, List[float]]]:
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 2, 9, 30)
+    index = [start + timedelta(minutes=i) for i in range(bars)]
+    columns: Dict[str, List[float]] = {name: [] for name in OHLCV}
+    price = 100.0
+    for _ in range(bars):
+        price = max(1.0, price + rng.uniform(-0.5, 0.5))
+        columns["open"].append(price)
+        columns["high"].append(price + rng.random())
+        columns["low"].append(price - rng.random())
+        columns["close"].append(price + rng.uniform(-0.2, 0.2))
+        columns["volume"].append(float(rng.randint(100, 10000)))
+    return index, columns
+
+
+def _measure(build: Callable[[], object]) -> Tuple[object, int, float]:
+    tracemalloc.start()
+    held = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    started = time.perf_counter()
+    obj = build()
+    return obj, current, time.perf_counter() - started
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def run(bars: int, lookups: int = 10000) -> Dict[str, Dict[str, float]]:
+    index, columns = synthetic_columns(bars)
+    rows = [dict(zip(OHLCV, values)) for values in zip(*(columns[name] for name in OHLCV))]
+
+    mini, mini_bytes, mini_build = _measure(lambda: MiniDataFrame([dict(r) for r in rows], index))
+    frame, frame_bytes, frame_build = _measure(lambda: BarFrame.from_columns(index, columns))
+    assert isinstance(mini, MiniDataFrame) and isinstance(frame, BarFrame)
+
+    probe = random.Random(11).sample(index, min(lookups, len(index)))
+
+    def iterate_rows(source: object) -> float:
+        total = 0.0
+        for row in source:  # type: ignore[attr-defined]
+            total += row["close"]
+        return total
+
+    def lookup(source: object) -> None:
+        loc = source.loc  # type: ignore[attr-defined]
+        for ts in probe:
+            loc[ts]
+
+    return {
+        "MiniDataFrame": {
+            "bytes": float(mini_bytes),
+            "build_s": mini_build,
+            "iterate_s": _timed(lambda: iterate_rows(mini)),
+            "loc_s": _timed(lambda: lookup(mini)),
+            "column_sum_s": _timed(lambda: sum(row["close"] for row in mini.rows)),
+        },
+        "BarFrame": {
+            "bytes": float(frame_bytes),
+            "build_s": frame_build,
+            "iterate_s": _timed(lambda: iterate_rows(frame)),
+            "loc_s": _timed(lambda: lookup(frame)),
+            "column_sum_s": _timed(lambda: float(frame["close"].sum())),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+    results = run(args.bars, args.lookups)
+    print(f"{'container':<15}{'MiB':>10}{'build s':>10}{'iter s':>10}{'loc s':>10}{'sum s':>10}")
+    for name, stats in results.items():
+        print(
+            f"{name:<15}{stats['bytes'] / 2**20:>10.2f}{stats['build_s']:>10.3f}"
+            f"{stats['iterate_s']:>10.3f}{stats['loc_s']:>10.3f}{stats['column_sum_s']:>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
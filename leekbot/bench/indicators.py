@@ -0,0 +1,84 @@
+"""Per-update cost of the streaming indicators against window length.
+
+Run with ``python -m leekbot.bench.indicators --windows 10,100,1000,10000``. Every indicator
+column should stay flat as the window grows; ``deque_std``, the recompute-the-window approach
+strategies used before, grows linearly for comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+from collections import deque
+from typing import Callable, Dict, List
+
+from ..core import indicators
+
+
+def _deque_std(window: int) -> Callable[[float], float]:
+    history: deque = deque(maxlen=window)
+
+    def update(x: float) -> float:
+        history.append(x)
+        mean = sum(history) / len(history)
+        return math.sqrt(sum((v - mean) ** 2 for v in history) / len(history))
+
+    return update
+
+
+def _updaters(window: int) -> Dict[str, Callable[[float], float]]:
+    atr = indicators.ATR(window)
+    vwap = indicators.RollingVWAP(window)
+    return {
+        "mean": indicators.RollingMean(window).update,
+        "variance": indicators.RollingVariance(window).update,
+        "zscore": indicators.ZScore(window).update,
+        "ema": indicators.EMA(window).update,
+        "vwap": lambda x: vwap.update(x, 100.0),
+        "atr": lambda x: atr.update(x + 0.5, x - 0.5, x),
+        "max": indicators.RollingMax(window).update,
+        "min": indicators.RollingMin(window).update,
+        "deque_std": _deque_std(window),
+    }
+
+
+def run(window: int, updates: int, seed: int = 0, naive: bool = True) -> Dict[str, float]:
+    """Nanoseconds per update for every indicator at one window length."""
+
+    rng = random.Random(seed)
+    prices: List[float] = []
+    price = 100.0
+    for _ in range(updates):
+        price += rng.gauss(0, 0.1)
+        prices.append(price)
+    results: Dict[str, float] = {}
+    for name, update in _updaters(window).items():
+        if name == "deque_std" and not naive:
+            continue
+        started = time.perf_counter()
+        for value in prices:
+            update(value)
+        results[name] = (time.perf_counter() - started) / updates * 1e9
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", default="10,100,1000,10000")
+    parser.add_argument("--updates", type=int, default=200_000)
+    parser.add_argument("--no-naive", action="store_true", help="Skip the O(window) baseline.")
+    args = parser.parse_args()
+    rows = [
+        (int(window), run(int(window), args.updates, naive=not args.no_naive))
+        for window in args.windows.split(",")
+    ]
+    names = list(rows[0][1])
+    print(f"{'window':>8}" + "".join(f"{name:>11}" for name in names) + "   (ns/update)")
+    for window, stats in rows:
+        print(f"{window:>8}" + "".join(f"{stats[name]:>11.0f}" for name in names))
+
+
+if __name__ == "__main__":
+    main()
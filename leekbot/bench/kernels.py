@@ -0,0 +1,84 @@
+"""Throughput of the batch indicator kernels over a symbols x bars matrix.
+
+Run with ``python -m leekbot.bench.kernels --symbols 500 --bars 5000 --windows 20,200,2000``.
+Figures are millions of matrix cells per second and should not fall as the window grows;
+``window_std``, the sliding-window standard deviation the kernels used before, costs O(window)
+per cell and is there for comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Dict
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..core import kernels
+
+
+def _window_std(values: np.ndarray, window: int) -> np.ndarray:
+    centered = values - values[..., :1]
+    mean = sliding_window_view(centered, window, axis=-1).sum(axis=-1) / window
+    squares = sliding_window_view(centered * centered, window, axis=-1).sum(axis=-1) / window
+    return np.sqrt(np.maximum(squares - mean * mean, 0.0))
+
+
+def _kernels(
+    close: np.ndarray, volume: np.ndarray, window: int
+) -> Dict[str, Callable[[np.ndarray], object]]:
+    high = close + 0.5
+    low = close - 0.5
+    pairs = [(i, i + 1) for i in range(0, len(close) - 1, 2)]
+    return {
+        "sma": lambda out: kernels.sma(close, window, out),
+        "std": lambda out: kernels.rolling_std(close, window, out),
+        "zscore": lambda out: kernels.zscore(close, window, out=out),
+        "ema": lambda out: kernels.ema(close, window, out),
+        "atr": lambda out: kernels.atr(high, low, close, window, out=out),
+        "vwap": lambda out: kernels.vwap(close, volume, window, out),
+        "bands": lambda out: kernels.breakout_bands(high, low, window, (out, out.copy())),
+        "spread_z": lambda out: kernels.spread_zscore(close, pairs, window, out=out[: len(pairs)]),
+        "window_std": lambda out: _window_std(close, window),
+    }
+
+
+def run(
+    symbols: int, bars: int, window: int, seed: int = 0, naive: bool = True
+) -> Dict[str, float]:
+    """Millions of cells per second for every kernel at one window length."""
+
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, (symbols, bars)), axis=1)
+    volume = rng.integers(1, 1000, (symbols, bars)).astype(float)
+    out = np.empty((symbols, bars))
+    results: Dict[str, float] = {}
+    for name, kernel in _kernels(close, volume, window).items():
+        if name == "window_std" and not naive:
+            continue
+        started = time.perf_counter()
+        kernel(out)
+        results[name] = symbols * bars / (time.perf_counter() - started) / 1e6
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=5000)
+    parser.add_argument("--windows", default="20,200,2000")
+    parser.add_argument("--no-naive", action="store_true", help="Skip the O(window) baseline.")
+    args = parser.parse_args()
+    rows = [
+        (int(window), run(args.symbols, args.bars, int(window), naive=not args.no_naive))
+        for window in args.windows.split(",")
+    ]
+    names = list(rows[0][1])
+    print(f"{'window':>8}" + "".join(f"{name:>11}" for name in names) + "   (M cells/s)")
+    for window, stats in rows:
+        print(f"{window:>8}" + "".join(f"{stats[name]:>11.1f}" for name in names))
+
+
+if __name__ == "__main__":
+    main()
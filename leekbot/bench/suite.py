@@ -0,0 +1,243 @@
+"""Reproducible backtest benchmark suite behind ``leek bench``.
+
+Every scenario is a seeded synthetic universe of ``symbols x bars`` 1-minute bars, so two runs
+on the same machine measure the same work. Each stage reports wall time (best of ``repeat``)
+and, unless disabled, the peak traced Python/NumPy allocation from one extra traced run:
+
+* ``ingest``: CSV to bar store conversion plus memory-mapping the result
+* ``event_loop``: :class:`BacktestEngine` with a strategy that ignores every bar
+* ``strategy:<name>``: the engine running one strategy; ``on_bar_ns`` subtracts the event loop
+* ``metrics``: marking every bar and sampling every timestamp into a metrics accumulator
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ..backtest.engine import BacktestEngine
+from ..backtest.metrics import MetricsAccumulator
+from ..backtest.timeline import Timeline
+from ..core.dataframe import BarFrame, datetimes_from_epochs
+from ..storage.barstore import BarStore, load_bars
+from ..strat.base import load_strategy
+from .synthetic import synthetic_universe
+from .timeline import NullStrategy
+
+PRESETS: Dict[str, List[Tuple[int, int]]] = {
+    "quick": [(1, 10_000), (100, 1_000)],
+    "standard": [(1, 100_000), (100, 10_000), (1000, 1_000)],
+    "full": [(1, 1_000_000), (100, 100_000), (1000, 10_000)],
+}
+DEFAULT_STRATEGIES = [
+    "momentum_1m",
+    "vwap_reversion",
+    "orb_breakout",
+    "breakout_volexp",
+    "vol_trend_vix",
+    "vol_reversion_vix",
+]
+
+
+@dataclass(slots=True)
+class BenchResult:
+    scenario: str
+    stage: str
+    bars: int
+    seconds: float
+    ns_per_bar: float
+    peak_mb: float | None = None
+    extra: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return f"{self.scenario}/{self.stage}"
+
+
+@dataclass(slots=True)
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1.0 if self.baseline else float("inf")
+
+
+def _timed(work: Callable[[], Any], repeat: int, memory: bool) -> Tuple[float, float | None]:
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        started = time.perf_counter()
+        work()
+        best = min(best, time.perf_counter() - started)
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        work()
+        peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    return best, peak
+
+
+def _write_csv(path: Path, frame: BarFrame) -> None:
+    stamps = datetimes_from_epochs(frame.epochs, frame.tz)
+    columns = [frame[name] for name in frame.field_names]
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(",".join(["timestamp"] + frame.field_names) + "\n")
+        for pos, ts in enumerate(stamps):
+            fh.write(ts.isoformat() + "," + ",".join(repr(float(c[pos])) for c in columns) + "\n")
+
+
+def _feed_metrics(data: Dict[str, BarFrame]) -> None:
+    acc = MetricsAccumulator()
+    timeline = Timeline(data)
+    symbols = timeline.symbols
+    closes = [frame["close"] for frame in timeline.frames]
+    for epoch, members in timeline:
+        for slot, row in members:
+            acc.mark(symbols[slot], closes[slot][row])
+        acc.sample(epoch)
+    acc.snapshot()
+
+
+def run_scenario(
+    symbols: int,
+    bars: int,
+    strategies: Sequence[str] = DEFAULT_STRATEGIES,
+    seed: int = 0,
+    repeat: int = 1,
+    memory: bool = True,
+    stages: Sequence[str] = ("ingest", "event_loop", "strategies", "metrics"),
+) -> List[BenchResult]:
+    scenario = f"{symbols}x{bars}"
+    total = symbols * bars
+    data = synthetic_universe(symbols, bars, seed=seed)
+    results: List[BenchResult] = []
+
+    def record(stage: str, seconds: float, peak: float | None, **extra: float) -> None:
+        results.append(
+            BenchResult(scenario, stage, total, seconds, seconds / total * 1e9, peak, extra)
+        )
+
+    if "ingest" in stages:
+        with tempfile.TemporaryDirectory(prefix="leek-bench-") as tmp:
+            root = Path(tmp)
+            for symbol, frame in data.items():
+                _write_csv(root / f"{symbol}.csv", frame)
+            store = BarStore(root / "store")
+
+            def ingest() -> None:
+                for symbol in data:
+                    store.ingest_csv(symbol, root / f"{symbol}.csv")
+                for symbol in data:
+                    load_bars(store.path(symbol))
+
+            record("ingest", *_timed(ingest, repeat, memory))
+
+    loop_ns = 0.0
+    if "event_loop" in stages or "strategies" in stages:
+        seconds, peak = _timed(
+            lambda: BacktestEngine(data, {"null": NullStrategy("null")}).run(), repeat, memory
+        )
+        loop_ns = seconds / total * 1e9
+        if "event_loop" in stages:
+            record("event_loop", seconds, peak)
+
+    if "strategies" in stages:
+        for name in strategies:
+            seconds, peak = _timed(
+                lambda name=name: BacktestEngine(data, {name: load_strategy(name)}).run(),
+                repeat,
+                memory,
+            )
+            record(f"strategy:{name}", seconds, peak, on_bar_ns=seconds / total * 1e9 - loop_ns)
+
+    if "metrics" in stages:
+        record("metrics", *_timed(lambda: _feed_metrics(data), repeat, memory))
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(
+    scenarios: Sequence[Tuple[int, int]],
+    strategies: Sequence[str] = DEFAULT_STRATEGIES,
+    seed: int = 0,
+    repeat: int = 1,
+    memory: bool = True,
+    on_result: Callable[[BenchResult], None] | None = None,
+) -> Dict[str, Any]:
+    results: List[BenchResult] = []
+    for symbols, bars in scenarios:
+        for result in run_scenario(symbols, bars, strategies, seed, repeat, memory):
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def save(report: Dict[str, Any], path: str | Path) -> None:
+    Path(path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+def load(path: str | Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.1
+) -> List[Regression]:
+    """Stages whose per-bar time or peak memory grew by more than ``threshold`` (a fraction)."""
+
+    before = {f"{row['scenario']}/{row['stage']}": row for row in baseline["results"]}
+    regressions: List[Regression] = []
+    for row in current["results"]:
+        name = f"{row['scenario']}/{row['stage']}"
+        old = before.get(name)
+        if old is None:
+            continue
+        for metric in ("ns_per_bar", "peak_mb"):
+            if row.get(metric) is None or old.get(metric) is None:
+                continue
+            if row[metric] > old[metric] * (1 + threshold):
+                regressions.append(Regression(name, metric, old[metric], row[metric]))
+    return regressions
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+
+from ..core.dataframe import BarFrame, to_epoch_ns
+
+_MINUTE_NS = 60 * 1_000_000_000
+DEFAULT_START = datetime(2024, 1, 2, 9, 30)
+
+
+def synthetic_frame(
+    bars: int, seed: int = 0, start: datetime = DEFAULT_START, price: float = 100.0
+) -> BarFrame:
+    """Seeded random-walk 1-minute OHLCV bars."""
+
+    rng = np.random.default_rng(seed)
+    epochs = to_epoch_ns(start) + np.arange(bars, dtype=np.int64) * _MINUTE_NS
+    close = np.maximum(price + np.cumsum(rng.normal(0.0, 0.1, bars)), 1.0)
+    open_ = np.concatenate(([close[0]] if bars else [], close[:-1]))
+    spread = np.abs(rng.normal(0.0, 0.05, bars))
+    columns = {
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "volume": rng.integers(100, 10_000, bars).astype(np.float64),
+    }
+    return BarFrame(epochs, columns, start.tzinfo)
+
+
+def synthetic_universe(symbols: int, bars: int, seed: int = 0) -> Dict[str, BarFrame]:
+    return {
+        f"SYM{i:04d}": synthetic_frame(bars, seed=seed + i, price=50.0 + i % 200)
+        for i in range(symbols)
+    }
@@ -0,0 +1,52 @@
+"""Event-loop scaling benchmark for BacktestEngine.run.
+
+Run with ``python -m leekbot.bench.timeline --sizes 10000,100000,1000000,10000000``. The
+per-bar cost column should stay flat as the total bar count grows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict, List
+
+from ..backtest.engine import BacktestEngine
+from ..core.utils import OrderIntent
+from ..strat.base import Strategy
+from .synthetic import synthetic_universe
+
+
+class NullStrategy(Strategy):
+    """Consumes bars without trading so the benchmark isolates engine overhead."""
+
+    def on_bar(self, bar: Dict, account_state: Dict) -> None:
+        return None
+
+    def get_orders(self) -> List[OrderIntent]:
+        return []
+
+
+def run(total_bars: int, symbols: int) -> Dict[str, float]:
+    per_symbol = max(total_bars // symbols, 1)
+    data = synthetic_universe(symbols, per_symbol)
+    engine = BacktestEngine(data, {"null": NullStrategy("null")})
+    started = time.perf_counter()
+    engine.run()
+    elapsed = time.perf_counter() - started
+    bars = per_symbol * symbols
+    return {"bars": float(bars), "seconds": elapsed, "ns_per_bar": elapsed / bars * 1e9}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000,10000000")
+    parser.add_argument("--symbols", type=int, default=10)
+    args = parser.parse_args()
+    print(f"{'bars':>12}{'seconds':>12}{'ns/bar':>12}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        stats = run(size, args.symbols)
+        print(f"{int(stats['bars']):>12}{stats['seconds']:>12.3f}{stats['ns_per_bar']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,43 @@
 from __future__ import annotations
 
+import asyncio
 import csv
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import AsyncIterator, Dict, List
 
 import typer
 import yaml
 
-from .backtest.engine import BacktestEngine
+from .backtest.cache import BacktestCache, run_backtest
+from .backtest.orderbook import ExecutionModel
+from .backtest.sweep import SearchSpace, SweepResult, run_sweep
+from .backtest.walkforward import WalkForwardRunner
+from .bench import suite
 from .config.styles import DEFAULT_TRADING_STYLES_PATH, load_trading_styles
+from .core.dataframe import from_epoch_ns
+from .core.events import BarEvent
 from .core.logging import configure_logging
+from .core.pairs import ADF_CRITICAL, ScanCriteria, save_pairs, scan_pairs
+from .core.profiler import StrategyProfiler, format_rows
+from .core.profiler import compare as compare_profiles
+from .core.ticks import TickAggregator, aggregate
+from .data.exchange_ws import CryptoWebSocketClient
+from .exec.budget import LatencyBudget
 from .exec.router import OrderRouter
+from .exec.runner import LiveRunner
+from .storage.barstore import BarStore, load_bars
 from .strat.base import load_strategy
 
 app = typer.Typer(name="leek")
+data_app = typer.Typer(help="Manage on-disk bar data.")
+app.add_typer(data_app, name="data")
+cache_app = typer.Typer(help="Inspect the backtest result cache.")
+app.add_typer(cache_app, name="cache")
+profile_app = typer.Typer(help="Read strategy hot-path profiles.")
+app.add_typer(profile_app, name="profile")
+pairs_app = typer.Typer(help="Find pairs for pairs_stat_arb.")
+app.add_typer(pairs_app, name="pairs")
 
 
 def load_config(path: Path) -> Dict:
@@ -22,15 +45,71 @@ def load_config(path: Path) -> Dict:
         return yaml.safe_load(fh)
 
 
+def backtest_cache(cfg: Dict) -> BacktestCache:
+    settings = cfg.get("cache") or {}
+    root = Path(settings.get("dir", ".leek_cache/backtests"))
+    return BacktestCache(root, max_bytes=int(settings.get("max_mb", 1024)) * 1024 * 1024)
+
+
+def data_paths(cfg: Dict) -> Dict[str, Path]:
+    """Map each configured symbol to its CSV (``path``) or bar store root (``store``)."""
+
+    paths: Dict[str, Path] = {}
+    for symbol, info in cfg.get("data", {}).items():
+        if "path" in info:
+            paths[symbol] = Path(info["path"])
+        elif "store" in info:
+            paths[symbol] = Path(info["store"]) / symbol
+    return paths
+
+
+def live_feed(cfg: Dict) -> AsyncIterator[BarEvent] | None:
+    """Bars built from the configured streaming (``exchange_ws``) ticks, or None without any."""
+
+    streams = [
+        info for info in cfg.get("data", {}).values() if info.get("provider") == "exchange_ws"
+    ]
+    if not streams:
+        return None
+    client = CryptoWebSocketClient(sum((info.get("venues", []) for info in streams), []))
+    return aggregate(client.stream(), TickAggregator("time", streams[0].get("bar", "1m")))
+
+
 @app.command()
-def run(mode: str = typer.Option("paper"), config: Path = typer.Option(...)) -> None:
+def run(
+    mode: str = typer.Option("paper"),
+    config: Path = typer.Option(...),
+    warm_state: Path = typer.Option(
+        None, help="Strategy state file, loaded at startup if present and saved on shutdown."
+    ),
+    warm_up: bool = typer.Option(
+        False, help="Rebuild strategy state from the tail of the configured data before trading."
+    ),
+) -> None:
     cfg = load_config(config)
     configure_logging(cfg["global"]["log_dir"])
+    feed = live_feed(cfg)
+    if feed is None:
+        raise typer.BadParameter("No streaming data provider configured", param_hint="--config")
     accounts = cfg.get("accounts", [])
     router = OrderRouter.from_config(accounts)
+    params = cfg.get("strategies") or {}
     strategies = {
-        name: load_strategy(name) for name in set(sum([acc["strategies"] for acc in accounts], []))
+        name: load_strategy(name, params.get(name))
+        for name in set(sum([acc["strategies"] for acc in accounts], []))
     }
+    runner = LiveRunner(
+        strategies,
+        router,
+        paper=mode == "paper",
+        warm_state=warm_state,
+        budget=LatencyBudget.from_dict(cfg.get("budget")),
+    )
+    if runner.last_timestamp is not None:
+        typer.echo(f"Resuming after {runner.last_timestamp} from {warm_state}")
+    if warm_up:
+        history = {symbol: load_bars(path) for symbol, path in data_paths(cfg).items()}
+        typer.echo(f"Warmed up on {runner.warm_up(history)} timestamps of history")
     typer.echo(
         " ".join(
             [
@@ -41,6 +120,16 @@ def run(mode: str = typer.Option("paper"), config: Path = typer.Option(...)) ->
             ]
         )
     )
+    try:
+        asyncio.run(runner.run(feed))
+    except KeyboardInterrupt:
+        typer.echo("Stopped")
+    typer.echo(f"Final metrics: {runner.metrics.snapshot()}")
+    if runner.budget is not None:
+        for row in runner.budget.rows():
+            typer.echo(f"budget {row}")
+    if warm_state is not None:
+        typer.echo(f"Saved strategy state to {warm_state}")
 
 
 @app.command()
@@ -48,19 +137,292 @@ def backtest(
     config: Path = typer.Option(...),
     from_date: datetime = typer.Option(...),
     to: datetime = typer.Option(...),
+    vectorized: bool = typer.Option(False, help="Use batch signal generation instead of on_bar."),
+    cache: bool = typer.Option(True, help="Reuse results of identical earlier runs."),
+    profile: Path = typer.Option(None, help="Time every strategy call and write the profile here."),
+    profile_sort: str = typer.Option("total_ms", help="Column to rank the profile by."),
+    profile_allocations: bool = typer.Option(False, help="Also count allocated blocks per call."),
+    checkpoints: Path = typer.Option(
+        None, help="Checkpoint directory; an interrupted identical run resumes from it."
+    ),
+    checkpoint_every: int = typer.Option(10_000, help="Timestamps between checkpoints."),
 ) -> None:
     cfg = load_config(config)
-    data_cfg = cfg.get("data", {})
     typer.echo(f"Backtesting from {from_date} to {to}")
-    paths = {symbol: Path(info["path"]) for symbol, info in data_cfg.items() if "path" in info}
-    engine = BacktestEngine.from_csv(paths, cfg.get("strategies", {}))
-    result = engine.run()
+    paths = data_paths(cfg)
+    execution = ExecutionModel.from_dict(cfg.get("execution"))
+    result_cache = backtest_cache(cfg) if cache and profile is None else None
+    profiler = StrategyProfiler(profile_allocations) if profile is not None else None
+    result, hit = run_backtest(
+        paths,
+        cfg.get("strategies", {}),
+        execution,
+        vectorized=vectorized,
+        cache=result_cache,
+        profiler=profiler,
+        checkpoints=checkpoints,
+        checkpoint_every=checkpoint_every,
+        start=from_date,
+        end=to,
+    )
+    if result_cache is not None:
+        stats = result_cache.stats()
+        typer.echo(
+            f"cache {'hit' if hit else 'miss'} "
+            f"(hits={stats.hits} misses={stats.misses} hit_rate={stats.hit_rate:.0%})"
+        )
     typer.echo(result.metrics)
+    for name, stats in result.attribution.items():
+        typer.echo(f"{name}: {stats}")
     if result.trades:
         with open("backtest_trades.csv", "w", newline="", encoding="utf-8") as fh:
             writer = csv.DictWriter(fh, fieldnames=result.trades[0].keys())
             writer.writeheader()
             writer.writerows(result.trades)
+    if profiler is not None:
+        profiler.save(profile)
+        typer.echo(format_rows(profiler.rows(sort=profile_sort)))
+        typer.echo(f"Wrote {profile}")
+
+
+@app.command()
+def sweep(
+    config: Path = typer.Option(...),
+    space: Path = typer.Option(..., help="YAML search space (strategy, params, grid/random)."),
+    objective: str = typer.Option("sharpe"),
+    minimize: bool = typer.Option(False, help="Rank ascending instead of descending."),
+    workers: int = typer.Option(0, help="Worker processes; 0 uses every core."),
+    vectorized: bool = typer.Option(False, help="Use batch signal generation instead of on_bar."),
+    top: int = typer.Option(20, help="Rows of the ranked table to print."),
+    output: Path = typer.Option(Path("sweep_results.csv")),
+) -> None:
+    cfg = load_config(config)
+    paths = data_paths(cfg)
+    search = SearchSpace.from_yaml(space)
+
+    def progress(result: SweepResult) -> None:
+        typer.echo(f"{objective}={result.metrics.get(objective, 0.0):.4f} {result.params}")
+
+    results = run_sweep(
+        paths,
+        search,
+        objective=objective,
+        processes=workers or None,
+        vectorized=vectorized,
+        minimize=minimize,
+        on_result=progress,
+    )
+    if not results:
+        typer.echo("Search space is empty")
+        return
+    rows = [result.to_row() for result in results]
+    typer.echo(f"Top {min(top, len(rows))} of {len(rows)} by {objective}:")
+    for row in rows[:top]:
+        typer.echo("  " + ", ".join(f"{key}={value}" for key, value in row.items()))
+    with open(output, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+@app.command()
+def walkforward(
+    config: Path = typer.Option(...),
+    space: Path = typer.Option(..., help="YAML search space (strategy, params, grid/random)."),
+    train_bars: int = typer.Option(..., help="In-sample bars per fold."),
+    test_bars: int = typer.Option(..., help="Out-of-sample bars per fold."),
+    step: int = typer.Option(0, help="Bars between fold starts; 0 uses test_bars."),
+    objective: str = typer.Option("sharpe"),
+    minimize: bool = typer.Option(False, help="Rank ascending instead of descending."),
+    workers: int = typer.Option(0, help="Worker processes; 0 uses every core."),
+    output: Path = typer.Option(Path("walkforward_trades.csv")),
+) -> None:
+    cfg = load_config(config)
+    paths = data_paths(cfg)
+    runner = WalkForwardRunner(
+        paths,
+        SearchSpace.from_yaml(space),
+        train_bars=train_bars,
+        test_bars=test_bars,
+        step=step or None,
+        objective=objective,
+        minimize=minimize,
+        processes=workers or None,
+    )
+    result = runner.run()
+    for fold in result.folds:
+        typer.echo(
+            f"fold {fold.fold.index}: {fold.params} "
+            f"in-sample {objective}={fold.in_sample.get(objective, 0.0):.4f} "
+            f"out-of-sample {objective}={fold.out_of_sample.get(objective, 0.0):.4f} "
+            f"trades={fold.trades}"
+        )
+    typer.echo(result.metrics)
+    if result.trades:
+        with open(output, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=result.trades[0].keys())
+            writer.writeheader()
+            writer.writerows(result.trades)
+
+
+@data_app.command("ingest")
+def data_ingest(
+    csv_files: List[Path] = typer.Argument(..., exists=True, dir_okay=False),
+    store: Path = typer.Option(..., help="Bar store root directory."),
+    symbol: str = typer.Option("", help="Symbol name; defaults to each file's stem."),
+    chunk_rows: int = typer.Option(1_000_000, help="Rows parsed per chunk."),
+) -> None:
+    """Convert bar CSVs into the memory-mapped binary bar store."""
+
+    if symbol and len(csv_files) > 1:
+        raise typer.BadParameter("--symbol can only be used with a single CSV")
+    bar_store = BarStore(store)
+    for csv_file in csv_files:
+        name = symbol or csv_file.stem
+        meta = bar_store.ingest_csv(name, csv_file, chunk_rows=chunk_rows)
+        typer.echo(f"{name}: {meta['rows']} bars -> {bar_store.path(name)}")
+
+
+@data_app.command("info")
+def data_info(store: Path = typer.Option(..., help="Bar store root directory.")) -> None:
+    bar_store = BarStore(store)
+    for name in bar_store.symbols():
+        meta = bar_store.meta(name)
+        first = from_epoch_ns(meta["first"]) if meta["rows"] else "-"
+        last = from_epoch_ns(meta["last"]) if meta["rows"] else "-"
+        typer.echo(f"{name}: {meta['rows']} bars {first} .. {last} [{', '.join(meta['columns'])}]")
+
+
+@cache_app.command("stats")
+def cache_stats(config: Path = typer.Option(...)) -> None:
+    result_cache = backtest_cache(load_config(config))
+    stats = result_cache.stats()
+    typer.echo(
+        f"{result_cache.root}: {len(result_cache)} results, "
+        f"{result_cache.size() / 1024 / 1024:.1f} MiB, hits={stats.hits} misses={stats.misses} "
+        f"evictions={stats.evictions} hit_rate={stats.hit_rate:.0%}"
+    )
+
+
+@cache_app.command("clear")
+def cache_clear(config: Path = typer.Option(...)) -> None:
+    result_cache = backtest_cache(load_config(config))
+    result_cache.clear()
+    typer.echo(f"Cleared {result_cache.root}")
+
+
+@profile_app.command("report")
+def profile_report(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False),
+    sort: str = typer.Option("total_ms", help="Column to rank by."),
+    by_symbol: bool = typer.Option(False, help="One row per symbol instead of per method."),
+    top: int = typer.Option(0, help="Only show this many rows; 0 shows all."),
+) -> None:
+    rows = StrategyProfiler.load(path).rows(by_symbol=by_symbol, sort=sort)
+    typer.echo(format_rows(rows, top or None))
+
+
+@profile_app.command("compare")
+def profile_compare(
+    baseline: Path = typer.Argument(..., exists=True, dir_okay=False),
+    current: Path = typer.Argument(..., exists=True, dir_okay=False),
+    metric: str = typer.Option("mean_us", help="Column to compare."),
+) -> None:
+    changes = compare_profiles(
+        StrategyProfiler.load(baseline), StrategyProfiler.load(current), metric
+    )
+    for change in changes:
+        typer.echo(
+            f"{change['strategy']:<20}{change['method']:<12}{change['baseline']:>12.2f}"
+            f"{change['current']:>12.2f}{change['change']:>+9.0%}"
+        )
+
+
+@pairs_app.command("scan")
+def pairs_scan(
+    config: Path = typer.Option(None, help="Config whose data section lists the universe."),
+    store: Path = typer.Option(None, help="Bar store root; scans every symbol in it."),
+    min_corr: float = typer.Option(0.7, help="Minimum correlation of log returns."),
+    top_k: int = typer.Option(10, help="Most correlated partners tested per symbol."),
+    max_adf: float = typer.Option(ADF_CRITICAL[0.05], help="Maximum Engle-Granger ADF t-stat."),
+    min_half_life: float = typer.Option(1.0, help="Minimum spread half-life in bars."),
+    max_half_life: float = typer.Option(0.0, help="Maximum spread half-life in bars; 0 = none."),
+    min_bars: int = typer.Option(100, help="Skip symbols with fewer bars."),
+    workers: int = typer.Option(0, help="Worker processes; 0 uses every core."),
+    top: int = typer.Option(20, help="Pairs to print."),
+    output: Path = typer.Option(Path("pairs.yaml"), help="Ranked pairs file for pairs_file."),
+) -> None:
+    """Rank cointegrated pairs of a universe for pairs_stat_arb's pairs_file setting."""
+
+    if (config is None) == (store is None):
+        raise typer.BadParameter("Pass exactly one of --config or --store")
+    if store is not None:
+        bar_store = BarStore(store)
+        frames = {symbol: bar_store.open(symbol) for symbol in bar_store.symbols()}
+    else:
+        frames = {
+            symbol: load_bars(path) for symbol, path in data_paths(load_config(config)).items()
+        }
+    criteria = ScanCriteria(min_corr, top_k, max_adf, min_half_life, max_half_life or None)
+    pairs = scan_pairs(frames, criteria, processes=workers or None, min_bars=min_bars)
+    for pair in pairs[:top]:
+        typer.echo(
+            f"{pair.a:<12}{pair.b:<12}hedge={pair.hedge:.4f} corr={pair.corr:.3f} "
+            f"adf={pair.adf:.2f} half_life={pair.half_life:.1f}"
+        )
+    save_pairs(output, pairs)
+    typer.echo(f"Wrote {len(pairs)} pairs from {len(frames)} symbols to {output}")
+
+
+@app.command()
+def bench(
+    preset: str = typer.Option("quick", help="Scenario set: quick, standard or full."),
+    scenario: List[str] = typer.Option(
+        [], help="Extra SYMBOLSxBARS scenarios, e.g. 100x10000; replaces the preset."
+    ),
+    strategy: List[str] = typer.Option([], help="Strategies to time; defaults to all batchable."),
+    seed: int = typer.Option(0),
+    repeat: int = typer.Option(1, help="Timed runs per stage; the fastest is kept."),
+    memory: bool = typer.Option(True, help="Record peak traced memory (one extra run)."),
+    output: Path = typer.Option(Path("bench.json"), help="Where to write the JSON report."),
+    baseline: Path = typer.Option(None, help="Earlier report to compare against."),
+    threshold: float = typer.Option(0.1, help="Allowed slowdown/memory growth before flagging."),
+) -> None:
+    """Time ingestion, the event loop, strategies and metrics on seeded synthetic data."""
+
+    if scenario:
+        scenarios = [tuple(int(part) for part in item.lower().split("x")) for item in scenario]
+    elif preset in suite.PRESETS:
+        scenarios = suite.PRESETS[preset]
+    else:
+        raise typer.BadParameter(f"Unknown preset {preset}")
+
+    def show(result: suite.BenchResult) -> None:
+        peak = f"{result.peak_mb:9.1f} MB" if result.peak_mb is not None else ""
+        typer.echo(
+            f"{result.name:<40}{result.seconds:>10.3f}s{result.ns_per_bar:>10.0f} ns/bar{peak}"
+        )
+
+    report = suite.run_suite(
+        scenarios,
+        strategy or suite.DEFAULT_STRATEGIES,
+        seed=seed,
+        repeat=repeat,
+        memory=memory,
+        on_result=show,
+    )
+    suite.save(report, output)
+    typer.echo(f"Wrote {output}")
+    if baseline is not None:
+        regressions = suite.compare(report, suite.load(baseline), threshold)
+        for reg in regressions:
+            typer.echo(
+                f"REGRESSION {reg.name} {reg.metric}: {reg.baseline:.1f} -> {reg.current:.1f} "
+                f"({reg.change:+.0%})"
+            )
+        if regressions:
+            raise typer.Exit(code=1)
+        typer.echo(f"No regressions beyond {threshold:.0%} against {baseline}")
 
 
 @app.command()
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, time, timedelta
-from typing import Dict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Tuple
 
 import pytz
 
@@ -21,6 +21,45 @@ class MarketSession:
             return False
         return self.open_time <= local.time() <= self.close_time
 
+    def bounds(self, day: date) -> Tuple[datetime, datetime] | None:
+        """UTC ``[open, close)`` of the session opening on local ``day``, ``None`` if closed.
+
+        A close at or before the open time belongs to the next day (CME, FX); without
+        ``weekend`` a session closing on a Saturday or Sunday does not trade.
+        """
+
+        close_day = day + timedelta(days=1) if self.close_time <= self.open_time else day
+        if not self.weekend and close_day.weekday() >= 5:
+            return None
+        tz = pytz.timezone(self.timezone)
+        open_dt = tz.localize(datetime.combine(day, self.open_time))
+        close_dt = tz.localize(datetime.combine(close_day, self.close_time))
+        return open_dt.astimezone(pytz.utc), close_dt.astimezone(pytz.utc)
+
+    def session_at(self, ts: datetime) -> Tuple[datetime, datetime]:
+        """The session containing ``ts``, or the next one to open if ``ts`` falls between two."""
+
+        day = ts.astimezone(pytz.timezone(self.timezone)).date() - timedelta(days=1)
+        for offset in range(10):
+            span = self.bounds(day + timedelta(days=offset))
+            if span is not None and span[1] > ts:
+                return span
+        raise ValueError(f"No session within ten days of {ts}")
+
+    def sessions(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """Every session closing after ``start`` and opening at or before ``end``."""
+
+        tz = pytz.timezone(self.timezone)
+        day = start.astimezone(tz).date() - timedelta(days=1)
+        last = end.astimezone(tz).date()
+        spans = []
+        while day <= last:
+            span = self.bounds(day)
+            if span is not None and span[1] > start and span[0] <= end:
+                spans.append(span)
+            day += timedelta(days=1)
+        return spans
+
 
 DEFAULT_SESSIONS: Dict[str, MarketSession] = {
     "CRYPTO": MarketSession(time(0, 0), time(23, 59, 59), "UTC", weekend=True),
@@ -0,0 +1,126 @@
+"""The latest bar of every symbol of a universe, as aligned arrays.
+
+A :class:`CrossSection` gives every symbol a fixed slot; ``open``, ``high``, ``low``, ``close``
+and ``volume`` hold each symbol's most recent bar at that slot (NaN before its first bar) and
+:attr:`CrossSection.updated` marks the slots whose bar belongs to the current timestamp. The
+backtest engine and the live runner fill one per run and hand it to cross-sectional strategies
+once per timestamp, so ranking a universe is a few array operations instead of one Python call
+per symbol.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from .dataframe import OHLCV
+
+
+class CrossSection:
+    __slots__ = ("symbols", "slots", "epoch", "_values", "_updated", "_fresh")
+
+    def __init__(self, symbols: Iterable[str] = ()) -> None:
+        self.symbols: List[str] = []
+        self.slots: Dict[str, int] = {}
+        self.epoch: int | None = None
+        self._values = np.full((len(OHLCV), 16), np.nan)
+        self._updated = np.zeros(16, dtype=bool)
+        self._fresh: List[int] = []
+        for symbol in symbols:
+            self.slot(symbol)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def slot(self, symbol: str) -> int:
+        """Slot of ``symbol``, adding it (with no bar yet) if it is new."""
+
+        slot = self.slots.get(symbol)
+        if slot is None:
+            slot = self.slots[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            capacity = self._updated.shape[0]
+            if slot == capacity:
+                values = np.full((len(OHLCV), capacity * 2), np.nan)
+                values[:, :capacity] = self._values
+                self._values = values
+                self._updated = np.concatenate((self._updated, np.zeros(capacity, dtype=bool)))
+        return slot
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._values[0, : len(self.symbols)]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._values[1, : len(self.symbols)]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._values[2, : len(self.symbols)]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._values[3, : len(self.symbols)]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._values[4, : len(self.symbols)]
+
+    @property
+    def updated(self) -> np.ndarray:
+        """True at the slots whose bar has the current timestamp."""
+
+        return self._updated[: len(self.symbols)]
+
+    @property
+    def fresh(self) -> List[int]:
+        """Slots updated at the current timestamp, in arrival order."""
+
+        return self._fresh
+
+    def begin(self, epoch: int) -> None:
+        """Start the timestamp ``epoch``; earlier bars stay as every symbol's latest."""
+
+        self._updated[self._fresh] = False
+        self._fresh = []
+        self.epoch = epoch
+
+    def write(self, slots: Sequence[int], bars: Sequence[Dict]) -> None:
+        """Store ``bars[i]`` at ``slots[i]``, one array assignment per field."""
+
+        index = np.asarray(slots, dtype=np.intp)
+        values = self._values
+        for row, name in enumerate(OHLCV):
+            values[row, index] = [bar[name] for bar in bars]
+        self._updated[index] = True
+        self._fresh.extend(slots)
+
+    def set_bar(
+        self, symbol: str, open_: float, high: float, low: float, close: float, volume: float
+    ) -> int:
+        slot = self.slot(symbol)
+        self._values[:, slot] = (open_, high, low, close, volume)
+        if not self._updated[slot]:
+            self._updated[slot] = True
+            self._fresh.append(slot)
+        return slot
+
+    def top(self, values: np.ndarray, n: int, mask: np.ndarray | None = None) -> np.ndarray:
+        """Slots of the ``n`` largest non-NaN ``values`` (where ``mask``), largest first."""
+
+        candidates = np.flatnonzero(~np.isnan(values) if mask is None else mask & ~np.isnan(values))
+        if n <= 0 or not len(candidates):
+            return candidates[:0]
+        scores = values[candidates]
+        if len(candidates) > n:
+            keep = np.argpartition(-scores, n - 1)[:n]
+            candidates, scores = candidates[keep], scores[keep]
+        # equal values are ordered by slot so runs are reproducible
+        return candidates[np.lexsort((candidates, -scores))]
+
+    def bottom(self, values: np.ndarray, n: int, mask: np.ndarray | None = None) -> np.ndarray:
+        """Slots of the ``n`` smallest non-NaN ``values`` (where ``mask``), smallest first."""
+
+        return self.top(-values, n, mask)
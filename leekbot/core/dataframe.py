@@ -1,8 +1,58 @@
 from __future__ import annotations
 
+import csv
+import re
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Dict, Iterator, List
+from datetime import datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+OHLCV = ("open", "high", "low", "close", "volume")
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_ITER_CHUNK = 4096
+_FREQ = re.compile(r"^\s*(\d*)\s*([a-z]+)\s*$")
+_FREQ_UNITS = {
+    "s": "seconds",
+    "sec": "seconds",
+    "second": "seconds",
+    "m": "minutes",
+    "min": "minutes",
+    "minute": "minutes",
+    "t": "minutes",
+    "h": "hours",
+    "hr": "hours",
+    "hour": "hours",
+    "d": "days",
+    "day": "days",
+    "w": "weeks",
+    "wk": "weeks",
+    "week": "weeks",
+}
+
+
+def parse_freq(freq: str) -> timedelta:
+    """Parse a bar frequency such as ``"1min"``, ``"5m"``, ``"1h"``, ``"1d"`` or ``"1w"``.
+
+    ``m`` means minutes, as in bar timeframes; months are not supported.
+    """
+
+    match = _FREQ.match(freq.lower())
+    unit = _FREQ_UNITS.get(match.group(2).rstrip("s") or "s") if match else None
+    if match is None or unit is None:
+        raise ValueError(f"Unsupported frequency {freq}")
+    count = int(match.group(1) or 1)
+    if count <= 0:
+        raise ValueError(f"Unsupported frequency {freq}")
+    return timedelta(**{unit: count})
+
+
+def freq_ns(freq: str) -> int:
+    return parse_freq(freq) // _MICROSECOND * 1000
 
 
 def date_range(
@@ -13,9 +63,7 @@ def date_range(
 ) -> List[datetime]:
     if periods is None and end is None:
         raise ValueError("Either end or periods must be provided")
-    if freq != "1min":
-        raise ValueError("Only 1min frequency supported in lightweight implementation")
-    delta = timedelta(minutes=1)
+    delta = parse_freq(freq)
     current = start
     result: List[datetime] = []
     if end is not None:
@@ -29,6 +77,44 @@ def date_range(
     return result
 
 
+def to_epoch_ns(ts: datetime) -> int:
+    """Convert a datetime to integer nanoseconds since the epoch (naive values are UTC)."""
+
+    if ts.tzinfo is None:
+        return (ts - _EPOCH) // _MICROSECOND * 1000
+    return (ts - _EPOCH_UTC) // _MICROSECOND * 1000
+
+
+def from_epoch_ns(value: int, tz: tzinfo | None = None) -> datetime:
+    naive = _EPOCH + timedelta(microseconds=int(value) // 1000)
+    if tz is None:
+        return naive
+    return naive.replace(tzinfo=timezone.utc).astimezone(tz)
+
+
+def datetimes_from_epochs(epochs: np.ndarray, tz: tzinfo | None = None) -> List[datetime]:
+    naive = np.asarray(epochs, dtype=np.int64).astype("datetime64[ns]").astype("datetime64[us]")
+    values: List[datetime] = naive.tolist()
+    if tz is None:
+        return values
+    return [ts.replace(tzinfo=timezone.utc).astimezone(tz) for ts in values]
+
+
+def _epochs_from_index(index: Sequence[datetime]) -> np.ndarray:
+    return np.fromiter((to_epoch_ns(ts) for ts in index), dtype=np.int64, count=len(index))
+
+
+def _in_order(
+    epochs: np.ndarray, columns: Mapping[str, np.ndarray]
+) -> Tuple[np.ndarray, Mapping[str, np.ndarray]]:
+    """``epochs`` and ``columns`` sorted by time, keeping rows in place when already sorted."""
+
+    if len(epochs) < 2 or not np.any(np.diff(epochs) < 0):
+        return epochs, columns
+    order = np.argsort(epochs, kind="stable")
+    return epochs[order], {name: values[order] for name, values in columns.items()}
+
+
 class _LocAccessor:
     def __init__(self, data: Dict[datetime, Dict[str, float]]) -> None:
         self._data = data
@@ -39,6 +125,8 @@ class _LocAccessor:
 
 @dataclass
 class MiniDataFrame:
+    """Legacy row-oriented container; prefer :class:`BarFrame` for anything sizeable."""
+
     rows: List[Dict[str, float]]
     index: List[datetime]
 
@@ -52,3 +140,224 @@ class MiniDataFrame:
 
     def to_dicts(self) -> List[Dict[str, float]]:
         return list(self.rows)
+
+
+class _BarFrameLoc:
+    __slots__ = ("_frame",)
+
+    def __init__(self, frame: BarFrame) -> None:
+        self._frame = frame
+
+    def __getitem__(self, key: datetime | slice) -> Dict[str, float] | BarFrame:
+        if isinstance(key, slice):
+            return self._frame.between(key.start, key.stop)
+        pos = self._frame.position(key)
+        if pos < 0:
+            raise KeyError(key)
+        return self._frame.row(pos)
+
+
+class BarFrame:
+    """Columnar bars: one contiguous float64 array per field over a sorted int64 epoch-ns index.
+
+    Slices returned by :meth:`between` and :meth:`slice_rows` are views that share memory with
+    the parent frame, so carving a backtest window out of a large history never copies bars.
+    Lookups binary-search the index, so the constructor rejects epochs that do not strictly
+    increase; :meth:`from_rows` and :meth:`from_columns` sort their input first.
+    """
+
+    __slots__ = ("epochs", "columns", "tz", "_index", "loc")
+
+    def __init__(
+        self,
+        epochs: np.ndarray,
+        columns: Mapping[str, np.ndarray],
+        tz: tzinfo | None = None,
+        check_order: bool = True,
+    ) -> None:
+        self.epochs = np.asarray(epochs, dtype=np.int64)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.asarray(values, dtype=np.float64) for name, values in columns.items()
+        }
+        for name, values in self.columns.items():
+            if len(values) != len(self.epochs):
+                raise ValueError(
+                    f"Column {name} has {len(values)} rows, index has {len(self.epochs)}"
+                )
+        if check_order and len(self.epochs) > 1:
+            bad = np.flatnonzero(np.diff(self.epochs) <= 0)
+            if len(bad):
+                raise ValueError(
+                    f"Bar timestamps must strictly increase; row {bad[0] + 1} is not after "
+                    f"row {bad[0]}"
+                )
+        self.tz = tz
+        self._index: List[datetime] | None = None
+        self.loc = _BarFrameLoc(self)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Mapping[str, float]], index: Sequence[datetime]) -> BarFrame:
+        if len(rows) != len(index):
+            raise ValueError("rows and index must have the same length")
+        names: List[str] = list(rows[0].keys()) if rows else list(OHLCV)
+        epochs = _epochs_from_index(index)
+        columns = {
+            name: np.fromiter((row[name] for row in rows), dtype=np.float64, count=len(rows))
+            for name in names
+        }
+        epochs, columns = _in_order(epochs, columns)
+        tz = index[0].tzinfo if len(index) else None
+        return cls(epochs, columns, tz)
+
+    @classmethod
+    def from_columns(
+        cls, index: Sequence[datetime], columns: Mapping[str, Sequence[float]]
+    ) -> BarFrame:
+        epochs, arrays = _in_order(
+            _epochs_from_index(index),
+            {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()},
+        )
+        tz = index[0].tzinfo if len(index) else None
+        return cls(epochs, arrays, tz)
+
+    @classmethod
+    def empty(cls, names: Iterable[str] = OHLCV) -> BarFrame:
+        return cls(np.empty(0, dtype=np.int64), {name: np.empty(0) for name in names})
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __contains__(self, ts: datetime) -> bool:
+        return self.position(ts) >= 0
+
+    def __iter__(self) -> Iterator[Dict[str, float]]:
+        names = list(self.columns)
+        for start in range(0, len(self.epochs), _ITER_CHUNK):
+            stop = start + _ITER_CHUNK
+            cols = [self.columns[name][start:stop].tolist() for name in names]
+            for values in zip(*cols):
+                yield dict(zip(names, values))
+
+    @property
+    def field_names(self) -> List[str]:
+        return list(self.columns)
+
+    @property
+    def index(self) -> List[datetime]:
+        if self._index is None:
+            self._index = datetimes_from_epochs(self.epochs, self.tz)
+        return self._index
+
+    @property
+    def nbytes(self) -> int:
+        return self.epochs.nbytes + sum(values.nbytes for values in self.columns.values())
+
+    def timestamp(self, pos: int) -> datetime:
+        return from_epoch_ns(self.epochs[pos], self.tz)
+
+    def position(self, ts: datetime | int) -> int:
+        """Return the row number holding ``ts`` or -1 when the frame has no such bar."""
+
+        key = ts if isinstance(ts, (int, np.integer)) else to_epoch_ns(ts)
+        pos = int(np.searchsorted(self.epochs, key))
+        if pos < len(self.epochs) and self.epochs[pos] == key:
+            return pos
+        return -1
+
+    def row(self, pos: int) -> Dict[str, float]:
+        return {name: float(values[pos]) for name, values in self.columns.items()}
+
+    def slice_rows(self, start: int, stop: int) -> BarFrame:
+        frame = BarFrame.__new__(BarFrame)
+        frame.epochs = self.epochs[start:stop]
+        frame.columns = {name: values[start:stop] for name, values in self.columns.items()}
+        frame.tz = self.tz
+        frame._index = None
+        frame.loc = _BarFrameLoc(frame)
+        return frame
+
+    def between(
+        self, start: datetime | int | None = None, end: datetime | int | None = None
+    ) -> BarFrame:
+        """Zero-copy view of the bars with ``start <= ts <= end``."""
+
+        lo = 0
+        hi = len(self.epochs)
+        if start is not None:
+            key = start if isinstance(start, (int, np.integer)) else to_epoch_ns(start)
+            lo = int(np.searchsorted(self.epochs, key, side="left"))
+        if end is not None:
+            key = end if isinstance(end, (int, np.integer)) else to_epoch_ns(end)
+            hi = int(np.searchsorted(self.epochs, key, side="right"))
+        return self.slice_rows(lo, max(lo, hi))
+
+    def to_dicts(self) -> List[Dict[str, float]]:
+        return list(self)
+
+
+def as_bar_frame(data: BarFrame | MiniDataFrame) -> BarFrame:
+    if isinstance(data, BarFrame):
+        return data
+    return BarFrame.from_rows(data.rows, data.index)
+
+
+def _parse_chunk(header: List[str], raw_ts: List[str], raw_cols: List[List[str]]) -> BarFrame:
+    tz = datetime.fromisoformat(raw_ts[0]).tzinfo if raw_ts else None
+    if tz is None:
+        epochs = np.array(raw_ts, dtype="datetime64[ns]").astype(np.int64)
+    else:
+        epochs = np.fromiter(
+            (to_epoch_ns(datetime.fromisoformat(value)) for value in raw_ts),
+            dtype=np.int64,
+            count=len(raw_ts),
+        )
+    columns = {
+        name: np.array(values, dtype=np.float64) for name, values in zip(header[1:], raw_cols)
+    }
+    return BarFrame(epochs, columns, tz, check_order=False)
+
+
+def iter_csv_chunks(path: str | Path, chunk_rows: int = 1_000_000) -> Iterator[BarFrame]:
+    """Stream a bar CSV as frames of at most ``chunk_rows`` rows, in file order."""
+
+    with open(path, encoding="utf-8", newline="") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if header is None:
+            return
+        raw_ts: List[str] = []
+        raw_cols: List[List[str]] = [[] for _ in header[1:]]
+        for record in reader:
+            if not record:
+                continue
+            raw_ts.append(record[0])
+            for column, value in zip(raw_cols, record[1:]):
+                column.append(value)
+            if len(raw_ts) >= chunk_rows:
+                yield _parse_chunk(header, raw_ts, raw_cols)
+                raw_ts = []
+                raw_cols = [[] for _ in header[1:]]
+        if raw_ts:
+            yield _parse_chunk(header, raw_ts, raw_cols)
+
+
+def concat_frames(frames: Sequence[BarFrame]) -> BarFrame:
+    if not frames:
+        return BarFrame.empty()
+    if len(frames) == 1:
+        return frames[0]
+    names = frames[0].field_names
+    epochs = np.concatenate([frame.epochs for frame in frames])
+    columns = {name: np.concatenate([frame[name] for frame in frames]) for name in names}
+    return BarFrame(epochs, columns, frames[0].tz, check_order=False)
+
+
+def read_csv_bars(path: str | Path) -> BarFrame:
+    """Load a CSV whose first column is an ISO timestamp and the rest are numeric fields."""
+
+    frame = concat_frames(list(iter_csv_chunks(path)))
+    epochs, columns = _in_order(frame.epochs, frame.columns)
+    return BarFrame(epochs, columns, frame.tz)
@@ -3,7 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, NoReturn, Tuple
+
+import numpy as np
 
 
 class EventType(str, Enum):
@@ -15,6 +18,85 @@ class EventType(str, Enum):
     ACCOUNT = "account"
 
 
+class Bar(dict):
+    """An immutable bar, allocated once and shared by every strategy that reads it.
+
+    It reads like the bar dicts strategies always received (``bar["close"]``, ``bar.get``,
+    ``dict(bar)`` for a private copy) and also by attribute (``bar.close``), but any attempt to
+    modify it raises ``TypeError``: a strategy that wants to keep a bar keeps the fields it needs
+    or a copy.
+    """
+
+    __slots__ = ()
+
+    symbol = property(itemgetter("symbol"))
+    open = property(itemgetter("open"))
+    high = property(itemgetter("high"))
+    low = property(itemgetter("low"))
+    close = property(itemgetter("close"))
+    volume = property(itemgetter("volume"))
+
+    @property
+    def timeframe(self) -> str | None:
+        return self.get("timeframe")
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("Bar is immutable; copy it with dict(bar) to modify")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self) -> Tuple[type, Tuple[Dict[str, Any]]]:
+        return Bar, (dict(self),)
+
+    def __copy__(self) -> Bar:
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Bar:
+        return self
+
+
+class BarSlice:
+    """Every symbol's bar of one timestamp, in arrival order, for ``Strategy.on_bars``.
+
+    Iterating yields the :class:`Bar` objects; :meth:`column` gives one field of all of them as
+    an array aligned with :attr:`symbols` and :meth:`get` looks a symbol up.
+    """
+
+    __slots__ = ("timestamp", "bars", "_index", "_columns")
+
+    def __init__(self, timestamp: datetime, bars: List[Bar]) -> None:
+        self.timestamp = timestamp
+        self.bars = bars
+        self._index: Dict[str, int] | None = None
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    def __iter__(self) -> Iterator[Bar]:
+        return iter(self.bars)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.get(symbol) is not None
+
+    @property
+    def symbols(self) -> List[str]:
+        return [bar["symbol"] for bar in self.bars]
+
+    def get(self, symbol: str) -> Bar | None:
+        if self._index is None:
+            self._index = {bar["symbol"]: pos for pos, bar in enumerate(self.bars)}
+        pos = self._index.get(symbol)
+        return None if pos is None else self.bars[pos]
+
+    def column(self, name: str) -> np.ndarray:
+        values = self._columns.get(name)
+        if values is None:
+            values = self._columns[name] = np.array([bar[name] for bar in self.bars], dtype=float)
+        return values
+
+
 @dataclass(slots=True)
 class MarketEvent:
     type: EventType
@@ -0,0 +1,204 @@
+"""Per-symbol features shared by every strategy of an engine or live runner.
+
+Strategies declare the features they read as strings and the store computes each distinct one
+once per symbol per bar, so state grows with the number of distinct features rather than with
+the number of strategies reading them. A feature is ``<source>_<stat>(<window>)`` or one of the
+bar-level indicators ``vwap(<window>)`` and ``atr(<window>)``:
+
+* sources: ``open``, ``high``, ``low``, ``close``, ``volume``, ``range`` (``high - low``) and
+  ``move`` (``abs(close - previous close)``, first seen on a symbol's second bar);
+* stats: ``sum``, ``mean``, ``std``, ``var``, ``max``, ``min``, ``ema`` and ``zscore``, backed by
+  the O(1) indicators of :mod:`.indicators`.
+
+``close_mean(20)``, ``move_mean(5)`` and ``atr(14)`` are all valid. Values are NaN until their
+window is full, except ``ema`` which starts at the first value.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping
+
+from .indicators import (
+    ATR,
+    EMA,
+    NAN,
+    RollingMax,
+    RollingMean,
+    RollingMin,
+    RollingSum,
+    RollingVariance,
+    RollingVWAP,
+    ZScore,
+)
+
+SOURCES = ("open", "high", "low", "close", "volume", "range", "move")
+STATS: Dict[str, Callable[[int], object]] = {
+    "sum": RollingSum,
+    "mean": RollingMean,
+    "std": RollingVariance,
+    "var": RollingVariance,
+    "max": RollingMax,
+    "min": RollingMin,
+    "ema": EMA,
+    "zscore": ZScore,
+}
+_PATTERN = re.compile(r"^\s*(?:([a-z]+)_)?([a-z]+)\s*\(\s*(\d+)\s*\)\s*$")
+
+
+@dataclass(frozen=True, slots=True)
+class FeatureSpec:
+    name: str
+    source: str | None
+    stat: str
+    window: int
+
+    def build(self) -> object:
+        if self.stat == "vwap":
+            return RollingVWAP(self.window)
+        if self.stat == "atr":
+            return ATR(self.window)
+        return STATS[self.stat](self.window)
+
+
+def parse_feature(text: str) -> FeatureSpec:
+    """Parse ``close_mean(20)``-style text into a spec with its canonical name."""
+
+    match = _PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"Cannot parse feature {text!r}; expected e.g. close_mean(20)")
+    source, stat, window = match.group(1), match.group(2), int(match.group(3))
+    if window < 1:
+        raise ValueError(f"Feature {text!r} needs a positive window")
+    if source is None:
+        if stat not in ("vwap", "atr"):
+            raise ValueError(f"Unknown feature {text!r}")
+        return FeatureSpec(f"{stat}({window})", None, stat, window)
+    if source not in SOURCES:
+        raise ValueError(f"Unknown source {source!r} in {text!r}; expected one of {SOURCES}")
+    if stat not in STATS:
+        raise ValueError(f"Unknown stat {stat!r} in {text!r}; expected one of {tuple(STATS)}")
+    return FeatureSpec(f"{source}_{stat}({window})", source, stat, window)
+
+
+class _SymbolFeatures:
+    __slots__ = ("count", "prev_close", "indicators", "values")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.prev_close: float | None = None
+        self.indicators: List[object] = []
+        self.values: Dict[str, float] = {}
+
+
+class FeatureStore:
+    """Computes every registered feature once per bar per symbol.
+
+    The engine or runner calls :meth:`update` with each base bar before dispatching it;
+    strategies then read :meth:`get`, a read-only mapping from feature name to value.
+    """
+
+    def __init__(self, features: Iterable[str] = ()) -> None:
+        self.specs: Dict[str, FeatureSpec] = {}
+        self._order: List[FeatureSpec] = []
+        self.symbols: Dict[str, _SymbolFeatures] = {}
+        self.register(features)
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    @property
+    def warmup(self) -> int:
+        """Bars per symbol after which every feature has a value independent of older bars.
+
+        An ``ema`` never forgets its start; four windows leave it weighing under 0.1%.
+        """
+
+        return max(
+            (
+                4 * spec.window if spec.stat == "ema" else spec.window + (spec.source == "move")
+                for spec in self._order
+            ),
+            default=0,
+        )
+
+    def register(self, features: Iterable[str]) -> List[str]:
+        """Add features (already known ones are shared) and return their canonical names.
+
+        Symbols already tracked start computing a newly added feature from their next bar.
+        """
+
+        names = []
+        for text in features:
+            spec = parse_feature(text)
+            if spec.name not in self.specs:
+                self.specs[spec.name] = spec
+                self._order.append(spec)
+                for state in self.symbols.values():
+                    state.values[spec.name] = NAN
+            names.append(spec.name)
+        return names
+
+    def update(self, bar: Dict) -> Mapping[str, float]:
+        symbol = bar["symbol"]
+        state = self.symbols.get(symbol)
+        if state is None:
+            state = self.symbols[symbol] = _SymbolFeatures()
+            state.values.update((spec.name, NAN) for spec in self._order)
+        indicators = state.indicators
+        while len(indicators) < len(self._order):
+            indicators.append(self._order[len(indicators)].build())
+        close = bar["close"]
+        prev = state.prev_close
+        state.prev_close = close
+        state.count += 1
+        values = state.values
+        for spec, indicator in zip(self._order, indicators):
+            source = spec.source
+            if source is None:
+                if spec.stat == "vwap":
+                    values[spec.name] = indicator.update(close, bar["volume"])
+                else:
+                    values[spec.name] = indicator.update(bar["high"], bar["low"], close)
+                continue
+            if source == "move":
+                if prev is None:
+                    continue
+                x = abs(close - prev)
+            elif source == "range":
+                x = bar["high"] - bar["low"]
+            else:
+                x = bar[source]
+            value = indicator.update(x)
+            values[spec.name] = math.sqrt(value) if spec.stat == "std" else value
+        return MappingProxyType(values)
+
+    def get(self, symbol: str) -> Mapping[str, float]:
+        state = self.symbols.get(symbol)
+        return MappingProxyType(state.values if state is not None else {})
+
+    def count(self, symbol: str) -> int:
+        """Bars seen for ``symbol``."""
+
+        state = self.symbols.get(symbol)
+        return state.count if state is not None else 0
+
+    def restore(self, other: FeatureStore) -> None:
+        """Continue from the per-symbol state of ``other``, e.g. a store saved at shutdown.
+
+        Features both stores compute carry over; the others start from the next bar.
+        """
+
+        position = {spec.name: i for i, spec in enumerate(other._order)}
+        for symbol, saved in other.symbols.items():
+            state = self.symbols[symbol] = _SymbolFeatures()
+            state.count = saved.count
+            state.prev_close = saved.prev_close
+            for spec in self._order:
+                i = position.get(spec.name)
+                carried = i is not None and i < len(saved.indicators)
+                state.indicators.append(saved.indicators[i] if carried else spec.build())
+                state.values[spec.name] = saved.values[spec.name] if carried else NAN
@@ -0,0 +1,421 @@
+"""Streaming indicators with O(1) updates.
+
+Each indicator is fed one value (or bar) at a time through ``update``, which returns the current
+value; :attr:`ready` turns true once a full window has been seen and ``value`` is NaN before
+that. Windowed sums are maintained incrementally and recomputed from the window once every
+``window`` updates, which keeps the cost amortized O(1) while stopping rounding error from
+accumulating over long runs. These are the per-bar counterparts of :mod:`.kernels`.
+
+The ``Batch*`` classes keep the same statistics for many series in arrays and update any
+subset of them in one vectorized call, e.g. every pair whose legs ticked at a timestamp.
+"""
+
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Tuple
+
+import numpy as np
+
+NAN = float("nan")
+
+
+class RollingSum:
+    __slots__ = ("window", "values", "total", "_since")
+
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.values: Deque[float] = deque(maxlen=window)
+        self.total = 0.0
+        self._since = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window
+
+    @property
+    def value(self) -> float:
+        return self.total if len(self.values) == self.window else NAN
+
+    def update(self, x: float) -> float:
+        values = self.values
+        if len(values) == self.window:
+            self.total -= values[0]
+        values.append(x)
+        self._since += 1
+        if self._since >= self.window:
+            self.total = math.fsum(values)
+            self._since = 0
+        else:
+            self.total += x
+        return self.total if len(values) == self.window else NAN
+
+
+class RollingMean(RollingSum):
+    __slots__ = ()
+
+    @property
+    def value(self) -> float:
+        return self.total / self.window if len(self.values) == self.window else NAN
+
+    def update(self, x: float) -> float:
+        RollingSum.update(self, x)
+        return self.value
+
+
+class RollingVariance:
+    """Population variance/standard deviation of the last ``window`` values (rolling Welford)."""
+
+    __slots__ = ("window", "values", "mean", "m2", "_since")
+
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.values: Deque[float] = deque(maxlen=window)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._since = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window
+
+    @property
+    def variance(self) -> float:
+        return max(self.m2, 0.0) / self.window if len(self.values) == self.window else NAN
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    value = variance
+
+    def _recompute(self) -> None:
+        values = self.values
+        mean = math.fsum(values) / len(values)
+        self.mean = mean
+        self.m2 = math.fsum((v - mean) * (v - mean) for v in values)
+        self._since = 0
+
+    def update(self, x: float) -> float:
+        values = self.values
+        if len(values) == self.window:
+            old = values[0]
+            values.append(x)
+            mean = self.mean
+            new_mean = mean + (x - old) / self.window
+            self.m2 += (x - old) * (x - new_mean + old - mean)
+            self.mean = new_mean
+        else:
+            values.append(x)
+            delta = x - self.mean
+            self.mean += delta / len(values)
+            self.m2 += delta * (x - self.mean)
+        self._since += 1
+        if self._since >= self.window:
+            self._recompute()
+        return self.variance
+
+
+class ZScore:
+    """``(x - mean) / (std + eps)`` of the latest value against its own trailing window."""
+
+    __slots__ = ("stats", "eps", "value")
+
+    def __init__(self, window: int, eps: float = 0.0) -> None:
+        self.stats = RollingVariance(window)
+        self.eps = eps
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return self.stats.ready
+
+    def update(self, x: float) -> float:
+        stats = self.stats
+        stats.update(x)
+        if not stats.ready:
+            return NAN
+        std = stats.std + self.eps
+        self.value = (x - stats.mean) / std if std else NAN
+        return self.value
+
+
+class EMA:
+    """Exponential moving average seeded with the first value, like :func:`.utils.ema`."""
+
+    __slots__ = ("alpha", "value", "count", "period")
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.value = NAN
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count == 1:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class RollingVWAP:
+    """Volume-weighted average price over the last ``window`` bars; 0 if they traded nothing."""
+
+    __slots__ = ("notional", "volume")
+
+    def __init__(self, window: int) -> None:
+        self.notional = RollingSum(window)
+        self.volume = RollingSum(window)
+
+    @property
+    def ready(self) -> bool:
+        return self.volume.ready
+
+    @property
+    def value(self) -> float:
+        volume = self.volume.value
+        return self.notional.value / (volume or 1.0)
+
+    def update(self, price: float, volume: float) -> float:
+        self.notional.update(price * volume)
+        self.volume.update(volume)
+        return self.value
+
+
+class ATR:
+    """Average true range over ``window`` bars; ``true_range=False`` averages ``high - low``."""
+
+    __slots__ = ("ranges", "true_range", "_prev_close")
+
+    def __init__(self, window: int, true_range: bool = True) -> None:
+        self.ranges = RollingMean(window)
+        self.true_range = true_range
+        self._prev_close: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.ranges.ready
+
+    @property
+    def value(self) -> float:
+        return self.ranges.value
+
+    def update(self, high: float, low: float, close: float) -> float:
+        span = high - low
+        prev = self._prev_close
+        if self.true_range and prev is not None:
+            span = max(span, abs(high - prev), abs(low - prev))
+        self._prev_close = close
+        return self.ranges.update(span)
+
+
+class _RollingExtreme(ABC):
+    """Extreme of the last ``window`` values; subclasses say which of two values wins."""
+
+    __slots__ = ("window", "count", "_deque")
+
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.count = 0
+        # (position, value) candidates, monotonic so the extreme is always at the left
+        self._deque: Deque[Tuple[int, float]] = deque()
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.window
+
+    @property
+    def value(self) -> float:
+        return self._deque[0][1] if self.count >= self.window else NAN
+
+    @abstractmethod
+    def _dominates(self, a: float, b: float) -> bool:
+        """Whether a new value ``a`` makes an older candidate ``b`` irrelevant."""
+
+    def update(self, x: float) -> float:
+        candidates = self._deque
+        dominates = self._dominates
+        while candidates and dominates(x, candidates[-1][1]):
+            candidates.pop()
+        candidates.append((self.count, x))
+        self.count += 1
+        if candidates[0][0] <= self.count - 1 - self.window:
+            candidates.popleft()
+        return candidates[0][1] if self.count >= self.window else NAN
+
+
+class RollingMax(_RollingExtreme):
+    """Maximum of the last ``window`` values via a monotonic deque (amortized O(1))."""
+
+    __slots__ = ()
+
+    def _dominates(self, a: float, b: float) -> bool:
+        return a >= b
+
+
+class RollingMin(_RollingExtreme):
+    """Minimum of the last ``window`` values via a monotonic deque (amortized O(1))."""
+
+    __slots__ = ()
+
+    def _dominates(self, a: float, b: float) -> bool:
+        return a <= b
+
+
+class BatchRollingVariance:
+    """:class:`RollingVariance` over ``n`` series at once, any subset of them updated per call.
+
+    The arithmetic is the same, element by element, so series ``i`` matches a
+    ``RollingVariance`` fed the same values bit for bit.
+    """
+
+    __slots__ = ("window", "values", "count", "head", "mean", "m2", "_since")
+
+    def __init__(self, n: int, window: int) -> None:
+        if window < 1:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.values = np.zeros((n, window))
+        self.count = np.zeros(n, dtype=np.int64)
+        self.head = np.zeros(n, dtype=np.int64)  # oldest slot once a window is full
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
+        self._since = np.zeros(n, dtype=np.int64)
+
+    def ready(self, idx: np.ndarray) -> np.ndarray:
+        return self.count[idx] == self.window
+
+    def variance(self, idx: np.ndarray) -> np.ndarray:
+        return np.where(self.ready(idx), np.maximum(self.m2[idx], 0.0) / self.window, np.nan)
+
+    def std(self, idx: np.ndarray) -> np.ndarray:
+        return np.sqrt(self.variance(idx))
+
+    def _recompute(self, idx: np.ndarray) -> None:
+        for i in idx.tolist():
+            values = self.values[i, : self.count[i]].tolist()
+            mean = math.fsum(values) / len(values)
+            self.mean[i] = mean
+            self.m2[i] = math.fsum((v - mean) * (v - mean) for v in values)
+        self._since[idx] = 0
+
+    def update(self, idx: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """Append ``x[k]`` to series ``idx[k]`` (indices must be distinct); returns their variance."""
+
+        window = self.window
+        count = self.count[idx]
+        full = count == window
+        slot = np.where(full, self.head[idx], count)
+        old = self.values[idx, slot]
+        self.values[idx, slot] = x
+        mean = self.mean[idx]
+        length = np.minimum(count + 1, window)
+        delta = x - mean
+        grown = mean + delta / length
+        rolled = mean + (x - old) / window
+        new_mean = np.where(full, rolled, grown)
+        self.m2[idx] += np.where(full, (x - old) * (x - rolled + old - mean), delta * (x - grown))
+        self.mean[idx] = new_mean
+        self.count[idx] = length
+        self.head[idx] = np.where(full, (slot + 1) % window, 0)
+        since = self._since[idx] + 1
+        self._since[idx] = since
+        due = since >= window
+        if due.any():
+            self._recompute(idx[due])
+        return self.variance(idx)
+
+
+class BatchRollingCovariance:
+    """Rolling covariance of ``n`` (x, y) series and the OLS slope of y on x (the hedge ratio)."""
+
+    __slots__ = ("window", "xs", "ys", "count", "head", "mean_x", "mean_y", "cxy", "m2x", "_since")
+
+    def __init__(self, n: int, window: int) -> None:
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self.xs = np.zeros((n, window))
+        self.ys = np.zeros((n, window))
+        self.count = np.zeros(n, dtype=np.int64)
+        self.head = np.zeros(n, dtype=np.int64)
+        self.mean_x = np.zeros(n)
+        self.mean_y = np.zeros(n)
+        self.cxy = np.zeros(n)
+        self.m2x = np.zeros(n)
+        self._since = np.zeros(n, dtype=np.int64)
+
+    def beta(self, idx: np.ndarray) -> np.ndarray:
+        """Slope of y on x over each full window; NaN before that or if x did not move."""
+
+        m2x = self.m2x[idx]
+        ok = (self.count[idx] == self.window) & (m2x > 0)
+        return np.where(ok, self.cxy[idx] / np.where(ok, m2x, 1.0), np.nan)
+
+    def _recompute(self, idx: np.ndarray) -> None:
+        for i in idx.tolist():
+            xs = self.xs[i, : self.count[i]].tolist()
+            ys = self.ys[i, : self.count[i]].tolist()
+            mean_x = math.fsum(xs) / len(xs)
+            mean_y = math.fsum(ys) / len(ys)
+            self.mean_x[i] = mean_x
+            self.mean_y[i] = mean_y
+            self.cxy[i] = math.fsum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+            self.m2x[i] = math.fsum((x - mean_x) * (x - mean_x) for x in xs)
+        self._since[idx] = 0
+
+    def update(self, idx: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Append ``(x[k], y[k])`` to series ``idx[k]``; returns their :meth:`beta`."""
+
+        window = self.window
+        count = self.count[idx]
+        full = count == window
+        slot = np.where(full, self.head[idx], count)
+        old_x = self.xs[idx, slot]
+        old_y = self.ys[idx, slot]
+        self.xs[idx, slot] = x
+        self.ys[idx, slot] = y
+        # a sample that is not replacing one removes nothing
+        old_x = np.where(full, old_x, 0.0)
+        old_y = np.where(full, old_y, 0.0)
+        length = np.minimum(count + 1, window)
+        mean_x = self.mean_x[idx]
+        mean_y = self.mean_y[idx]
+        new_x = np.where(full, mean_x + (x - old_x) / window, mean_x + (x - mean_x) / length)
+        new_y = np.where(full, mean_y + (y - old_y) / window, mean_y + (y - mean_y) / length)
+        added = (x - mean_x) * (y - new_y)
+        removed = np.where(full, (old_x - mean_x) * (old_y - new_y), 0.0)
+        self.cxy[idx] += added - removed
+        added = (x - mean_x) * (x - new_x)
+        removed = np.where(full, (old_x - mean_x) * (old_x - new_x), 0.0)
+        self.m2x[idx] += added - removed
+        self.mean_x[idx] = new_x
+        self.mean_y[idx] = new_y
+        self.count[idx] = length
+        self.head[idx] = np.where(full, (slot + 1) % window, 0)
+        since = self._since[idx] + 1
+        self._since[idx] = since
+        due = since >= window
+        if due.any():
+            self._recompute(idx[due])
+        return self.beta(idx)
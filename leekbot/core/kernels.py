@@ -0,0 +1,276 @@
+"""NumPy indicator kernels used by batch signal generation and universe-wide research.
+
+Every kernel works along the last axis, so a ``(symbols, bars)`` matrix is processed for all
+symbols at once, and returns an array of the input's shape whose first ``window - 1`` positions
+are NaN, so ``result[..., t]`` is the statistic of the window ending at bar ``t`` — the same
+value a per-bar ``on_bar`` implementation (or :mod:`.indicators`) sees at that bar. A window
+containing a NaN is NaN, so rows with missing or not-yet-listed bars warm up from their first
+complete window. Every kernel accepts an ``out`` array of the input's shape to write into.
+
+Windowed sums use cumulative sums restarted every ``window`` bars: the window ending at ``t``
+is the suffix of one block plus the prefix of the next, which costs O(n) regardless of the
+window and, unlike one running sum over the whole row, does not lose precision on long rows.
+Rolling extremes use the same split with running maxima/minima.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+def _output(values: np.ndarray, out: np.ndarray | None) -> np.ndarray:
+    if out is None:
+        return np.empty(values.shape)
+    if out.shape != values.shape:
+        raise ValueError(f"out has shape {out.shape}, expected {values.shape}")
+    return out
+
+
+def _scan(
+    values: np.ndarray, window: int, op: np.ufunc, identity: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Running ``op`` from each full window's start to the end of its block, and from the start
+    of the next block to the window's end (``identity`` when the window is a whole block)."""
+
+    n = values.shape[-1]
+    count = -(-n // window)
+    blocks = np.zeros(values.shape[:-1] + (count * window,))
+    blocks[..., :n] = values
+    blocks = blocks.reshape(values.shape[:-1] + (count, window))
+    tail = op.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1]
+    head = op.accumulate(blocks, axis=-1)
+    head[..., -1] = identity
+    flat = values.shape[:-1] + (count * window,)
+    return tail.reshape(flat)[..., : n - window + 1], head.reshape(flat)[..., window - 1 : n]
+
+
+def _moments(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and population variance of every full window."""
+
+    n = values.shape[-1]
+    # centre each block on one of its own values so the sums of squares stay well conditioned
+    count = -(-n // window)
+    padded = np.full(values.shape[:-1] + (count * window,), np.nan)
+    padded[..., :n] = values
+    with np.errstate(invalid="ignore"):
+        ref = np.fmax.reduce(padded.reshape(values.shape[:-1] + (count, window)), axis=-1)
+    ref = np.repeat(np.where(np.isfinite(ref), ref, 0.0), window, axis=-1)[..., :n]
+    centered = values - ref
+    sum_a, sum_b = _scan(centered, window, np.add, 0.0)
+    sq_a, sq_b = _scan(centered * centered, window, np.add, 0.0)
+    # the window starting at i has n_b = i % window values in the next block
+    n_b = np.arange(n - window + 1) % window
+    n_a = window - n_b
+    safe_b = np.maximum(n_b, 1)
+    mean_a = sum_a / n_a
+    mean_b = sum_b / safe_b
+    m2 = (sq_a - sum_a * mean_a) + (sq_b - sum_b * mean_b)
+    ref_a = ref[..., : n - window + 1]
+    shift_b = ref[..., window - 1 :] - ref_a
+    delta = mean_b + shift_b - mean_a
+    m2 += delta * delta * (n_a * n_b / window)
+    mean = ref_a + (sum_a + sum_b + shift_b * n_b) / window
+    return mean, np.maximum(m2, 0.0) / window
+
+
+def _prepare(values: np.ndarray, window: int, out: np.ndarray | None) -> np.ndarray:
+    """The output buffer with the warmup (every bar, if no window is full) set to NaN."""
+
+    if window < 1:
+        raise ValueError("window must be positive")
+    result = _output(values, out)
+    result[..., : window - 1] = np.nan
+    return result
+
+
+def rolling_sum(values: np.ndarray, window: int, out: np.ndarray | None = None) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    result = _prepare(values, window, out)
+    if values.shape[-1] < window:
+        return result
+    tail, head = _scan(values, window, np.add, 0.0)
+    np.add(tail, head, out=result[..., window - 1 :])
+    return result
+
+
+def rolling_mean(values: np.ndarray, window: int, out: np.ndarray | None = None) -> np.ndarray:
+    result = rolling_sum(values, window, out)
+    result /= window
+    return result
+
+
+sma = rolling_mean
+
+
+def rolling_std(values: np.ndarray, window: int, out: np.ndarray | None = None) -> np.ndarray:
+    """Population standard deviation, matching ``statistics.pstdev`` over each window."""
+
+    values = np.asarray(values, dtype=np.float64)
+    result = _prepare(values, window, out)
+    if values.shape[-1] < window:
+        return result
+    np.sqrt(_moments(values, window)[1], out=result[..., window - 1 :])
+    return result
+
+
+def _extreme(
+    values: np.ndarray, window: int, out: np.ndarray | None, op: np.ufunc, identity: float
+) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    result = _prepare(values, window, out)
+    if values.shape[-1] < window:
+        return result
+    tail, head = _scan(values, window, op, identity)
+    op(tail, head, out=result[..., window - 1 :])
+    return result
+
+
+def rolling_max(values: np.ndarray, window: int, out: np.ndarray | None = None) -> np.ndarray:
+    return _extreme(values, window, out, np.maximum, -np.inf)
+
+
+def rolling_min(values: np.ndarray, window: int, out: np.ndarray | None = None) -> np.ndarray:
+    return _extreme(values, window, out, np.minimum, np.inf)
+
+
+def zscore(
+    values: np.ndarray, window: int, eps: float = 0.0, out: np.ndarray | None = None
+) -> np.ndarray:
+    """``(x - mean) / (std + eps)`` against the trailing window, NaN where that is zero."""
+
+    values = np.asarray(values, dtype=np.float64)
+    result = _prepare(values, window, out)
+    if values.shape[-1] < window:
+        return result
+    mean, variance = _moments(values, window)
+    std = np.sqrt(variance) + eps
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(values[..., window - 1 :] - mean, std, out=result[..., window - 1 :])
+    result[..., window - 1 :][std == 0] = np.nan
+    return result
+
+
+def ema(values: np.ndarray, period: int, out: np.ndarray | None = None) -> np.ndarray:
+    """Exponential moving average seeded with each row's first value, like :class:`.indicators.EMA`.
+
+    NaN inputs are skipped: the output is NaN there and the average carries on as if that bar
+    had not been fed. The recursion loops over bars but is vectorized across rows.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    result = _output(values, out)
+    n = values.shape[-1]
+    if n == 0:
+        return result
+    alpha = 2 / (period + 1)
+    missing = np.isnan(values)
+    if values.ndim == 1 and not missing.any():
+        value = float(values[0])
+        averages = [value]
+        for x in values[1:].tolist():
+            value += alpha * (x - value)
+            averages.append(value)
+        result[:] = averages
+        return result
+    if not missing.any():
+        state = values[..., 0].copy()
+        result[..., 0] = state
+        step = np.empty_like(state)
+        for t in range(1, n):
+            np.subtract(values[..., t], state, out=step)
+            step *= alpha
+            state += step
+            result[..., t] = state
+        return result
+    state = np.full(values.shape[:-1], np.nan)
+    for t in range(n):
+        x = values[..., t]
+        updated = np.where(np.isnan(state), x, state + alpha * (x - state))
+        state = np.where(missing[..., t], state, updated)
+        result[..., t] = np.where(missing[..., t], np.nan, state)
+    return result
+
+
+def atr(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    window: int,
+    true_range: bool = True,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Average true range like :class:`.indicators.ATR`; ``true_range=False`` averages ``high - low``.
+
+    A row's first bar, or one after a missing close, uses its plain ``high - low`` span.
+    """
+
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    ranges = high - low
+    if true_range and ranges.shape[-1] > 1:
+        prev = np.asarray(close, dtype=np.float64)[..., :-1]
+        gaps = np.fmax(np.abs(high[..., 1:] - prev), np.abs(low[..., 1:] - prev))
+        span = ranges[..., 1:]
+        span[...] = np.where(np.isnan(span), np.nan, np.fmax(span, gaps))
+    return rolling_mean(ranges, window, out)
+
+
+def vwap(
+    price: np.ndarray, volume: np.ndarray, window: int, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Volume-weighted average price over the trailing window; 0 where nothing traded."""
+
+    price = np.asarray(price, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    result = rolling_sum(price * volume, window, out)
+    total = rolling_sum(volume, window)
+    total[total == 0] = 1.0
+    result /= total
+    return result
+
+
+def breakout_bands(
+    high: np.ndarray,
+    low: np.ndarray,
+    window: int,
+    out: Tuple[np.ndarray, np.ndarray] | None = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Donchian channel: the highest ``high`` and lowest ``low`` of each trailing window."""
+
+    upper, lower = out if out is not None else (None, None)
+    return rolling_max(high, window, upper), rolling_min(low, window, lower)
+
+
+def spread_zscore(
+    prices: np.ndarray,
+    pairs: Sequence[Tuple[int, int]],
+    window: int,
+    hedge: np.ndarray | float = 1.0,
+    eps: float = 0.0,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Z-score of ``prices[a] - hedge * prices[b]`` for every ``(a, b)`` row pair, as a
+    ``(pairs, bars)`` array; ``hedge`` is a scalar or one ratio per pair."""
+
+    prices = np.asarray(prices, dtype=np.float64)
+    index = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+    ratio = np.asarray(hedge, dtype=np.float64).reshape(-1, 1)
+    spreads = prices[index[:, 0]] - ratio * prices[index[:, 1]]
+    return zscore(spreads, window, eps, out)
+
+
+def shift(values: np.ndarray, periods: int, out: np.ndarray | None = None) -> np.ndarray:
+    """Lag ``values`` by ``periods`` bars along the last axis, filling the gap with NaN."""
+
+    values = np.asarray(values, dtype=np.float64)
+    result = _output(values, out)
+    if periods == 0:
+        result[...] = values
+    elif periods < values.shape[-1]:
+        result[..., :periods] = np.nan
+        result[..., periods:] = values[..., :-periods]
+    else:
+        result[...] = np.nan
+    return result
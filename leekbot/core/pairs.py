@@ -0,0 +1,220 @@
+"""Pair discovery for :class:`~leekbot.strat.pairs_stat_arb.PairsStatArb`.
+
+:func:`scan_pairs` screens every pair of a universe in two stages. First a cheap filter: the
+correlation of log returns, computed as one matrix product per block of rows, keeps each
+symbol's ``top_k`` partners at or above ``min_corr``. Then an Engle-Granger test on the
+survivors: regress ``a`` on ``b`` (the slope is the hedge ratio), then run an ADF regression
+without lags on the residual spread; its slope also gives the spread's half-life. Row blocks
+fan out over a process pool that reads the aligned prices from memory-mapped ``.npy`` files,
+so a worker never copies the universe.
+
+:func:`save_pairs` writes the ranked result as YAML that ``PairsStatArb`` loads through its
+``pairs_file`` setting.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import yaml
+
+from .dataframe import BarFrame
+
+# Engle-Granger (two variables, with constant) asymptotic critical values, MacKinnon (2010)
+ADF_CRITICAL = {0.01: -3.90, 0.05: -3.34, 0.10: -3.04}
+_BATCH = 256
+
+
+@dataclass(slots=True)
+class ScanCriteria:
+    min_corr: float = 0.7
+    top_k: int = 10
+    max_adf: float = ADF_CRITICAL[0.05]
+    min_half_life: float = 1.0
+    max_half_life: float | None = None
+
+
+@dataclass(slots=True)
+class PairStats:
+    a: str
+    b: str
+    hedge: float
+    corr: float
+    adf: float
+    half_life: float
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def align_closes(frames: Dict[str, BarFrame], min_bars: int = 2) -> Tuple[List[str], np.ndarray]:
+    """Closes of every symbol with at least ``min_bars`` bars on one shared timeline.
+
+    The timeline is the union of their timestamps over the period all of them cover; a symbol
+    without a bar at some timestamp carries its previous close forward.
+    """
+
+    symbols = [symbol for symbol, frame in frames.items() if len(frame) >= min_bars]
+    if len(symbols) < 2:
+        raise ValueError("Need at least two symbols with enough bars")
+    start = max(int(frames[symbol].epochs[0]) for symbol in symbols)
+    end = min(int(frames[symbol].epochs[-1]) for symbol in symbols)
+    if start > end:
+        raise ValueError("The symbols share no common period")
+    epochs = np.unique(
+        np.concatenate(
+            [
+                frames[symbol].epochs[
+                    (frames[symbol].epochs >= start) & (frames[symbol].epochs <= end)
+                ]
+                for symbol in symbols
+            ]
+        )
+    )
+    closes = np.empty((len(symbols), len(epochs)))
+    for row, symbol in enumerate(symbols):
+        frame = frames[symbol]
+        closes[row] = frame["close"][np.searchsorted(frame.epochs, epochs, side="right") - 1]
+    return symbols, closes
+
+
+def engle_granger(y: np.ndarray, x: np.ndarray) -> Dict[str, np.ndarray]:
+    """Row-wise Engle-Granger statistics of ``y`` on ``x`` (arrays of shape ``(pairs, bars)``).
+
+    Returns the hedge ratio, the ADF t-statistic of the residual spread (more negative is more
+    strongly mean reverting) and its half-life in bars (inf if it does not revert).
+    """
+
+    n = y.shape[-1]
+    dx = x - x.mean(axis=-1, keepdims=True)
+    dy = y - y.mean(axis=-1, keepdims=True)
+    sxx = np.einsum("ij,ij->i", dx, dx)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hedge = np.einsum("ij,ij->i", dx, dy) / sxx
+        resid = dy - hedge[:, None] * dx
+        lag = resid[:, :-1]
+        step = np.diff(resid, axis=-1)
+        sll = np.einsum("ij,ij->i", lag, lag)
+        gamma = np.einsum("ij,ij->i", lag, step) / sll
+        err = step - gamma[:, None] * lag
+        sigma2 = np.einsum("ij,ij->i", err, err) / max(n - 2, 1)
+        adf = gamma / np.sqrt(sigma2 / sll)
+        reverting = (gamma < 0) & (gamma > -1)
+        half_life = np.where(
+            reverting, -math.log(2) / np.log1p(np.where(reverting, gamma, 0)), np.inf
+        )
+    return {"hedge": hedge, "adf": np.nan_to_num(adf, nan=0.0), "half_life": half_life}
+
+
+_WORKER: Dict[str, np.ndarray] = {}
+
+
+def _init_worker(directory: str) -> None:
+    _WORKER["closes"] = np.load(os.path.join(directory, "closes.npy"), mmap_mode="r")
+    _WORKER["returns"] = np.load(os.path.join(directory, "returns.npy"), mmap_mode="r")
+
+
+def _scan_rows(
+    start: int, stop: int, criteria: ScanCriteria
+) -> List[Tuple[int, int, float, float, float, float]]:
+    """Screen the pairs whose first leg is in rows ``[start, stop)``."""
+
+    closes = _WORKER["closes"]
+    returns = _WORKER["returns"]
+    corr = np.asarray(returns[start:stop]) @ np.asarray(returns).T
+    corr[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+    legs: List[Tuple[int, int, float]] = []
+    for offset, row in enumerate(corr):
+        partners = np.flatnonzero(row >= criteria.min_corr)
+        if len(partners) > criteria.top_k:
+            partners = partners[
+                np.argpartition(-row[partners], criteria.top_k - 1)[: criteria.top_k]
+            ]
+        legs.extend((start + offset, int(j), float(row[j])) for j in partners)
+    found = []
+    for first in range(0, len(legs), _BATCH):
+        batch = legs[first : first + _BATCH]
+        a = np.array([leg[0] for leg in batch])
+        b = np.array([leg[1] for leg in batch])
+        stats = engle_granger(np.asarray(closes[a]), np.asarray(closes[b]))
+        keep = (stats["adf"] <= criteria.max_adf) & (stats["half_life"] >= criteria.min_half_life)
+        if criteria.max_half_life is not None:
+            keep &= stats["half_life"] <= criteria.max_half_life
+        hedge, adf, half_life = (stats[key].tolist() for key in ("hedge", "adf", "half_life"))
+        for k in np.flatnonzero(keep).tolist():
+            i, j, rho = batch[k]
+            found.append((i, j, hedge[k], rho, adf[k], half_life[k]))
+    return found
+
+
+def scan_pairs(
+    frames: Dict[str, BarFrame],
+    criteria: ScanCriteria | None = None,
+    processes: int | None = None,
+    min_bars: int = 100,
+) -> List[PairStats]:
+    """Cointegrated pairs of ``frames``, most strongly mean reverting (lowest ADF) first.
+
+    Each unordered pair appears once, in the direction with the better ADF statistic.
+    ``processes`` defaults to the CPU count; 1 runs in-process.
+    """
+
+    criteria = criteria or ScanCriteria()
+    symbols, closes = align_closes(frames, min_bars)
+    log_returns = np.diff(np.log(closes), axis=-1)
+    log_returns -= log_returns.mean(axis=-1, keepdims=True)
+    norms = np.linalg.norm(log_returns, axis=-1, keepdims=True)
+    # a symbol that never moved correlates with nothing
+    standardized = np.divide(log_returns, norms, out=np.zeros_like(log_returns), where=norms > 0)
+    workers = processes or os.cpu_count() or 1
+    rows = len(symbols)
+    size = max(1, -(-rows // (workers * 4)))
+    blocks = [(start, min(start + size, rows)) for start in range(0, rows, size)]
+    found: List[Tuple[int, int, float, float, float, float]] = []
+    with tempfile.TemporaryDirectory(prefix="leek-pairs-") as directory:
+        np.save(os.path.join(directory, "closes.npy"), closes)
+        np.save(os.path.join(directory, "returns.npy"), standardized.astype(np.float32))
+        if workers <= 1:
+            _init_worker(directory)
+            for start, stop in blocks:
+                found.extend(_scan_rows(start, stop, criteria))
+            _WORKER.clear()
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(blocks)),
+                initializer=_init_worker,
+                initargs=(directory,),
+            ) as pool:
+                futures = [pool.submit(_scan_rows, start, stop, criteria) for start, stop in blocks]
+                for future in futures:
+                    found.extend(future.result())
+    best: Dict[Tuple[int, int], Tuple[int, int, float, float, float, float]] = {}
+    for hit in found:
+        key = (min(hit[0], hit[1]), max(hit[0], hit[1]))
+        if key not in best or hit[4] < best[key][4]:
+            best[key] = hit
+    ranked = sorted(best.values(), key=lambda hit: (hit[4], symbols[hit[0]], symbols[hit[1]]))
+    return [
+        PairStats(symbols[i], symbols[j], hedge, rho, adf, half_life)
+        for i, j, hedge, rho, adf, half_life in ranked
+    ]
+
+
+def save_pairs(path: str | Path, pairs: List[PairStats]) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        yaml.safe_dump({"pairs": [pair.to_dict() for pair in pairs]}, fh, sort_keys=False)
+
+
+def load_pairs(path: str | Path, top: int | None = None) -> List[Tuple[str, str, float]]:
+    """``(a, b, hedge)`` of the best ``top`` pairs of a :func:`save_pairs` file."""
+
+    with open(path, encoding="utf-8") as fh:
+        entries = (yaml.safe_load(fh) or {}).get("pairs", [])
+    return [(entry["a"], entry["b"], float(entry["hedge"])) for entry in entries[:top]]
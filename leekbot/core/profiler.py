@@ -0,0 +1,231 @@
+"""Opt-in per-strategy hot-path profiler.
+
+Engines and the live runner dispatch to ``profiler.wrap(name, strategy)`` instead of the strategy
+itself only when a profiler is passed in, so an unprofiled run executes exactly the same code as
+before. Each ``on_bar``/``on_fill``/``get_orders`` call is timed with ``perf_counter_ns`` into a
+per (strategy, method, symbol) record holding a call count, total/max latency and a log2 latency
+histogram. With ``allocations=True`` the net change in allocated memory blocks around each call is
+recorded as well; that probe costs microseconds per call on a large heap, so it is off by default.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Dict, List, Tuple
+
+from .utils import OrderIntent
+
+HISTOGRAM_BUCKETS = 40
+SORT_KEYS = ("total_ms", "calls", "mean_us", "p50_us", "p99_us", "max_us", "alloc_blocks")
+ANY_SYMBOL = "*"
+
+
+@dataclass(slots=True)
+class CallStats:
+    calls: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+    alloc_blocks: int = 0
+    histogram: List[int] = field(default_factory=lambda: [0] * HISTOGRAM_BUCKETS)
+
+    def add(self, elapsed: int, blocks: int = 0) -> None:
+        self.calls += 1
+        self.total_ns += elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+        self.alloc_blocks += blocks
+        self.histogram[min(elapsed.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def merge(self, other: CallStats) -> None:
+        self.calls += other.calls
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.alloc_blocks += other.alloc_blocks
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def quantile(self, q: float) -> int:
+        """Upper edge (ns) of the histogram bucket holding the ``q`` quantile, capped at the max."""
+
+        target = q * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return min((1 << bucket) - 1, self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> Dict[str, float]:
+        calls = max(self.calls, 1)
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / calls / 1e3,
+            "p50_us": self.quantile(0.5) / 1e3,
+            "p99_us": self.quantile(0.99) / 1e3,
+            "max_us": self.max_ns / 1e3,
+            "alloc_blocks": self.alloc_blocks / calls,
+        }
+
+
+class ProfiledStrategy:
+    """Times the hot-path methods of one strategy and forwards everything else to it."""
+
+    def __init__(self, name: str, strategy: Any, profiler: StrategyProfiler) -> None:
+        self.name = name
+        self.strategy = strategy
+        self._profiler = profiler
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.strategy, attr)
+
+    def _call(self, method: str, symbol: str, *args: Any) -> Any:
+        profiler = self._profiler
+        if profiler.allocations:
+            blocks = sys.getallocatedblocks()
+            started = perf_counter_ns()
+            result = getattr(self.strategy, method)(*args)
+            elapsed = perf_counter_ns() - started
+            profiler.stats(self.name, method, symbol).add(
+                elapsed, sys.getallocatedblocks() - blocks
+            )
+            return result
+        started = perf_counter_ns()
+        result = getattr(self.strategy, method)(*args)
+        profiler.stats(self.name, method, symbol).add(perf_counter_ns() - started)
+        return result
+
+    def on_bar(self, bar: Dict, account_state: Dict) -> None:
+        self._call("on_bar", bar.get("symbol", ANY_SYMBOL), bar, account_state)
+
+    def on_fill(self, fill: Dict, account_state: Dict) -> None:
+        self._call("on_fill", fill.get("symbol", ANY_SYMBOL), fill, account_state)
+
+    def on_bars(self, bars: Any, account_state: Dict) -> None:
+        self._call("on_bars", ANY_SYMBOL, bars, account_state)
+
+    def on_cross_section(self, section: Any, account_state: Dict) -> None:
+        self._call("on_cross_section", ANY_SYMBOL, section, account_state)
+
+    def get_orders(self) -> List[OrderIntent]:
+        return self._call("get_orders", ANY_SYMBOL)
+
+
+class StrategyProfiler:
+    def __init__(self, allocations: bool = False) -> None:
+        self.allocations = allocations
+        self.records: Dict[Tuple[str, str, str], CallStats] = {}
+
+    def wrap(self, name: str, strategy: Any) -> ProfiledStrategy:
+        return ProfiledStrategy(name, strategy, self)
+
+    def wrap_all(self, strategies: Dict[str, Any]) -> Dict[str, Any]:
+        return {name: self.wrap(name, strat) for name, strat in strategies.items()}
+
+    def stats(self, strategy: str, method: str, symbol: str) -> CallStats:
+        key = (strategy, method, symbol)
+        stats = self.records.get(key)
+        if stats is None:
+            stats = self.records[key] = CallStats()
+        return stats
+
+    def rows(self, by_symbol: bool = False, sort: str = "total_ms") -> List[Dict[str, Any]]:
+        """Summary rows per (strategy, method[, symbol]), largest ``sort`` value first."""
+
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key {sort}; expected one of {', '.join(SORT_KEYS)}")
+        grouped: Dict[Tuple[str, ...], CallStats] = {}
+        for (strategy, method, symbol), stats in self.records.items():
+            key = (strategy, method, symbol) if by_symbol else (strategy, method)
+            merged = grouped.get(key)
+            if merged is None:
+                merged = grouped[key] = CallStats()
+            merged.merge(stats)
+        rows = []
+        for key, stats in grouped.items():
+            row: Dict[str, Any] = {"strategy": key[0], "method": key[1]}
+            if by_symbol:
+                row["symbol"] = key[2]
+            row.update(stats.summary())
+            rows.append(row)
+        rows.sort(key=lambda row: row[sort], reverse=True)
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "allocations": self.allocations,
+            "records": [
+                {
+                    "strategy": strategy,
+                    "method": method,
+                    "symbol": symbol,
+                    "calls": stats.calls,
+                    "total_ns": stats.total_ns,
+                    "max_ns": stats.max_ns,
+                    "alloc_blocks": stats.alloc_blocks,
+                    "histogram": stats.histogram,
+                }
+                for (strategy, method, symbol), stats in self.records.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> StrategyProfiler:
+        profiler = cls(bool(raw.get("allocations", False)))
+        for record in raw.get("records", []):
+            profiler.records[(record["strategy"], record["method"], record["symbol"])] = CallStats(
+                record["calls"],
+                record["total_ns"],
+                record["max_ns"],
+                record["alloc_blocks"],
+                list(record["histogram"]),
+            )
+        return profiler
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> StrategyProfiler:
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def format_rows(rows: List[Dict[str, Any]], top: int | None = None) -> str:
+    if not rows:
+        return "no profiled calls"
+    columns = [name for name in rows[0] if name in ("strategy", "method", "symbol")]
+    header = [f"{name:<20}" for name in columns] + [f"{name:>13}" for name in SORT_KEYS]
+    lines = ["".join(header)]
+    for row in rows[:top] if top else rows:
+        cells = [f"{str(row[name]):<20}" for name in columns]
+        cells += [f"{row[name]:>13.1f}" for name in SORT_KEYS]
+        lines.append("".join(cells))
+    return "\n".join(lines)
+
+
+def compare(
+    baseline: StrategyProfiler, current: StrategyProfiler, metric: str = "mean_us"
+) -> List[Dict[str, Any]]:
+    """Per (strategy, method) change of ``metric`` between two runs, biggest slowdown first."""
+
+    before = {(row["strategy"], row["method"]): row for row in baseline.rows(sort=metric)}
+    changes = []
+    for row in current.rows(sort=metric):
+        old = before.get((row["strategy"], row["method"]))
+        if old is None:
+            continue
+        ratio = row[metric] / old[metric] - 1.0 if old[metric] else 0.0
+        changes.append(
+            {
+                "strategy": row["strategy"],
+                "method": row["method"],
+                "baseline": old[metric],
+                "current": row[metric],
+                "change": ratio,
+            }
+        )
+    changes.sort(key=lambda change: change["change"], reverse=True)
+    return changes
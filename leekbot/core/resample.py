@@ -0,0 +1,246 @@
+"""Aggregation of bars into higher timeframes, streaming or over whole frames.
+
+Buckets are labelled by their start. Without a calendar they are aligned to UTC multiples of
+the timeframe (weeks start on Monday); with one of :data:`~.clock.DEFAULT_SESSIONS` they are
+anchored at each session's open, cut short at its close, and bars outside every session are
+dropped, so ``"1h"`` on ``XNYS`` yields 9:30, 10:30, ... 15:30 (a half hour) New York time and
+``"1d"`` yields one bar per session.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .clock import DEFAULT_SESSIONS, MarketSession
+from .dataframe import BarFrame, freq_ns, from_epoch_ns, to_epoch_ns
+from .events import Bar, BarEvent, EventType
+
+_DAY_NS = 86_400 * 10**9
+_WEEK_NS = 7 * _DAY_NS
+# 1970-01-01 was a Thursday; weekly buckets start four days later, on Monday
+_WEEK_ORIGIN_NS = 4 * _DAY_NS
+
+
+def _session(calendar: str | None) -> MarketSession | None:
+    if calendar is None:
+        return None
+    session = DEFAULT_SESSIONS.get(calendar)
+    if session is None:
+        raise ValueError(f"Unknown calendar {calendar}")
+    return session
+
+
+def _floor(epoch: int, step: int) -> int:
+    origin = _WEEK_ORIGIN_NS if step % _WEEK_NS == 0 else 0
+    return (epoch - origin) // step * step + origin
+
+
+@dataclass(slots=True)
+class ResampledBar:
+    """A higher-timeframe bar; the open one is updated in place until ``end`` is reached."""
+
+    symbol: str
+    timeframe: str
+    start: int
+    end: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+    def to_dict(self) -> Dict:
+        return {
+            "timestamp": from_epoch_ns(self.start),
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        }
+
+    def to_bar(self) -> Bar:
+        return Bar(self.to_dict())
+
+    def to_event(self) -> BarEvent:
+        return BarEvent(
+            EventType.BAR,
+            from_epoch_ns(self.start),
+            self.symbol,
+            self.open,
+            self.high,
+            self.low,
+            self.close,
+            self.volume,
+            self.timeframe,
+        )
+
+
+class Resampler:
+    """Incrementally aggregates one stream of base bars per symbol into several timeframes.
+
+    :meth:`update` folds one base bar into the open bucket of every timeframe in O(1) and
+    returns the buckets it completed: a bucket is complete once a base bar covers its end (so
+    the 10:29 minute closes the 9:30 hour without waiting for 10:30) or a bar of a later bucket
+    arrives. ``base`` is the duration of an input bar; :meth:`flush` hands out whatever is still
+    open at the end of the data.
+    """
+
+    def __init__(
+        self, timeframes: Sequence[str], calendar: str | None = None, base: str = "1m"
+    ) -> None:
+        self.timeframes = list(dict.fromkeys(timeframes))
+        self.steps = [freq_ns(tf) for tf in self.timeframes]
+        self.session = _session(calendar)
+        if self.session is not None and any(step > _DAY_NS for step in self.steps):
+            raise ValueError("Session-aligned timeframes cannot exceed one day")
+        self.base_ns = freq_ns(base)
+        self.open: Dict[Tuple[str, int], ResampledBar] = {}
+        # the span [lo, hi) known to lie in one session (inside) or between two (not inside)
+        self._lo = 0
+        self._hi = 0
+        self._inside = False
+
+    def _locate(self, epoch: int) -> bool:
+        if not self._lo <= epoch < self._hi:
+            ts = from_epoch_ns(epoch, timezone.utc)
+            opens, closes = self.session.session_at(ts)
+            start, end = to_epoch_ns(opens), to_epoch_ns(closes)
+            self._inside = epoch >= start
+            self._lo, self._hi = (start, end) if self._inside else (epoch, start)
+        return self._inside
+
+    def _bucket(self, epoch: int, step: int) -> Tuple[int, int]:
+        if self.session is None:
+            start = _floor(epoch, step)
+            return start, start + step
+        opens = self._lo
+        start = opens + (epoch - opens) // step * step
+        return start, min(start + step, self._hi)
+
+    def update(
+        self,
+        symbol: str,
+        epoch: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        span: int | None = None,
+    ) -> List[ResampledBar]:
+        if self.session is not None and not self._locate(epoch):
+            return []
+        covered = epoch + (self.base_ns if span is None else span)
+        done: List[ResampledBar] = []
+        for slot, step in enumerate(self.steps):
+            key = (symbol, slot)
+            bar = self.open.get(key)
+            if bar is not None and epoch >= bar.end:
+                done.append(bar)
+                bar = None
+            if bar is None:
+                start, end = self._bucket(epoch, step)
+                bar = ResampledBar(
+                    symbol, self.timeframes[slot], start, end, open_, high, low, close, volume
+                )
+            else:
+                if high > bar.high:
+                    bar.high = high
+                if low < bar.low:
+                    bar.low = low
+                bar.close = close
+                bar.volume += volume
+            if covered >= bar.end:
+                done.append(bar)
+                self.open.pop(key, None)
+            else:
+                self.open[key] = bar
+        return done
+
+    def on_event(self, event: BarEvent) -> List[BarEvent]:
+        """Feed a base :class:`BarEvent`; its ``timeframe`` gives its duration."""
+
+        done = self.update(
+            event.symbol,
+            to_epoch_ns(event.timestamp),
+            event.open,
+            event.high,
+            event.low,
+            event.close,
+            event.volume,
+            freq_ns(event.timeframe) if event.timeframe else None,
+        )
+        return [bar.to_event() for bar in done]
+
+    def flush(self) -> List[ResampledBar]:
+        done = list(self.open.values())
+        self.open.clear()
+        return done
+
+
+def resample(frame: BarFrame, timeframe: str, calendar: str | None = None) -> BarFrame:
+    """Batch counterpart of :class:`Resampler`: aggregate a whole frame in a few array passes.
+
+    ``open``/``close`` take the first/last bar of each bucket, ``high``/``low`` the extremes and
+    ``volume`` the sum; any other column keeps its last value.
+    """
+
+    step = freq_ns(timeframe)
+    session = _session(calendar)
+    epochs = frame.epochs
+    columns = frame.columns
+    if session is None:
+        origin = _WEEK_ORIGIN_NS if step % _WEEK_NS == 0 else 0
+        buckets = (epochs - origin) // step * step + origin
+    else:
+        if step > _DAY_NS:
+            raise ValueError("Session-aligned timeframes cannot exceed one day")
+        if not len(epochs):
+            return BarFrame(epochs, dict(columns), frame.tz)
+        spans = session.sessions(
+            from_epoch_ns(epochs[0], timezone.utc), from_epoch_ns(epochs[-1], timezone.utc)
+        )
+        opens = np.array([to_epoch_ns(span[0]) for span in spans], dtype=np.int64)
+        closes = np.array([to_epoch_ns(span[1]) for span in spans], dtype=np.int64)
+        which = np.searchsorted(closes, epochs, side="right")
+        inside = which < len(opens)
+        inside[inside] = epochs[inside] >= opens[which[inside]]
+        epochs = epochs[inside]
+        columns = {name: values[inside] for name, values in columns.items()}
+        anchor = opens[which[inside]]
+        buckets = anchor + (epochs - anchor) // step * step
+    if not len(epochs):
+        return BarFrame(epochs, dict(columns), frame.tz)
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    ends = np.append(starts[1:], len(epochs)) - 1
+    out: Dict[str, np.ndarray] = {}
+    for name, values in columns.items():
+        if name == "open":
+            out[name] = values[starts]
+        elif name == "high":
+            out[name] = np.maximum.reduceat(values, starts)
+        elif name == "low":
+            out[name] = np.minimum.reduceat(values, starts)
+        elif name == "volume":
+            out[name] = np.add.reduceat(values, starts)
+        else:
+            out[name] = values[ends]
+    return BarFrame(buckets[starts], out, frame.tz)
+
+
+def resample_all(
+    frames: Dict[str, BarFrame], timeframes: Sequence[str], calendar: str | None = None
+) -> Dict[str, Dict[str, BarFrame]]:
+    """``{timeframe: {symbol: frame}}`` for every requested timeframe."""
+
+    return {
+        tf: {symbol: resample(frame, tf, calendar) for symbol, frame in frames.items()}
+        for tf in timeframes
+    }
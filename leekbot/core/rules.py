@@ -0,0 +1,304 @@
+"""A small rule language for threshold strategies, compiled for streaming and batch use.
+
+A rule is ``<condition> -> BUY`` or ``<condition> -> SELL``, where the condition is a Python-like
+expression over:
+
+* bar fields: ``open``, ``high``, ``low``, ``close``, ``volume``;
+* rolling statistics ``<stat>(<source>, <window>)`` for every stat and source of
+  :mod:`.features` (``zscore(close, 20)``, ``mean(range, 14)``, ``max(high, 30)``...), plus
+  ``vwap(<window>)`` and ``atr(<window>)``;
+* numbers, ``+ - * /`` (division by zero gives NaN), ``abs(x)``, comparisons (chains allowed)
+  and ``and`` / ``or`` / ``not``.
+
+For example ``zscore(close, 20) > 3 and close > vwap(30) -> SELL``.
+
+:func:`compile_rules` parses a list of rules once into a :class:`RuleSet` whose subexpressions
+are shared: an expression that appears twice, in one rule or across rules, is a single node
+computed once. The rolling statistics become :class:`~.features.FeatureStore` features for
+:meth:`RuleSet.evaluate`, the per-bar evaluator, and :mod:`.kernels` calls for
+:meth:`RuleSet.signals`, which evaluates a whole frame with array operations. A rule stays
+silent until every statistic it reads has a value.
+"""
+
+from __future__ import annotations
+
+import ast
+import functools
+import math
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from . import kernels
+from .dataframe import OHLCV, BarFrame
+from .features import SOURCES, STATS, parse_feature
+
+ACTIONS = {"BUY": 1, "SELL": -1}
+_ARITHMETIC: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+}
+_COMPARE: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+# a node is (kind, argument, child node ids); equal keys are one node
+_Node = Tuple[str, Any, Tuple[int, ...]]
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    text: str
+    side: int
+    node: int
+    # feature nodes the condition reads, which must all have values for the rule to fire
+    features: Tuple[int, ...]
+
+
+class RuleSyntaxError(ValueError):
+    pass
+
+
+def _divide(a: float, b: float) -> float:
+    return a / b if b else math.nan
+
+
+class RuleSet:
+    """Rules compiled into one shared expression graph; the first rule that holds wins."""
+
+    def __init__(self) -> None:
+        self.nodes: List[_Node] = []
+        self._ids: Dict[_Node, int] = {}
+        self.rules: List[Rule] = []
+        self._steps: List[Callable[[List[Any], Mapping, Mapping], Any]] = []
+
+    @property
+    def features(self) -> List[str]:
+        """Feature names the rules read, for :class:`~.features.FeatureStore` registration."""
+
+        return [arg for kind, arg, _ in self.nodes if kind == "feature"]
+
+    def add(self, text: str) -> Rule:
+        condition, arrow, action = text.rpartition("->")
+        side = ACTIONS.get(action.strip().upper())
+        if not arrow or side is None:
+            raise RuleSyntaxError(f"Rule {text!r} must end with '-> BUY' or '-> SELL'")
+        try:
+            tree = ast.parse(condition.strip(), mode="eval")
+        except SyntaxError as exc:
+            raise RuleSyntaxError(f"Cannot parse rule {text!r}: {exc.msg}") from None
+        reads: List[int] = []
+        node = self._compile(tree.body, text, reads)
+        rule = Rule(text.strip(), side, node, tuple(dict.fromkeys(reads)))
+        self.rules.append(rule)
+        return rule
+
+    def _intern(self, kind: str, arg: Any, children: Tuple[int, ...] = ()) -> int:
+        key = (kind, arg, children)
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids[key] = len(self.nodes)
+            self.nodes.append(key)
+            self._steps.append(_step(kind, arg, children))
+        return node
+
+    def _compile(self, expr: ast.AST, text: str, reads: List[int]) -> int:
+        def sub(child: ast.AST) -> int:
+            return self._compile(child, text, reads)
+
+        if isinstance(expr, ast.Constant) and isinstance(expr.value, (int, float)):
+            if isinstance(expr.value, bool):
+                raise RuleSyntaxError(f"Unsupported constant {expr.value!r} in {text!r}")
+            return self._intern("const", float(expr.value))
+        if isinstance(expr, ast.Name):
+            if expr.id not in OHLCV:
+                raise RuleSyntaxError(f"Unknown name {expr.id!r} in {text!r}")
+            return self._intern("field", expr.id)
+        if isinstance(expr, ast.Call):
+            return self._call(expr, text, reads, sub)
+        if isinstance(expr, ast.UnaryOp):
+            if isinstance(expr.op, ast.USub):
+                return self._intern("neg", None, (sub(expr.operand),))
+            if isinstance(expr.op, ast.Not):
+                return self._intern("not", None, (sub(expr.operand),))
+        if isinstance(expr, ast.BinOp):
+            if isinstance(expr.op, ast.Div):
+                return self._intern("div", None, (sub(expr.left), sub(expr.right)))
+            if type(expr.op) in _ARITHMETIC:
+                return self._intern(
+                    "arith", type(expr.op).__name__, (sub(expr.left), sub(expr.right))
+                )
+        if isinstance(expr, ast.Compare) and all(type(op) in _COMPARE for op in expr.ops):
+            operands = [sub(expr.left), *(sub(right) for right in expr.comparators)]
+            links = [
+                self._intern("cmp", type(op).__name__, (left, right))
+                for op, left, right in zip(expr.ops, operands, operands[1:])
+            ]
+            return links[0] if len(links) == 1 else self._intern("and", None, tuple(links))
+        if isinstance(expr, ast.BoolOp):
+            kind = "and" if isinstance(expr.op, ast.And) else "or"
+            return self._intern(kind, None, tuple(sub(value) for value in expr.values))
+        raise RuleSyntaxError(f"Unsupported expression {ast.unparse(expr)!r} in {text!r}")
+
+    def _call(
+        self, expr: ast.Call, text: str, reads: List[int], sub: Callable[[ast.AST], int]
+    ) -> int:
+        name = expr.func.id if isinstance(expr.func, ast.Name) else None
+        args = expr.args
+        if expr.keywords or name is None:
+            raise RuleSyntaxError(f"Unsupported call {ast.unparse(expr)!r} in {text!r}")
+        if name == "abs" and len(args) == 1:
+            return self._intern("abs", None, (sub(args[0]),))
+        window = args[-1] if args else None
+        if (
+            not isinstance(window, ast.Constant)
+            or not isinstance(window.value, int)
+            or isinstance(window.value, bool)
+        ):
+            raise RuleSyntaxError(f"{ast.unparse(expr)!r} needs an integer window in {text!r}")
+        if name in ("vwap", "atr") and len(args) == 1:
+            feature = f"{name}({window.value})"
+        elif name in STATS and len(args) == 2:
+            source = args[0]
+            if not isinstance(source, ast.Name) or source.id not in SOURCES:
+                raise RuleSyntaxError(
+                    f"{ast.unparse(expr)!r} must read one of {SOURCES} in {text!r}"
+                )
+            feature = f"{source.id}_{name}({window.value})"
+        else:
+            raise RuleSyntaxError(f"Unknown function {ast.unparse(expr)!r} in {text!r}")
+        try:
+            spec = parse_feature(feature)
+        except ValueError as exc:
+            raise RuleSyntaxError(f"{exc} in {text!r}") from None
+        node = self._intern("feature", spec.name)
+        reads.append(node)
+        return node
+
+    def evaluate(self, features: Mapping[str, float], bar: Mapping[str, float]) -> int:
+        """Side (+1 buy, -1 sell, 0 none) of the first rule that holds for this bar.
+
+        ``features`` holds the bar's values of :attr:`features`, e.g. from a feature store.
+        """
+
+        values: List[Any] = []
+        for step in self._steps:
+            values.append(step(values, features, bar))
+        for rule in self.rules:
+            if values[rule.node] and not any(math.isnan(values[i]) for i in rule.features):
+                return rule.side
+        return 0
+
+    def signals(self, frame: BarFrame) -> np.ndarray:
+        """:meth:`evaluate` for every bar of ``frame`` at once, as an int8 side array."""
+
+        values: List[Any] = []
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for kind, arg, children in self.nodes:
+                values.append(_array(kind, arg, [values[i] for i in children], frame))
+        side = np.zeros(len(frame), dtype=np.int8)
+        # later rules first, so earlier ones overwrite them where both hold
+        for rule in reversed(self.rules):
+            fires = np.broadcast_to(np.asarray(values[rule.node], dtype=bool), side.shape).copy()
+            for i in rule.features:
+                fires &= ~np.isnan(values[i])
+            side[fires] = rule.side
+        return side
+
+
+def compile_rules(rules: Sequence[str]) -> RuleSet:
+    ruleset = RuleSet()
+    for text in rules:
+        ruleset.add(text)
+    return ruleset
+
+
+def _step(
+    kind: str, arg: Any, children: Tuple[int, ...]
+) -> Callable[[List, Mapping, Mapping], Any]:
+    """The per-bar evaluation of one node, reading its children's values."""
+
+    if kind == "const":
+        return lambda values, features, bar: arg
+    if kind == "field":
+        return lambda values, features, bar: bar[arg]
+    if kind == "feature":
+        return lambda values, features, bar: features[arg]
+    if kind in ("and", "or"):
+        combine = all if kind == "and" else any
+        return lambda values, features, bar: combine([values[i] for i in children])
+    if kind in ("neg", "not", "abs"):
+        unary = {"neg": operator.neg, "not": operator.not_, "abs": abs}[kind]
+        (x,) = children
+        return lambda values, features, bar: unary(values[x])
+    if kind == "div":
+        binary = _divide
+    else:
+        binary = (_ARITHMETIC if kind == "arith" else _COMPARE)[getattr(ast, arg)]
+    x, y = children
+    return lambda values, features, bar: binary(values[x], values[y])
+
+
+def _source(frame: BarFrame, source: str) -> np.ndarray:
+    if source == "range":
+        return frame["high"] - frame["low"]
+    if source == "move":
+        return np.abs(np.diff(frame["close"], prepend=np.nan))
+    return frame[source]
+
+
+def _feature(frame: BarFrame, name: str) -> np.ndarray:
+    spec = parse_feature(name)
+    window = spec.window
+    if spec.stat == "vwap":
+        return kernels.vwap(frame["close"], frame["volume"], window)
+    if spec.stat == "atr":
+        return kernels.atr(frame["high"], frame["low"], frame["close"], window)
+    values = _source(frame, spec.source)
+    if spec.stat == "ema":
+        return kernels.ema(values, window)
+    if spec.stat == "var":
+        return kernels.rolling_std(values, window) ** 2
+    kernel = {
+        "sum": kernels.rolling_sum,
+        "mean": kernels.rolling_mean,
+        "std": kernels.rolling_std,
+        "max": kernels.rolling_max,
+        "min": kernels.rolling_min,
+        "zscore": kernels.zscore,
+    }[spec.stat]
+    return kernel(values, window)
+
+
+def _array(kind: str, arg: Any, children: List[Any], frame: BarFrame) -> Any:
+    """The whole-frame evaluation of one node from its children's arrays."""
+
+    if kind == "const":
+        return arg
+    if kind == "field":
+        return frame[arg]
+    if kind == "feature":
+        return _feature(frame, arg)
+    if kind == "and":
+        return functools.reduce(np.logical_and, children)
+    if kind == "or":
+        return functools.reduce(np.logical_or, children)
+    if kind == "neg":
+        return -children[0]
+    if kind == "not":
+        return np.logical_not(children[0])
+    if kind == "abs":
+        return np.abs(children[0])
+    a, b = children
+    if kind == "div":
+        b = np.asarray(b, dtype=np.float64)
+        return np.where(b != 0, np.asarray(a, dtype=np.float64) / np.where(b != 0, b, 1), np.nan)
+    return (_ARITHMETIC if kind == "arith" else _COMPARE)[getattr(ast, arg)](a, b)
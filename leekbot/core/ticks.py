@@ -0,0 +1,147 @@
+"""Incremental tick-to-bar aggregation.
+
+:class:`TickAggregator` turns a stream of trades (``TickEvent.last`` and ``size``) into time,
+volume or dollar bars per symbol. Each symbol holds one slotted partial bar, and a tick costs a
+dict lookup and a handful of float updates, so a single process keeps up with hundreds of
+thousands of ticks per second over thousands of symbols.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from datetime import tzinfo
+from typing import AsyncIterable, AsyncIterator, Dict, List, Tuple
+
+from .dataframe import freq_ns, from_epoch_ns, to_epoch_ns
+from .events import BarEvent, EventType, TickEvent
+
+BAR_KINDS = ("time", "volume", "dollar")
+
+
+@dataclass(slots=True)
+class _Partial:
+    start: int
+    end: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    notional: float
+
+
+class TickAggregator:
+    """Builds bars of one kind from per-symbol trade ticks, emitting each as soon as it closes.
+
+    * ``time``: ``size`` is a timeframe (``"1m"``); bars cover aligned intervals and close as
+      soon as any tick, of any symbol, arrives at or after the interval end, so quiet symbols
+      do not hold their bars back. :meth:`close_due` does the same from a clock.
+    * ``volume`` / ``dollar``: ``size`` is the traded quantity / notional per bar; the tick that
+      reaches it closes the bar and is not split across two bars.
+
+    Bars are stamped with their first tick's interval start (time bars) or first tick's time,
+    in the timezone of the ticks.
+    """
+
+    def __init__(self, kind: str = "time", size: str | float = "1m") -> None:
+        if kind not in BAR_KINDS:
+            raise ValueError(f"Unknown bar kind {kind}; expected one of {', '.join(BAR_KINDS)}")
+        self.kind = kind
+        if kind == "time":
+            self.step = freq_ns(str(size))
+            self.threshold = 0.0
+            self.timeframe = str(size)
+        else:
+            self.step = 0
+            self.threshold = float(size)
+            if self.threshold <= 0:
+                raise ValueError("Bar size must be positive")
+            self.timeframe = f"{kind}:{self.threshold:g}"
+        self.bars: Dict[str, _Partial] = {}
+        self.tz: tzinfo | None = None
+        self._due: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    def _emit(self, symbol: str, bar: _Partial) -> BarEvent:
+        return BarEvent(
+            EventType.BAR,
+            from_epoch_ns(bar.start, self.tz),
+            symbol,
+            bar.open,
+            bar.high,
+            bar.low,
+            bar.close,
+            bar.volume,
+            self.timeframe,
+        )
+
+    def close_due(self, epoch: int) -> List[BarEvent]:
+        """Close every time bar whose interval ended at or before ``epoch``."""
+
+        done: List[BarEvent] = []
+        due = self._due
+        while due and due[0][0] <= epoch:
+            end, symbol = heapq.heappop(due)
+            bar = self.bars.get(symbol)
+            if bar is not None and bar.end == end:
+                del self.bars[symbol]
+                done.append(self._emit(symbol, bar))
+        return done
+
+    def update(self, symbol: str, epoch: int, price: float, qty: float) -> List[BarEvent]:
+        """Fold one trade into ``symbol``'s bar; returns the bars this tick closed."""
+
+        done = self.close_due(epoch) if self._due and self._due[0][0] <= epoch else []
+        bar = self.bars.get(symbol)
+        if bar is None:
+            if self.step:
+                start = epoch // self.step * self.step
+                bar = _Partial(start, start + self.step, price, price, price, price, qty, 0.0)
+                heapq.heappush(self._due, (bar.end, symbol))
+            else:
+                bar = _Partial(epoch, 0, price, price, price, price, qty, 0.0)
+            self.bars[symbol] = bar
+        else:
+            if price > bar.high:
+                bar.high = price
+            elif price < bar.low:
+                bar.low = price
+            bar.close = price
+            bar.volume += qty
+        if self.kind == "volume":
+            if bar.volume >= self.threshold:
+                del self.bars[symbol]
+                done.append(self._emit(symbol, bar))
+        elif self.kind == "dollar":
+            bar.notional += price * qty
+            if bar.notional >= self.threshold:
+                del self.bars[symbol]
+                done.append(self._emit(symbol, bar))
+        return done
+
+    def on_tick(self, tick: TickEvent) -> List[BarEvent]:
+        self.tz = tick.timestamp.tzinfo
+        return self.update(tick.symbol, to_epoch_ns(tick.timestamp), tick.last, tick.size)
+
+    def flush(self) -> List[BarEvent]:
+        """Close every open bar, e.g. at the end of a recorded stream."""
+
+        done = [self._emit(symbol, bar) for symbol, bar in self.bars.items()]
+        self.bars.clear()
+        self._due.clear()
+        return done
+
+
+async def aggregate(
+    ticks: AsyncIterable[TickEvent], aggregator: TickAggregator
+) -> AsyncIterator[BarEvent]:
+    """Turn a tick stream into a bar stream, e.g. ``runner.run(aggregate(client.stream(), agg))``."""
+
+    async for tick in ticks:
+        for bar in aggregator.on_tick(tick):
+            yield bar
+    for bar in aggregator.flush():
+        yield bar
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Iterable, List
 
+from .indicators import RollingMean, RollingVariance
+
 
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
@@ -21,27 +23,15 @@ def ema(values: Iterable[float], period: int) -> List[float]:
 
 
 def rolling_mean(values: Iterable[float], window: int) -> List[float]:
-    arr = list(values)
-    if len(arr) < window:
-        return []
-    means = []
-    for i in range(len(arr) - window + 1):
-        window_slice = arr[i : i + window]
-        means.append(sum(window_slice) / window)
-    return means
+    mean = RollingMean(window)
+    means = [mean.update(value) for value in values]
+    return means[window - 1 :]
 
 
 def rolling_std(values: Iterable[float], window: int) -> List[float]:
-    arr = list(values)
-    if len(arr) < window:
-        return []
-    stds = []
-    for i in range(len(arr) - window + 1):
-        window_slice = arr[i : i + window]
-        mean = sum(window_slice) / window
-        variance = sum((v - mean) ** 2 for v in window_slice) / window
-        stds.append(variance**0.5)
-    return stds
+    stats = RollingVariance(window)
+    stds = [stats.update(value) ** 0.5 for value in values]
+    return stds[window - 1 :]
 
 
 @dataclass(slots=True)
@@ -4,14 +4,14 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Dict, Iterable, List, Protocol
 
-from ..core.dataframe import MiniDataFrame
+from ..core.dataframe import BarFrame
 
 
 class MarketDataClient(ABC):
     @abstractmethod
     def get_bars(
         self, symbols: Iterable[str], timeframe: str, start: datetime, end: datetime
-    ) -> Dict[str, MiniDataFrame]:
+    ) -> Dict[str, BarFrame]:
         raise NotImplementedError
 
     @abstractmethod
@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import random
 from datetime import datetime
-from typing import Dict, Iterable
+from typing import Dict, Iterable, List
 
-from ..core.dataframe import MiniDataFrame, date_range
+from ..core.dataframe import OHLCV, BarFrame, date_range
 from .base import MarketDataClient
 
 
@@ -15,24 +15,20 @@ class DeribitClient(MarketDataClient):
 
     def get_bars(
         self, symbols: Iterable[str], timeframe: str, start: datetime, end: datetime
-    ) -> Dict[str, MiniDataFrame]:
+    ) -> Dict[str, BarFrame]:
         index = date_range(start, end)
-        bars: Dict[str, MiniDataFrame] = {}
+        bars: Dict[str, BarFrame] = {}
         for symbol in symbols:
-            rows = []
+            columns: Dict[str, List[float]] = {name: [] for name in OHLCV}
             price = 50.0
             for _ in index:
                 price += random.uniform(-1, 1)
-                rows.append(
-                    {
-                        "open": price,
-                        "high": price + random.random(),
-                        "low": price - random.random(),
-                        "close": price + random.uniform(-0.2, 0.2),
-                        "volume": random.randint(10, 100),
-                    }
-                )
-            bars[symbol] = MiniDataFrame(rows, index)
+                columns["open"].append(price)
+                columns["high"].append(price + random.random())
+                columns["low"].append(price - random.random())
+                columns["close"].append(price + random.uniform(-0.2, 0.2))
+                columns["volume"].append(random.randint(10, 100))
+            bars[symbol] = BarFrame.from_columns(index, columns)
         return bars
 
     def get_book(self, symbol: str) -> Dict[str, float]:
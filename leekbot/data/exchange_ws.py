@@ -3,9 +3,11 @@ from __future__ import annotations
 import asyncio
 import random
 from datetime import datetime
-from typing import Dict, Iterable, List
+from typing import AsyncIterator, Dict, Iterable, List
 
-from ..core.dataframe import MiniDataFrame, date_range
+from ..core.dataframe import OHLCV, BarFrame, date_range
+from ..core.events import EventType, TickEvent
+from ..core.utils import utcnow
 from .base import MarketDataClient
 
 
@@ -15,24 +17,20 @@ class CryptoWebSocketClient(MarketDataClient):
 
     def get_bars(
         self, symbols: Iterable[str], timeframe: str, start: datetime, end: datetime
-    ) -> Dict[str, MiniDataFrame]:
+    ) -> Dict[str, BarFrame]:
         index = date_range(start, end)
-        bars: Dict[str, MiniDataFrame] = {}
+        bars: Dict[str, BarFrame] = {}
         for symbol in symbols:
-            rows = []
+            columns: Dict[str, List[float]] = {name: [] for name in OHLCV}
             price = 20000.0
             for _ in index:
                 price += random.uniform(-5, 5)
-                rows.append(
-                    {
-                        "open": price,
-                        "high": price + 2,
-                        "low": price - 2,
-                        "close": price + random.uniform(-1, 1),
-                        "volume": 1.0,
-                    }
-                )
-            bars[symbol] = MiniDataFrame(rows, index)
+                columns["open"].append(price)
+                columns["high"].append(price + 2)
+                columns["low"].append(price - 2)
+                columns["close"].append(price + random.uniform(-1, 1))
+                columns["volume"].append(1.0)
+            bars[symbol] = BarFrame.from_columns(index, columns)
         return bars
 
     def get_book(self, symbol: str) -> Dict[str, float]:
@@ -42,7 +40,20 @@ class CryptoWebSocketClient(MarketDataClient):
     async def subscribe(self, symbols: List[str]) -> None:
         await asyncio.sleep(0.01)
 
-    async def stream(self):
+    async def stream(self) -> AsyncIterator[TickEvent]:
+        """Trade ticks; feed them through :func:`~leekbot.core.ticks.aggregate` to get bars."""
+
+        prices = {"BTCUSD": 30000.0, "ETHUSD": 2000.0}
         while True:
             await asyncio.sleep(1)
-            yield {"symbol": random.choice(["BTCUSD", "ETHUSD"]), "price": random.random()}
+            symbol = random.choice(list(prices))
+            last = prices[symbol] = prices[symbol] * (1 + random.uniform(-5e-4, 5e-4))
+            yield TickEvent(
+                EventType.TICK,
+                utcnow(),
+                symbol,
+                last - 0.5,
+                last + 0.5,
+                last,
+                random.uniform(0.01, 1.0),
+            )
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Dict, Iterable
+from typing import Dict, Iterable, List
 
-from ..core.dataframe import MiniDataFrame, date_range
+from ..core.dataframe import OHLCV, BarFrame, date_range
 from .base import MarketDataClient
 
 
@@ -13,24 +13,20 @@ class OandaStreamingClient(MarketDataClient):
 
     def get_bars(
         self, symbols: Iterable[str], timeframe: str, start: datetime, end: datetime
-    ) -> Dict[str, MiniDataFrame]:
+    ) -> Dict[str, BarFrame]:
         index = date_range(start, end)
-        bars: Dict[str, MiniDataFrame] = {}
+        bars: Dict[str, BarFrame] = {}
         for symbol in symbols:
-            rows = []
+            columns: Dict[str, List[float]] = {name: [] for name in OHLCV}
             price = 1.0
             for _ in index:
                 price += 0.001
-                rows.append(
-                    {
-                        "open": price,
-                        "high": price + 0.001,
-                        "low": price - 0.001,
-                        "close": price,
-                        "volume": 100000,
-                    }
-                )
-            bars[symbol] = MiniDataFrame(rows, index)
+                columns["open"].append(price)
+                columns["high"].append(price + 0.001)
+                columns["low"].append(price - 0.001)
+                columns["close"].append(price)
+                columns["volume"].append(100000)
+            bars[symbol] = BarFrame.from_columns(index, columns)
         return bars
 
     def get_book(self, symbol: str) -> Dict[str, float]:
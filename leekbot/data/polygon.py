@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import random
 from datetime import datetime
-from typing import Dict, Iterable
+from typing import Dict, Iterable, List
 
-from ..core.dataframe import MiniDataFrame, date_range
+from ..core.dataframe import OHLCV, BarFrame, date_range
 from .base import MarketDataClient
 
 
@@ -14,24 +14,21 @@ class PolygonClient(MarketDataClient):
 
     def get_bars(
         self, symbols: Iterable[str], timeframe: str, start: datetime, end: datetime
-    ) -> Dict[str, MiniDataFrame]:
+    ) -> Dict[str, BarFrame]:
         index = date_range(start, end)
-        bars: Dict[str, MiniDataFrame] = {}
+        bars: Dict[str, BarFrame] = {}
         for symbol in symbols:
-            rows = []
+            columns: Dict[str, List[float]] = {name: [] for name in OHLCV}
             price = 100.0
             for _ in index:
                 drift = random.uniform(-1, 1)
                 price = max(1.0, price + drift)
-                row = {
-                    "open": price,
-                    "high": price + abs(random.uniform(0, 0.5)),
-                    "low": price - abs(random.uniform(0, 0.5)),
-                    "close": price + random.uniform(-0.2, 0.2),
-                    "volume": random.randint(1000, 10000),
-                }
-                rows.append(row)
-            bars[symbol] = MiniDataFrame(rows, index)
+                columns["open"].append(price)
+                columns["high"].append(price + abs(random.uniform(0, 0.5)))
+                columns["low"].append(price - abs(random.uniform(0, 0.5)))
+                columns["close"].append(price + random.uniform(-0.2, 0.2))
+                columns["volume"].append(random.randint(1000, 10000))
+            bars[symbol] = BarFrame.from_columns(index, columns)
         return bars
 
     def get_book(self, symbol: str) -> Dict[str, float]:
@@ -0,0 +1,193 @@
+"""Per-strategy latency budgets for the live runner.
+
+Every strategy runs in the runner's one loop, so a slow call delays the orders of every strategy
+after it. With a :class:`LatencyBudget` the runner dispatches to ``budget.wrap(name, strategy)``,
+which times each turn of the strategy against its limit: the ``on_bar``/``on_bars``/
+``on_cross_section`` calls the runner makes for one bar or timestamp plus the ``get_orders`` call
+that ends them. Every turn over the limit is an overrun, counted and published as a
+``strategy.overrun`` monitor event. ``strikes`` overruns in a row throttle the strategy for the
+next ``cooldown`` bar calls: in ``skip`` mode those bars are dropped, in ``conflate`` mode only
+the latest bar per symbol (and timeframe) is kept and handed over when the cooldown ends.
+Cross-sections offered during a cooldown are always skipped; the next one sees the latest bars
+anyway. Fills are never withheld.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import Any, Dict, List, Tuple
+
+from ..core.events import BarSlice
+from ..core.utils import OrderIntent
+from ..monitor import monitor
+
+MODES = ("skip", "conflate")
+ANY_SYMBOL = "*"
+
+
+@dataclass(slots=True)
+class LatencyBudget:
+    """Latency limits per strategy turn, in microseconds, and what happens to repeat offenders.
+
+    ``limit_us`` applies to every strategy without an entry in ``limits``.
+    """
+
+    limit_us: float = 1000.0
+    limits: Dict[str, float] = field(default_factory=dict)
+    strikes: int = 3
+    cooldown: int = 100
+    mode: str = "conflate"
+    strategies: Dict[str, BudgetedStrategy] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown budget mode {self.mode}; expected one of {MODES}")
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any] | None) -> LatencyBudget | None:
+        return cls(**raw) if raw else None
+
+    def wrap(self, name: str, strategy: Any) -> BudgetedStrategy:
+        wrapped = self.strategies[name] = BudgetedStrategy(name, strategy, self)
+        return wrapped
+
+    def wrap_all(self, strategies: Dict[str, Any]) -> Dict[str, Any]:
+        return {name: self.wrap(name, strat) for name, strat in strategies.items()}
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One summary row per wrapped strategy."""
+
+        return [strat.summary() for strat in self.strategies.values()]
+
+
+class BudgetedStrategy:
+    """Times one strategy's turns, throttles it on repeated overruns and forwards the rest."""
+
+    def __init__(self, name: str, strategy: Any, budget: LatencyBudget) -> None:
+        self.name = name
+        self.strategy = strategy
+        self.budget = budget
+        self.limit_ns = int(budget.limits.get(name, budget.limit_us) * 1000)
+        self.turns = 0
+        self.overruns = 0
+        self.throttles = 0
+        self.skipped = 0
+        self.conflated = 0
+        self.strikes = 0
+        # bar calls left to withhold, and the latest withheld bar per (symbol, timeframe)
+        self.cooldown = 0
+        self._held: Dict[Tuple[str, str | None], Dict] = {}
+        # time spent in the current turn and the symbol of its last bar
+        self._spent = 0
+        self._symbol = ANY_SYMBOL
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.strategy, attr)
+
+    def _call(self, method: str, symbol: str, *args: Any) -> Any:
+        started = perf_counter_ns()
+        result = getattr(self.strategy, method)(*args)
+        self._spent += perf_counter_ns() - started
+        if symbol != ANY_SYMBOL:
+            self._symbol = symbol
+        return result
+
+    def _end_turn(self) -> None:
+        elapsed, self._spent = self._spent, 0
+        self.turns += 1
+        if elapsed > self.limit_ns:
+            self._overrun(elapsed)
+        else:
+            self.strikes = 0
+        self._symbol = ANY_SYMBOL
+
+    def _overrun(self, elapsed: int) -> None:
+        self.overruns += 1
+        self.strikes += 1
+        throttled = self.strikes >= self.budget.strikes
+        if throttled:
+            self.strikes = 0
+            self.throttles += 1
+            self.cooldown = self.budget.cooldown
+        monitor.record_event(
+            "strategy.overrun",
+            {
+                "strategy": self.name,
+                "symbol": self._symbol,
+                "elapsed_us": elapsed / 1e3,
+                "limit_us": self.limit_ns / 1e3,
+                "overruns": self.overruns,
+                "throttled": throttled,
+            },
+        )
+
+    def _withhold(self, bars: Any) -> bool:
+        """Whether the cooldown swallows ``bars``; conflated ones are kept for later."""
+
+        if not self.cooldown:
+            return False
+        self.cooldown -= 1
+        for bar in bars:
+            if self.budget.mode == "skip":
+                self.skipped += 1
+                continue
+            key = (bar["symbol"], bar.get("timeframe"))
+            if key in self._held:
+                self.conflated += 1
+            self._held[key] = bar
+        return True
+
+    def _release(self, bars: Any) -> List[Dict]:
+        """Withheld bars not superseded by ``bars``, the first ones delivered after a cooldown."""
+
+        held, self._held = self._held, {}
+        for bar in bars:
+            if held.pop((bar["symbol"], bar.get("timeframe")), None) is not None:
+                self.conflated += 1
+        return list(held.values())
+
+    def on_bar(self, bar: Dict, account_state: Dict) -> None:
+        if self._withhold((bar,)):
+            return
+        if self._held:
+            for stale in self._release((bar,)):
+                self._call("on_bar", stale["symbol"], stale, account_state)
+        self._call("on_bar", bar.get("symbol", ANY_SYMBOL), bar, account_state)
+
+    def on_bars(self, bars: BarSlice, account_state: Dict) -> None:
+        if self._withhold(bars):
+            return
+        if self._held:
+            stale = self._release(bars)
+            if stale:
+                latest = max(bar["timestamp"] for bar in stale)
+                self._call("on_bars", ANY_SYMBOL, BarSlice(latest, stale), account_state)
+        self._call("on_bars", ANY_SYMBOL, bars, account_state)
+
+    def on_cross_section(self, section: Any, account_state: Dict) -> None:
+        if self.cooldown:
+            self.cooldown -= 1
+            self.skipped += 1
+            return
+        self._call("on_cross_section", ANY_SYMBOL, section, account_state)
+
+    def on_fill(self, fill: Dict, account_state: Dict) -> None:
+        self.strategy.on_fill(fill, account_state)
+
+    def get_orders(self) -> List[OrderIntent]:
+        orders = self._call("get_orders", ANY_SYMBOL)
+        self._end_turn()
+        return orders
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.name,
+            "limit_us": self.limit_ns / 1e3,
+            "turns": self.turns,
+            "overruns": self.overruns,
+            "throttles": self.throttles,
+            "skipped": self.skipped,
+            "conflated": self.conflated,
+            "cooling_down": self.cooldown > 0,
+        }
@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import os
+import pickle
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterable, Dict, Iterable, Iterator, List, Mapping
+
+from ..backtest.metrics import MetricsAccumulator
+from ..backtest.timeline import Timeline
+from ..core.cross_section import CrossSection
+from ..core.dataframe import BarFrame, to_epoch_ns
+from ..core.events import Bar, BarEvent, BarSlice, EventType, FillEvent
+from ..core.features import FeatureStore
+from ..core.logging import get_logger
+from ..core.profiler import StrategyProfiler
+from ..core.resample import Resampler
+from ..core.utils import OrderIntent
+from ..monitor import monitor
+from ..strat.base import Strategy, batched, warmup_needed
+from .budget import LatencyBudget
+from .router import OrderRouter
+
+_LOG = get_logger(__name__)
+WARM_STATE_VERSION = 1
+_CURRENT: LiveRunner | None = None
+
+
+def current_runner() -> LiveRunner | None:
+    """The runner most recently started in this process, for the API to read."""
+
+    return _CURRENT
+
+
+def _bar(event: BarEvent) -> Bar:
+    return Bar(
+        timestamp=event.timestamp,
+        symbol=event.symbol,
+        timeframe=event.timeframe,
+        open=event.open,
+        high=event.high,
+        low=event.low,
+        close=event.close,
+        volume=event.volume,
+    )
+
+
+def _timestamps(
+    frames: Mapping[str, BarFrame], start: int | None, timeframe: str
+) -> Iterator[List[BarEvent]]:
+    """The bars of ``frames`` from epoch ``start`` on, one list per timestamp."""
+
+    timeline = Timeline({symbol: frame.between(start) for symbol, frame in frames.items()})
+    for _, members in timeline:
+        first_slot, first_row = members[0]
+        ts = timeline.frames[first_slot].timestamp(first_row)
+        events = []
+        for slot, row in members:
+            bar = timeline.bar(slot, row, ts)
+            events.append(
+                BarEvent(
+                    EventType.BAR,
+                    ts,
+                    bar.symbol,
+                    bar.open,
+                    bar.high,
+                    bar.low,
+                    bar.close,
+                    bar.volume,
+                    timeframe,
+                )
+            )
+        yield events
+
+
+class LiveRunner:
+    """Feeds live bars to the strategies, routes their orders and keeps running metrics.
+
+    Strategies without a route only trade on paper. In ``paper`` mode every submitted order is
+    filled immediately at its limit price or the bar close; otherwise fills arrive through
+    :meth:`on_fill` from the venue. :attr:`metrics` is updated on every fill and bar and, like
+    the backtest engine's, samples equity once per timestamp, so reading it
+    (``runner.metrics.snapshot()``) is cheap at any time.
+
+    Cross-sectional strategies see :attr:`section`, and strategies implementing ``on_bars`` the
+    timestamp's bars, once per timestamp: when the first bar of a later timestamp arrives or
+    when :meth:`flush` is called. A feed that delivers each timestamp's bars together should
+    call :meth:`flush` after them so they are not held back until the next timestamp; the same
+    goes for the timestamp's equity sample.
+
+    A restarted runner trades on its first bar when its strategies start warm: ``warm_state``
+    names a file the rolling state (features, cross-section, each strategy's
+    :meth:`~Strategy.warm_state`) is loaded from at startup if it exists and saved to when a run
+    ends, and :meth:`warm_up` rebuilds that state from cached history instead, or tops up the
+    bars a loaded snapshot missed.
+
+    With a ``budget`` every strategy call is timed against its :class:`LatencyBudget` limit, so
+    a strategy that keeps overrunning is throttled instead of delaying the others' orders.
+    """
+
+    def __init__(
+        self,
+        strategies: Dict[str, Strategy],
+        router: OrderRouter | None = None,
+        equity: float = 100000.0,
+        paper: bool = True,
+        profiler: StrategyProfiler | None = None,
+        calendar: str | None = None,
+        warm_state: str | Path | None = None,
+        budget: LatencyBudget | None = None,
+    ) -> None:
+        self.strategies = strategies
+        self.profiler = profiler
+        self.budget = budget
+        # the dispatch without budget enforcement, for warm-up replays
+        self._direct = strategies if profiler is None else profiler.wrap_all(strategies)
+        self._dispatch = self._direct if budget is None else budget.wrap_all(self._direct)
+        self.router = router
+        self.paper = paper
+        self.positions: Dict[str, float] = {}
+        self.metrics = MetricsAccumulator(equity)
+        self._owners: Dict[str, str] = {}
+        self._fills = 0
+        self.subscribed = {
+            name: set(getattr(strat, "timeframes", ())) for name, strat in strategies.items()
+        }
+        wanted = [tf for tfs in self.subscribed.values() for tf in tfs]
+        self.resampler = Resampler(wanted, calendar) if wanted else None
+        self.features = FeatureStore()
+        for strat in strategies.values():
+            if getattr(strat, "feature_specs", None):
+                strat.bind_features(self.features)
+        self.cross = {
+            name for name, strat in strategies.items() if getattr(strat, "cross_sectional", 0)
+        }
+        self.batch = {
+            name for name, strat in strategies.items() if name not in self.cross and batched(strat)
+        }
+        # strategies that see whole timestamps, through flush()
+        self._held = self.cross | self.batch
+        self.section = CrossSection() if self.cross else None
+        self._epoch: int | None = None
+        self._pending: List[Bar] = []
+        self._last_event: BarEvent | None = None
+        # the timestamp whose equity is sampled once all of its bars are in
+        self._unsampled: datetime | None = None
+        self.last_timestamp: datetime | None = None
+        self._warming = False
+        self.warm_state = Path(warm_state) if warm_state is not None else None
+        if self.warm_state is not None and self.warm_state.exists():
+            self.load_warm_state(self.warm_state)
+
+    def account_state(self) -> Dict:
+        return {"equity": self.metrics.equity, "positions": self.positions}
+
+    def on_bar(self, event: BarEvent) -> None:
+        bar = _bar(event)
+        held = self._held
+        section = self.section
+        epoch = to_epoch_ns(event.timestamp)
+        if epoch != self._epoch:
+            self.flush()
+            self._epoch = epoch
+            if section is not None:
+                section.begin(epoch)
+        if held:
+            if section is not None:
+                section.set_bar(
+                    event.symbol, event.open, event.high, event.low, event.close, event.volume
+                )
+            if self.batch:
+                self._pending.append(bar)
+            self._last_event = event
+        self.last_timestamp = event.timestamp
+        self.metrics.mark(event.symbol, event.close)
+        if len(self.features):
+            self.features.update(bar)
+        higher = [] if self.resampler is None else self.resampler.on_event(event)
+        higher_bars = [_bar(done) for done in higher]
+        for name, strat in self._dispatch.items():
+            if name not in held:
+                strat.on_bar(bar, self.account_state())
+            for done in higher_bars:
+                if done["timeframe"] in self.subscribed[name]:
+                    strat.on_bar(done, self.account_state())
+            intents = strat.get_orders()
+            if intents:
+                self.submit(name, intents, event)
+        if not self._warming:
+            self._unsampled = event.timestamp
+
+    def flush(self) -> None:
+        """Hand the current timestamp to the whole-timestamp strategies and sample its equity."""
+
+        event = self._last_event
+        if event is not None:
+            self._last_event = None
+            bars, self._pending = self._pending, []
+            bar_slice = BarSlice(event.timestamp, bars)
+            for name, strat in self._dispatch.items():
+                if name in self.cross:
+                    strat.on_cross_section(self.section, self.account_state())
+                elif name in self.batch:
+                    strat.on_bars(bar_slice, self.account_state())
+                else:
+                    continue
+                intents = strat.get_orders()
+                if intents:
+                    self.submit(name, intents, event)
+        if self._unsampled is not None:
+            self.metrics.sample(self._unsampled)
+            self._unsampled = None
+
+    def submit(self, strategy: str, intents: List[OrderIntent], event: BarEvent) -> List[str]:
+        if self._warming:
+            return []
+        if self.router is not None and strategy in self.router.routes:
+            order_ids = self.router.submit_orders(strategy, intents)
+        else:
+            order_ids = ["" for _ in intents]
+        for order_id, intent in zip(order_ids, intents):
+            if order_id:
+                self._owners[order_id] = strategy
+            if self.paper:
+                self._fills += 1
+                fill = FillEvent(
+                    type=EventType.FILL,
+                    timestamp=event.timestamp,
+                    order_id=order_id or f"paper-{self._fills}",
+                    account=strategy,
+                    symbol=intent.symbol,
+                    side=intent.side,
+                    qty=intent.qty,
+                    price=self._paper_price(intent, event),
+                )
+                self.on_fill(fill, strategy)
+        return order_ids
+
+    def _paper_price(self, intent: OrderIntent, event: BarEvent) -> float:
+        if intent.price is not None:
+            return intent.price
+        if intent.symbol == event.symbol:
+            return event.close
+        # another symbol's order fills at that symbol's own last close
+        return self.metrics.marks.get(intent.symbol, event.close)
+
+    def on_fill(self, fill: FillEvent, strategy: str | None = None) -> None:
+        name = strategy or self._owners.pop(fill.order_id, "")
+        signed = fill.qty if fill.side.upper() == "BUY" else -fill.qty
+        self.positions[fill.symbol] = self.positions.get(fill.symbol, 0) + signed
+        self.metrics.on_fill(name, fill.symbol, fill.side, fill.qty, fill.price, fill.commission)
+        monitor.record_event(
+            "order.filled",
+            {
+                "strategy": name,
+                "symbol": fill.symbol,
+                "side": fill.side,
+                "qty": fill.qty,
+                "price": fill.price,
+            },
+        )
+        strat = self._dispatch.get(name)
+        if strat is not None:
+            strat.on_fill(
+                {
+                    "order_id": fill.order_id,
+                    "symbol": fill.symbol,
+                    "side": fill.side,
+                    "qty": fill.qty,
+                    "price": fill.price,
+                    "timestamp": fill.timestamp,
+                },
+                self.account_state(),
+            )
+
+    def warmup_bars(self) -> int:
+        """Trailing base bars per symbol :meth:`warm_up` replays to bring every strategy warm."""
+
+        return max((warmup_needed(strat) for strat in self.strategies.values()), default=0)
+
+    def warm_up(self, history: Mapping[str, BarFrame], timeframe: str = "1m") -> int:
+        """Rebuild the strategies' state from cached ``history`` without trading.
+
+        Only the last :meth:`warmup_bars` timestamps are replayed, and none a loaded snapshot
+        already covers, through the same bar path as live data with every order dropped.
+        Returns the number of timestamps replayed.
+        """
+
+        need = self.warmup_bars()
+        frames = {symbol: frame for symbol, frame in history.items() if len(frame)}
+        if not need or not frames:
+            return 0
+        epochs = sorted({int(epoch) for frame in frames.values() for epoch in frame.epochs[-need:]})
+        start = epochs[-need] if len(epochs) >= need else epochs[0]
+        if self.last_timestamp is not None:
+            start = max(start, to_epoch_ns(self.last_timestamp) + 1)
+        replayed = 0
+        self._warming = True
+        enforced, self._dispatch = self._dispatch, self._direct
+        try:
+            for events in _timestamps(frames, start, timeframe):
+                for event in events:
+                    self.on_bar(event)
+                replayed += 1
+            self.flush()
+        finally:
+            self._warming = False
+            self._dispatch = enforced
+        _LOG.info("runner.warm_up", timestamps=replayed)
+        return replayed
+
+    def save_warm_state(self, path: str | Path | None = None) -> None:
+        """Atomically write the strategies' rolling state to ``path`` (default :attr:`warm_state`)."""
+
+        path = Path(path or self.warm_state)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "version": WARM_STATE_VERSION,
+            "last_timestamp": self.last_timestamp,
+            "features": self.features,
+            "section": self.section,
+            "strategies": {name: strat.warm_state() for name, strat in self.strategies.items()},
+        }
+        staging = path.with_suffix(path.suffix + ".tmp")
+        with open(staging, "wb") as fh:
+            pickle.dump(state, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(staging, path)
+
+    def load_warm_state(self, path: str | Path | None = None) -> List[str]:
+        """Continue from a :meth:`save_warm_state` snapshot; returns the strategies it warmed.
+
+        Strategies missing from the snapshot or saved with another config start cold.
+        """
+
+        with open(path or self.warm_state, "rb") as fh:
+            state = pickle.load(fh)
+        if state.get("version") != WARM_STATE_VERSION:
+            raise ValueError(
+                f"Unsupported warm state version {state.get('version')}; "
+                f"expected {WARM_STATE_VERSION}"
+            )
+        self.features.restore(state["features"])
+        if self.section is not None and state["section"] is not None:
+            self.section = state["section"]
+        self.last_timestamp = state["last_timestamp"]
+        saved = state["strategies"]
+        warm = [
+            name
+            for name, strat in self.strategies.items()
+            if name in saved and strat.load_warm_state(saved[name])
+        ]
+        _LOG.info(
+            "runner.warm_state", warm=warm, cold=[n for n in self.strategies if n not in warm]
+        )
+        return warm
+
+    def activate(self) -> None:
+        global _CURRENT
+        _CURRENT = self
+
+    def run_bars(self, bars: Iterable[BarEvent]) -> None:
+        self.activate()
+        try:
+            for event in bars:
+                self.on_bar(event)
+            self.flush()
+        finally:
+            if self.warm_state is not None:
+                self.save_warm_state()
+
+    async def run(self, bars: AsyncIterable[BarEvent]) -> None:
+        self.activate()
+        _LOG.info("runner.start", strategies=list(self.strategies))
+        try:
+            async for event in bars:
+                self.on_bar(event)
+            self.flush()
+        finally:
+            if self.warm_state is not None:
+                self.save_warm_state()
+        _LOG.info("runner.stop", **self.metrics.snapshot())
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+from datetime import timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+from zoneinfo import ZoneInfo
+
+from ..core.dataframe import BarFrame, iter_csv_chunks, read_csv_bars
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+INDEX_FILE = "ts.i8"
+_INDEX_DTYPE = np.dtype("<i8")
+_FIELD_DTYPE = np.dtype("<f8")
+
+
+def _tz_to_meta(tz: tzinfo | None) -> Dict[str, Any] | None:
+    if tz is None:
+        return None
+    name = getattr(tz, "key", None) or getattr(tz, "zone", None)
+    if name:
+        return {"name": name}
+    offset = tz.utcoffset(None)
+    return {"offset": offset.total_seconds() if offset is not None else 0.0}
+
+
+def _tz_from_meta(meta: Dict[str, Any] | None) -> tzinfo | None:
+    if meta is None:
+        return None
+    if "name" in meta:
+        return timezone.utc if meta["name"] == "UTC" else ZoneInfo(meta["name"])
+    return timezone(timedelta(seconds=meta["offset"]))
+
+
+def _field_file(name: str) -> str:
+    return f"{name}.f8"
+
+
+def is_store_dir(path: str | Path) -> bool:
+    return (Path(path) / META_FILE).is_file()
+
+
+def open_bars(
+    directory: str | Path,
+    start: Any = None,
+    end: Any = None,
+    columns: Iterable[str] | None = None,
+) -> BarFrame:
+    """Memory-map one symbol directory and return the ``start..end`` range as a view.
+
+    Opening maps the files without reading them; the range lookup binary-searches the mapped
+    index, so only the pages covering the requested bars are ever paged in.
+    """
+
+    directory = Path(directory)
+    meta = json.loads((directory / META_FILE).read_text(encoding="utf-8"))
+    if meta.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported bar store version {meta.get('version')} in {directory}")
+    rows = int(meta["rows"])
+    names = list(columns) if columns is not None else list(meta["columns"])
+    if rows == 0:
+        return BarFrame.empty(names)
+    epochs = np.memmap(directory / INDEX_FILE, dtype=_INDEX_DTYPE, mode="r", shape=(rows,))
+    data = {
+        name: np.memmap(directory / _field_file(name), dtype=_FIELD_DTYPE, mode="r", shape=(rows,))
+        for name in names
+    }
+    # the store is written sorted; checking would page in the whole index
+    frame = BarFrame(epochs, data, _tz_from_meta(meta.get("tz")), check_order=False)
+    if start is None and end is None:
+        return frame
+    return frame.between(start, end)
+
+
+def load_bars(path: str | Path, start: Any = None, end: Any = None) -> BarFrame:
+    """Load bars from a bar store symbol directory (memory-mapped) or a CSV file."""
+
+    if is_store_dir(path):
+        return open_bars(path, start, end)
+    frame = read_csv_bars(path)
+    if start is None and end is None:
+        return frame
+    return frame.between(start, end)
+
+
+class BarStore:
+    """Directory of per-symbol binary columnar bar files.
+
+    Each symbol lives in ``<root>/<symbol>/`` as a little-endian int64 epoch-ns index
+    (``ts.i8``), one float64 file per field (``<field>.f8``) and a ``meta.json`` header with the
+    row count, field names, time range, timezone and a content digest (``segment``) that
+    identifies the exact bytes on disk.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def path(self, symbol: str) -> Path:
+        return self.root / symbol
+
+    def symbols(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(child.name for child in self.root.iterdir() if is_store_dir(child))
+
+    def meta(self, symbol: str) -> Dict[str, Any]:
+        return json.loads((self.path(symbol) / META_FILE).read_text(encoding="utf-8"))
+
+    def open(
+        self,
+        symbol: str,
+        start: Any = None,
+        end: Any = None,
+        columns: Iterable[str] | None = None,
+    ) -> BarFrame:
+        return open_bars(self.path(symbol), start, end, columns)
+
+    def write(self, symbol: str, frame: BarFrame) -> Dict[str, Any]:
+        return self._write_chunks(symbol, [frame])
+
+    def ingest_csv(self, symbol: str, csv_path: str | Path, chunk_rows: int = 1_000_000) -> Dict:
+        """Convert a bar CSV into this store, streaming it ``chunk_rows`` rows at a time."""
+
+        return self._write_chunks(symbol, iter_csv_chunks(csv_path, chunk_rows))
+
+    def _write_chunks(self, symbol: str, chunks: Iterable[BarFrame]) -> Dict[str, Any]:
+        target = self.path(symbol)
+        staging = self.root / f".{symbol}.tmp"
+        if staging.exists():
+            shutil.rmtree(staging)
+        staging.mkdir(parents=True)
+        names: List[str] | None = None
+        tz: tzinfo | None = None
+        rows = 0
+        last = None
+        ordered = True
+        handles: Dict[str, Any] = {}
+        try:
+            for chunk in chunks:
+                if names is None:
+                    names = chunk.field_names
+                    tz = chunk.tz
+                    handles[INDEX_FILE] = open(staging / INDEX_FILE, "wb")
+                    for name in names:
+                        handles[name] = open(staging / _field_file(name), "wb")
+                if len(chunk) == 0:
+                    continue
+                if last is not None and chunk.epochs[0] < last:
+                    ordered = False
+                if np.any(np.diff(chunk.epochs) < 0):
+                    ordered = False
+                last = int(chunk.epochs[-1])
+                handles[INDEX_FILE].write(chunk.epochs.astype(_INDEX_DTYPE).tobytes())
+                for name in names:
+                    handles[name].write(chunk[name].astype(_FIELD_DTYPE).tobytes())
+                rows += len(chunk)
+        finally:
+            for handle in handles.values():
+                handle.close()
+        names = names or []
+        if not ordered:
+            self._sort_in_place(staging, names, rows)
+        meta = self._finalize(staging, names, rows, tz)
+        if target.exists():
+            shutil.rmtree(target)
+        staging.rename(target)
+        return meta
+
+    @staticmethod
+    def _sort_in_place(directory: Path, names: List[str], rows: int) -> None:
+        epochs = np.fromfile(directory / INDEX_FILE, dtype=_INDEX_DTYPE, count=rows)
+        order = np.argsort(epochs, kind="stable")
+        epochs[order].tofile(directory / INDEX_FILE)
+        for name in names:
+            path = directory / _field_file(name)
+            np.fromfile(path, dtype=_FIELD_DTYPE, count=rows)[order].tofile(path)
+
+    @staticmethod
+    def _finalize(
+        directory: Path, names: List[str], rows: int, tz: tzinfo | None
+    ) -> Dict[str, Any]:
+        digest = hashlib.sha256()
+        for filename in [INDEX_FILE] + [_field_file(name) for name in names]:
+            with open(directory / filename, "rb") as fh:
+                for block in iter(lambda fh=fh: fh.read(1 << 20), b""):
+                    digest.update(block)
+        first = last = None
+        if rows:
+            epochs = np.memmap(directory / INDEX_FILE, dtype=_INDEX_DTYPE, mode="r", shape=(rows,))
+            first, last = int(epochs[0]), int(epochs[-1])
+            del epochs
+        meta = {
+            "version": FORMAT_VERSION,
+            "rows": rows,
+            "columns": names,
+            "tz": _tz_to_meta(tz),
+            "first": first,
+            "last": last,
+            "segment": digest.hexdigest(),
+        }
+        (directory / META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        return meta
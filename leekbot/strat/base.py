@@ -1,20 +1,123 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Tuple
 
+import numpy as np
+
+from ..core.cross_section import CrossSection
+from ..core.dataframe import BarFrame
+from ..core.events import BarSlice
+from ..core.features import FeatureStore
 from ..core.utils import OrderIntent
 
 
+@dataclass(slots=True)
+class Signals:
+    """Per-bar desired direction produced by :meth:`Strategy.generate_signals`.
+
+    ``side`` is +1 where ``on_bar`` would buy if flat or short, -1 where it would sell if flat or
+    long, and 0 elsewhere. ``price`` optionally carries the order price (e.g. a stop trigger);
+    NaN entries fill at the bar close.
+    """
+
+    side: np.ndarray
+    price: np.ndarray | None = None
+
+
 class Strategy(ABC):
+    """Base class of all strategies.
+
+    ``config["timeframes"]`` (e.g. ``["5m", "1h"]``) subscribes the strategy to higher-timeframe
+    bars: the engine aggregates them once for all subscribers and passes each completed one to
+    ``on_bar`` with a ``timeframe`` key, after the base bars of the same timestamp.
+
+    Strategies list the base-bar features they read (see :mod:`..core.features`) in
+    :attr:`feature_specs` and read them with :meth:`features`. Engines and the live runner bind
+    one shared :class:`FeatureStore` that they update once per bar; a strategy used on its own
+    keeps a private store fed from its ``on_bar`` calls.
+
+    A restarted strategy resumes from :meth:`warm_state` instead of waiting for its windows to
+    fill again: :attr:`warm_fields` names the attributes holding its own rolling state, and
+    :attr:`warmup_bars` is how many trailing base bars per symbol rebuild that state from
+    history (the features they read add their own windows, see :func:`warmup_needed`).
+    """
+
+    warm_fields: Tuple[str, ...] = ()
+    warmup_bars = 0
+
     def __init__(self, name: str, config: Dict | None = None) -> None:
         self.name = name
         self.config = config or {}
+        self.timeframes: List[str] = list(self.config.get("timeframes", []))
+        self.feature_specs: List[str] = []
+        self.feature_store: FeatureStore | None = None
+        self._owns_features = False
+
+    def bind_features(self, store: FeatureStore) -> None:
+        """Read features from ``store``, which its owner updates with every base bar."""
+
+        self.feature_specs = store.register(self.feature_specs)
+        self.feature_store = store
+        self._owns_features = False
+
+    def features(self, bar: Dict) -> Mapping[str, float]:
+        """Read-only features of ``bar``'s symbol as of that bar."""
+
+        store = self.feature_store
+        if store is None:
+            store = self.feature_store = FeatureStore(self.feature_specs)
+            self._owns_features = True
+        if self._owns_features and bar.get("timeframe") not in self.timeframes:
+            return store.update(bar)
+        return store.get(bar["symbol"])
+
+    def bars_seen(self, symbol: str) -> int:
+        store = self.feature_store
+        return store.count(symbol) if store is not None else 0
+
+    def warm_state(self) -> Dict[str, Any]:
+        """Snapshot of the rolling state, for :meth:`load_warm_state` on a fresh instance.
+
+        Features of a bound store belong to its owner's snapshot; a private store is included.
+        """
+
+        return {
+            "config": self.config,
+            "fields": {field: getattr(self, field) for field in self.warm_fields},
+            "features": self.feature_store if self._owns_features else None,
+        }
+
+    def load_warm_state(self, state: Dict[str, Any]) -> bool:
+        """Adopt a :meth:`warm_state` taken with the same config; returns whether it did."""
+
+        if state.get("config") != self.config:
+            return False
+        for field, value in state["fields"].items():
+            setattr(self, field, value)
+        store = state.get("features")
+        if store is not None:
+            if self.feature_store is None:
+                self.feature_store = FeatureStore(self.feature_specs)
+                self._owns_features = True
+            self.feature_store.restore(store)
+        return True
 
     @abstractmethod
     def on_bar(self, bar: Dict, account_state: Dict) -> None:
         raise NotImplementedError
 
+    def on_bars(self, bars: BarSlice, account_state: Dict) -> None:
+        """Every base bar of one timestamp in one call.
+
+        The engine and the live runner call this instead of ``on_bar`` for the base bars of
+        strategies that override it; the default just loops over ``on_bar``.
+        """
+
+        for bar in bars:
+            self.on_bar(bar, account_state)
+
     def on_fill(self, fill: Dict, account_state: Dict) -> None:
         return None
 
@@ -22,6 +125,45 @@ class Strategy(ABC):
     def get_orders(self) -> List[OrderIntent]:
         raise NotImplementedError
 
+    def generate_signals(self, frame: BarFrame) -> Signals | None:
+        """Batch counterpart of ``on_bar`` over a whole frame; ``None`` if not vectorized."""
+
+        return None
+
+
+def batched(strategy: object) -> bool:
+    """Whether ``strategy`` overrides :meth:`Strategy.on_bars`."""
+
+    method = getattr(type(strategy), "on_bars", None)
+    return method is not None and method is not Strategy.on_bars
+
+
+def warmup_needed(strategy: object) -> int:
+    """Trailing base bars per symbol that bring ``strategy`` and its features fully warm."""
+
+    own = getattr(strategy, "warmup_bars", 0)
+    specs = getattr(strategy, "feature_specs", None)
+    return max(own, FeatureStore(specs).warmup) if specs else own
+
+
+class CrossSectionalStrategy(Strategy):
+    """A strategy that sees the whole universe at once instead of one bar at a time.
+
+    The engine and the live runner call :meth:`on_cross_section` once per timestamp, after every
+    symbol's bar of that timestamp is in the :class:`CrossSection`, and then collect
+    :meth:`get_orders` as usual. Base bars are not passed to ``on_bar``; subscribed
+    higher-timeframe bars still are.
+    """
+
+    cross_sectional = True
+
+    def on_bar(self, bar: Dict, account_state: Dict) -> None:
+        return None
+
+    @abstractmethod
+    def on_cross_section(self, section: CrossSection, account_state: Dict) -> None:
+        raise NotImplementedError
+
 
 def load_strategy(name: str, config: Dict | None = None) -> Strategy:
     from . import (
@@ -30,10 +172,12 @@ def load_strategy(name: str, config: Dict | None = None) -> Strategy:
         options_short_strangle,
         orb_breakout,
         pairs_stat_arb,
+        signal_rules,
         vix_hedge_overlay,
         vol_reversion_vix,
         vol_trend_vix,
         vwap_reversion,
+        xsec_momentum,
     )
 
     mapping = {
@@ -46,6 +190,8 @@ def load_strategy(name: str, config: Dict | None = None) -> Strategy:
         "vol_reversion_vix": vol_reversion_vix.VolReversionStrategy,
         "options_short_strangle": options_short_strangle.ShortStrangleStrategy,
         "vix_hedge_overlay": vix_hedge_overlay.VIXHedgeOverlay,
+        "xsec_momentum": xsec_momentum.CrossSectionalMomentum,
+        "signal_rules": signal_rules.RuleStrategy,
     }
     if name not in mapping:
         raise ValueError(f"Unknown strategy {name}")
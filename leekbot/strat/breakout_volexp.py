@@ -1,41 +1,75 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import Deque, Dict, List
+from typing import Dict, List, Tuple
 
+import numpy as np
+
+from ..core import kernels
+from ..core.dataframe import BarFrame
+from ..core.indicators import RollingMax, RollingMean, RollingMin, RollingVariance
 from ..core.utils import OrderIntent
-from .base import Strategy
+from .base import Signals, Strategy
 
 
 class BreakoutVolExpansion(Strategy):
+    warm_fields = ("stats", "last_close")
+
     def __init__(self, name: str, config: Dict | None = None) -> None:
         super().__init__(name, config)
         self.window = self.config.get("window", 30)
+        if self.window < 2:
+            # the average move needs at least one close-to-close change per window
+            raise ValueError(f"breakout_volexp window must be at least 2, got {self.window}")
+        self.warmup_bars = self.window + 1
         self.pending: List[OrderIntent] = []
-        self.bars: Dict[str, Deque[Dict]] = {}
-
-    def _std(self, values: List[float]) -> float:
-        mean = sum(values) / len(values)
-        return (sum((v - mean) ** 2 for v in values) / len(values)) ** 0.5
+        self.stats: Dict[str, Tuple[RollingVariance, RollingMean, RollingMax, RollingMin]] = {}
+        self.last_close: Dict[str, float] = {}
 
     def on_bar(self, bar: Dict, account_state: Dict) -> None:
         symbol = bar["symbol"]
-        history = self.bars.setdefault(symbol, deque(maxlen=self.window))
-        history.append(bar)
-        if len(history) < self.window:
+        close = bar["close"]
+        stats = self.stats.get(symbol)
+        if stats is None:
+            window = self.window
+            stats = self.stats[symbol] = (
+                RollingVariance(window),
+                RollingMean(window - 1),
+                RollingMax(window),
+                RollingMin(window),
+            )
+        closes, moves, high, low = stats
+        closes.update(close)
+        high.update(close)
+        low.update(close)
+        prev = self.last_close.get(symbol)
+        if prev is not None:
+            moves.update(abs(close - prev))
+        self.last_close[symbol] = close
+        if not closes.ready:
             return
-        closes = [row["close"] for row in history]
-        volatility = self._std(closes)
-        diffs = [abs(history[i]["close"] - history[i - 1]["close"]) for i in range(1, len(history))]
-        avg_vol = sum(diffs) / len(diffs)
+        volatility = closes.std
+        avg_vol = moves.value
         squeeze = volatility < avg_vol * 0.5
         expansion = volatility > avg_vol * 1.5
         position = account_state.get("positions", {}).get(symbol, 0)
-        if squeeze and closes[-1] > max(closes) and position <= 0:
+        if squeeze and close > high.value and position <= 0:
             self.pending.append(OrderIntent(symbol, "BUY", 1, "market", tag="volexp_breakout"))
-        elif expansion and closes[-1] < min(closes) and position >= 0:
+        elif expansion and close < low.value and position >= 0:
             self.pending.append(OrderIntent(symbol, "SELL", 1, "market", tag="volexp_breakdown"))
 
+    def generate_signals(self, frame: BarFrame) -> Signals:
+        close = frame["close"]
+        volatility = kernels.rolling_std(close, self.window)
+        diffs = np.abs(np.diff(close, prepend=np.nan))
+        avg_vol = kernels.rolling_mean(diffs, self.window - 1)
+        avg_vol[: self.window - 1] = np.nan
+        squeeze = volatility < avg_vol * 0.5
+        expansion = volatility > avg_vol * 1.5
+        high = kernels.rolling_max(close, self.window)
+        low = kernels.rolling_min(close, self.window)
+        side = np.where(squeeze & (close > high), 1, np.where(expansion & (close < low), -1, 0))
+        return Signals(side.astype(np.int8))
+
     def get_orders(self) -> List[OrderIntent]:
         orders, self.pending = self.pending, []
         return orders
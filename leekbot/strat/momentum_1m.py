@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import Deque, Dict, List
+from typing import Dict, List
 
+import numpy as np
+
+from ..core import kernels
+from ..core.dataframe import BarFrame
 from ..core.utils import OrderIntent
-from .base import Strategy
+from .base import Signals, Strategy
 
 
 class MomentumStrategy(Strategy):
@@ -14,23 +17,19 @@ class MomentumStrategy(Strategy):
         self.fast = self.config.get("fast", 12)
         self.slow = self.config.get("slow", 26)
         self.adx_threshold = self.config.get("adx_threshold", 20)
-        self.bars: Dict[str, Deque[float]] = {}
+        windows = (self.fast, self.slow, max(min(5, self.lookback - 1), 1))
+        fast, slow, moves = (min(window, self.lookback) for window in windows)
+        self.feature_specs = [f"close_mean({fast})", f"close_mean({slow})", f"move_mean({moves})"]
         self.pending: List[OrderIntent] = []
 
     def on_bar(self, bar: Dict, account_state: Dict) -> None:
         symbol = bar["symbol"]
-        closes = self.bars.setdefault(symbol, deque(maxlen=self.lookback))
-        closes.append(bar["close"])
-        if len(closes) < self.lookback:
+        features = self.features(bar)
+        if self.bars_seen(symbol) < self.lookback:
             return
-        prices = list(closes)
-        fast_window = prices[-self.fast :]
-        slow_window = prices[-self.slow :]
-        fast_avg = sum(fast_window) / len(fast_window)
-        slow_avg = sum(slow_window) / len(slow_window)
-        momentum = fast_avg - slow_avg
-        diffs = [abs(prices[i] - prices[i - 1]) for i in range(1, len(prices))][-5:]
-        adx = (sum(diffs) / max(len(diffs), 1)) * 100
+        fast, slow, moves = self.feature_specs
+        momentum = features[fast] - features[slow]
+        adx = features[moves] * 100 if self.lookback > 1 else 0.0
         position = account_state.get("positions", {}).get(symbol, 0)
         if momentum > 0 and adx > self.adx_threshold and position <= 0:
             self.pending.append(OrderIntent(symbol, "BUY", 1, "market", tag="momentum_long"))
@@ -40,6 +39,22 @@ class MomentumStrategy(Strategy):
     def on_fill(self, fill: Dict, account_state: Dict) -> None:
         return None
 
+    def generate_signals(self, frame: BarFrame) -> Signals:
+        close = frame["close"]
+        fast_avg = kernels.rolling_mean(close, min(self.fast, self.lookback))
+        slow_avg = kernels.rolling_mean(close, min(self.slow, self.lookback))
+        momentum = fast_avg - slow_avg
+        diff_count = min(5, self.lookback - 1)
+        if diff_count > 0:
+            diffs = np.abs(np.diff(close, prepend=np.nan))
+            adx = kernels.rolling_mean(diffs, diff_count) * 100
+        else:
+            adx = np.zeros(len(close))
+        adx[: self.lookback - 1] = np.nan
+        strong = adx > self.adx_threshold
+        side = np.where(strong & (momentum > 0), 1, np.where(strong & (momentum < 0), -1, 0))
+        return Signals(side.astype(np.int8))
+
     def get_orders(self) -> List[OrderIntent]:
         orders, self.pending = self.pending, []
         return orders
@@ -1,52 +1,93 @@
 from __future__ import annotations
 
 from collections import deque
-from typing import Deque, Dict, List
+from typing import Deque, Dict, List, Tuple
 
+import numpy as np
+
+from ..core import kernels
+from ..core.dataframe import BarFrame
 from ..core.utils import OrderIntent
-from .base import Strategy
+from .base import Signals, Strategy
 
 
 class ORBStrategy(Strategy):
+    history_len = 100
+    warm_fields = ("ranges",)
+    warmup_bars = history_len
+
     def __init__(self, name: str, config: Dict | None = None) -> None:
         super().__init__(name, config)
         self.open_window = self.config.get("open_window", 5)
         self.atr_window = self.config.get("atr_window", 14)
-        self.bars: Dict[str, Deque[Dict]] = {}
+        self.feature_specs = [
+            f"high_max({self.open_window})",
+            f"low_min({self.open_window})",
+            f"range_mean({self.atr_window})",
+        ]
+        # the opening range is the first open_window bars still held in the bounded history:
+        # the rolling range as of (history_len - open_window) bars ago, kept in a delay line
+        self.ranges: Dict[str, Tuple[Deque[float], Deque[float]]] = {}
         self.pending: List[OrderIntent] = []
 
-    def _atr(self, history: List[Dict]) -> float:
-        if len(history) < self.atr_window:
-            return 0.0
-        window = history[-self.atr_window :]
-        ranges = [bar["high"] - bar["low"] for bar in window]
-        return sum(ranges) / len(ranges)
-
     def on_bar(self, bar: Dict, account_state: Dict) -> None:
         symbol = bar["symbol"]
-        history = self.bars.setdefault(symbol, deque(maxlen=100))
-        history.append(bar)
-        if len(history) < self.open_window:
+        features = self.features(bar)
+        seen = self.bars_seen(symbol)
+        if seen < self.open_window or self.open_window > self.history_len:
             return
-        prices = list(history)
-        highs = [b["high"] for b in prices]
-        lows = [b["low"] for b in prices]
-        closes = [b["close"] for b in prices]
-        atr = self._atr(prices)
-        open_high = max(highs[: self.open_window])
-        open_low = min(lows[: self.open_window])
+        state = self.ranges.get(symbol)
+        if state is None:
+            delay = max(self.history_len - self.open_window + 1, 1)
+            state = self.ranges[symbol] = (deque(maxlen=delay), deque(maxlen=delay))
+        open_highs, open_lows = state
+        high_name, low_name, atr_name = self.feature_specs
+        open_highs.append(features[high_name])
+        open_lows.append(features[low_name])
+        open_high = open_highs[0]
+        open_low = open_lows[0]
+        ready = seen >= self.atr_window and self.atr_window <= self.history_len
+        atr = features[atr_name] if ready else 0.0
+        close = bar["close"]
         position = account_state.get("positions", {}).get(symbol, 0)
-        if closes[-1] > open_high + atr and position <= 0:
+        if close > open_high + atr and position <= 0:
             trigger = open_high + atr
             self.pending.append(
                 OrderIntent(symbol, "BUY", 1, "stop", price=trigger, tag="orb_long")
             )
-        elif closes[-1] < open_low - atr and position >= 0:
+        elif close < open_low - atr and position >= 0:
             trigger = open_low - atr
             self.pending.append(
                 OrderIntent(symbol, "SELL", 1, "stop", price=trigger, tag="orb_short")
             )
 
+    def generate_signals(self, frame: BarFrame) -> Signals:
+        high, low, close = frame["high"], frame["low"], frame["close"]
+        n = len(close)
+        side = np.zeros(n, dtype=np.int8)
+        if n < self.open_window or self.open_window > self.history_len:
+            return Signals(side)
+        # the opening range is the first open_window bars still held in the bounded history
+        range_high = kernels.rolling_max(high, self.open_window)
+        range_low = kernels.rolling_min(low, self.open_window)
+        t = np.arange(n)
+        first = np.maximum(t - (self.history_len - 1), 0) + self.open_window - 1
+        open_high = range_high[np.minimum(first, n - 1)]
+        open_low = range_low[np.minimum(first, n - 1)]
+        if self.atr_window <= self.history_len:
+            atr = np.nan_to_num(kernels.rolling_mean(high - low, self.atr_window), nan=0.0)
+        else:
+            atr = np.zeros(n)
+        long_trigger = open_high + atr
+        short_trigger = open_low - atr
+        ready = t >= self.open_window - 1
+        longs = ready & (close > long_trigger)
+        shorts = ready & ~longs & (close < short_trigger)
+        # the close is already through the stop when the order is placed, so it fills at the close
+        side[longs] = 1
+        side[shorts] = -1
+        return Signals(side)
+
     def get_orders(self) -> List[OrderIntent]:
         orders, self.pending = self.pending, []
         return orders
@@ -1,52 +1,125 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import Deque, Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
 
+import numpy as np
+
+from ..core.indicators import BatchRollingCovariance, BatchRollingVariance
+from ..core.pairs import load_pairs
 from ..core.utils import OrderIntent
 from .base import Strategy
 
 
 class PairsStatArb(Strategy):
+    """Trades the z-score of each pair's close spread over its last ``window`` samples.
+
+    A pair samples its spread ``a - hedge * b`` once both legs have a new close, i.e. once per
+    timestamp when the legs' bars are aligned. ``pairs`` entries are ``(a, b)`` or
+    ``(a, b, hedge)``; the hedge ratio defaults to 1, or with ``hedge_window`` it is the rolling
+    OLS slope of ``a`` on ``b`` over that many samples (spreads start once it is known).
+    ``pairs_file`` loads the best ``max_pairs`` pairs of a ``leek pairs scan`` output instead.
+
+    A bar only touches the pairs that contain its symbol. Pairs completed by the bars of a
+    timestamp are scored together, in arrays, when the engine asks for orders.
+    """
+
+    warm_fields = ("fresh", "last", "spreads", "betas", "sampled", "queued")
+
     def __init__(self, name: str, config: Dict | None = None) -> None:
         super().__init__(name, config)
         self.window = self.config.get("window", 60)
         self.threshold = self.config.get("threshold", 2.0)
-        self.pairs: List[Tuple[str, str]] = self.config.get("pairs", [("SPY", "QQQ")])
-        self.history: Dict[str, Deque[float]] = {
-            sym: deque(maxlen=self.window) for pair in self.pairs for sym in pair
-        }
+        self.hedge_window = self.config.get("hedge_window", 0)
+        self.warmup_bars = self.window + self.hedge_window
+        pairs: Sequence[Sequence] = self.config.get("pairs", [("SPY", "QQQ")])
+        if self.config.get("pairs_file"):
+            pairs = load_pairs(self.config["pairs_file"], self.config.get("max_pairs"))
+        self.pairs: List[Tuple[str, str]] = [(pair[0], pair[1]) for pair in pairs]
+        self.hedge = np.array([float(pair[2]) if len(pair) > 2 else 1.0 for pair in pairs])
+        self.slots: Dict[str, int] = {}
+        # symbol -> (pair, leg bit) for every pair the symbol is a leg of
+        self.legs: Dict[str, List[Tuple[int, int]]] = {}
+        leg_slots = []
+        for pos, (a, b) in enumerate(self.pairs):
+            for sym in (a, b):
+                self.slots.setdefault(sym, len(self.slots))
+            leg_slots.append((self.slots[a], self.slots[b]))
+            self.legs.setdefault(a, []).append((pos, 1))
+            if b != a:
+                self.legs.setdefault(b, []).append((pos, 2))
+        slots = np.array(leg_slots, dtype=np.intp).reshape(-1, 2)
+        self.slot_a = slots[:, 0]
+        self.slot_b = slots[:, 1]
+        self.complete = [1 if a == b else 3 for a, b in self.pairs]
+        self.fresh = [0] * len(self.pairs)
+        self.last = np.full(len(self.slots), np.nan)
+        self.spreads = BatchRollingVariance(len(self.pairs), self.window)
+        self.betas = (
+            BatchRollingCovariance(len(self.pairs), self.hedge_window)
+            if self.hedge_window
+            else None
+        )
+        self.sampled: List[int] = []
+        self.queued = np.zeros(len(self.pairs), dtype=bool)
+        self._positions: Dict[str, float] = {}
         self.pending: List[OrderIntent] = []
 
-    def _mean(self, values: List[float]) -> float:
-        return sum(values) / len(values)
-
-    def _std(self, values: List[float]) -> float:
-        mean = self._mean(values)
-        return (sum((v - mean) ** 2 for v in values) / len(values)) ** 0.5
-
     def on_bar(self, bar: Dict, account_state: Dict) -> None:
         symbol = bar["symbol"]
-        if symbol not in self.history:
+        legs = self.legs.get(symbol)
+        if legs is None:
             return
-        self.history[symbol].append(bar["close"])
-        for a, b in self.pairs:
-            if len(self.history[a]) == self.window and len(self.history[b]) == self.window:
-                spread = [pa - pb for pa, pb in zip(self.history[a], self.history[b])]
-                mean = self._mean(spread)
-                std = self._std(spread)
-                if std == 0:
-                    continue
-                z_score = (spread[-1] - mean) / std
-                position_a = account_state.get("positions", {}).get(a, 0)
-                position_b = account_state.get("positions", {}).get(b, 0)
-                if z_score > self.threshold and position_a <= 0 and position_b >= 0:
-                    self.pending.append(OrderIntent(a, "SELL", 1, "market", tag="pairs_short_a"))
-                    self.pending.append(OrderIntent(b, "BUY", 1, "market", tag="pairs_long_b"))
-                elif z_score < -self.threshold and position_a >= 0 and position_b <= 0:
-                    self.pending.append(OrderIntent(a, "BUY", 1, "market", tag="pairs_long_a"))
-                    self.pending.append(OrderIntent(b, "SELL", 1, "market", tag="pairs_short_b"))
+        self.last[self.slots[symbol]] = bar["close"]
+        self._positions = account_state.get("positions", {})
+        fresh = self.fresh
+        complete = self.complete
+        for pos, bit in legs:
+            seen = fresh[pos] | bit
+            if seen != complete[pos]:
+                fresh[pos] = seen
+                continue
+            fresh[pos] = 0
+            if self.queued[pos]:
+                # sampled twice before orders were asked for: score the first sample now
+                self._score()
+            self.queued[pos] = True
+            self.sampled.append(pos)
+
+    def _score(self) -> None:
+        """Update the spread statistics of every sampled pair at once and emit their orders."""
+
+        sampled = np.array(self.sampled, dtype=np.intp)
+        self.sampled = []
+        self.queued[sampled] = False
+        a = self.last[self.slot_a[sampled]]
+        b = self.last[self.slot_b[sampled]]
+        if self.betas is None:
+            hedge = self.hedge[sampled]
+        else:
+            hedge = self.betas.update(sampled, b, a)
+            known = ~np.isnan(hedge)
+            sampled, a, b, hedge = sampled[known], a[known], b[known], hedge[known]
+        spreads = a - hedge * b
+        self.spreads.update(sampled, spreads)
+        std = self.spreads.std(sampled)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_scores = np.where(std != 0, (spreads - self.spreads.mean[sampled]) / std, np.nan)
+        # NaN (not ready, or a flat spread) compares false, like a z-score inside the band
+        hits = np.abs(z_scores) > self.threshold
+        positions = self._positions
+        for pos, z_score in zip(sampled[hits].tolist(), z_scores[hits].tolist()):
+            a_sym, b_sym = self.pairs[pos]
+            position_a = positions.get(a_sym, 0)
+            position_b = positions.get(b_sym, 0)
+            if z_score > self.threshold and position_a <= 0 and position_b >= 0:
+                self.pending.append(OrderIntent(a_sym, "SELL", 1, "market", tag="pairs_short_a"))
+                self.pending.append(OrderIntent(b_sym, "BUY", 1, "market", tag="pairs_long_b"))
+            elif z_score < -self.threshold and position_a >= 0 and position_b <= 0:
+                self.pending.append(OrderIntent(a_sym, "BUY", 1, "market", tag="pairs_long_a"))
+                self.pending.append(OrderIntent(b_sym, "SELL", 1, "market", tag="pairs_short_b"))
 
     def get_orders(self) -> List[OrderIntent]:
+        if self.sampled:
+            self._score()
         orders, self.pending = self.pending, []
         return orders
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from ..core.dataframe import BarFrame
+from ..core.rules import compile_rules
+from ..core.utils import OrderIntent
+from .base import Signals, Strategy
+
+
+class RuleStrategy(Strategy):
+    """Trades the rules in ``config["rules"]``, written in the language of :mod:`..core.rules`.
+
+    For example ``["zscore(close, 20) > 3 -> SELL", "zscore(close, 20) < -3 -> BUY"]`` is the
+    z-score fade of ``vol_reversion_vix``. On each bar the first rule that holds buys one unit
+    unless already long, or sells one unless already short. The rules are compiled once and
+    their statistics shared through the feature store live, or computed as array kernels by
+    :meth:`generate_signals` for the vectorized backtester.
+    """
+
+    def __init__(self, name: str, config: Dict | None = None) -> None:
+        super().__init__(name, config)
+        self.rules = compile_rules(self.config.get("rules", []))
+        self.feature_specs = self.rules.features
+        self.pending: List[OrderIntent] = []
+
+    def on_bar(self, bar: Dict, account_state: Dict) -> None:
+        if bar.get("timeframe") in self.timeframes:
+            return
+        side = self.rules.evaluate(self.features(bar), bar)
+        if not side:
+            return
+        symbol = bar["symbol"]
+        position = account_state.get("positions", {}).get(symbol, 0)
+        if side > 0 and position <= 0:
+            self.pending.append(OrderIntent(symbol, "BUY", 1, "market", tag="rules_long"))
+        elif side < 0 and position >= 0:
+            self.pending.append(OrderIntent(symbol, "SELL", 1, "market", tag="rules_short"))
+
+    def generate_signals(self, frame: BarFrame) -> Signals:
+        return Signals(self.rules.signals(frame))
+
+    def get_orders(self) -> List[OrderIntent]:
+        orders, self.pending = self.pending, []
+        return orders
@@ -3,14 +3,21 @@ from __future__ import annotations
 from collections import deque
 from typing import Deque, Dict, List
 
+import numpy as np
+
+from ..core import kernels
+from ..core.dataframe import BarFrame
 from ..core.utils import OrderIntent
-from .base import Strategy
+from .base import Signals, Strategy
 
 
 class VolTrendStrategy(Strategy):
+    warm_fields = ("history",)
+
     def __init__(self, name: str, config: Dict | None = None) -> None:
         super().__init__(name, config)
         self.window = self.config.get("window", 15)
+        self.warmup_bars = self.window
         self.pending: List[OrderIntent] = []
         self.history: Dict[str, Deque[float]] = {}
 
@@ -20,14 +27,19 @@ class VolTrendStrategy(Strategy):
         closes.append(bar["close"])
         if len(closes) < self.window:
             return
-        prices = list(closes)
-        trend = prices[-1] - prices[0]
+        trend = closes[-1] - closes[0]
         position = account_state.get("positions", {}).get(symbol, 0)
         if trend > 0 and position <= 0:
             self.pending.append(OrderIntent(symbol, "BUY", 1, "market", tag="vol_trend_long"))
         elif trend < 0 and position >= 0:
             self.pending.append(OrderIntent(symbol, "SELL", 1, "market", tag="vol_trend_flatten"))
 
+    def generate_signals(self, frame: BarFrame) -> Signals:
+        close = frame["close"]
+        trend = close - kernels.shift(close, self.window - 1)
+        side = np.where(trend > 0, 1, np.where(trend < 0, -1, 0))
+        return Signals(side.astype(np.int8))
+
     def get_orders(self) -> List[OrderIntent]:
         orders, self.pending = self.pending, []
         return orders
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import Deque, Dict, List
+from typing import Dict, List
 
+import numpy as np
+
+from ..core import kernels
+from ..core.dataframe import BarFrame
 from ..core.utils import OrderIntent
-from .base import Strategy
+from .base import Signals, Strategy
 
 
 class VWAPReversionStrategy(Strategy):
@@ -12,28 +15,17 @@ class VWAPReversionStrategy(Strategy):
         super().__init__(name, config)
         self.window = self.config.get("window", 20)
         self.std_mult = self.config.get("std_mult", 2.0)
-        self.bars: Dict[str, Deque[Dict]] = {}
+        self.feature_specs = [f"vwap({self.window})", f"close_std({self.window})"]
         self.pending: List[OrderIntent] = []
 
-    def _vwap(self, data: Deque[Dict]) -> float:
-        volumes = [row["volume"] for row in data]
-        prices = [row["close"] for row in data]
-        total_volume = sum(volumes) or 1.0
-        return sum(v * p for v, p in zip(volumes, prices)) / total_volume
-
-    def _std(self, values: List[float]) -> float:
-        mean = sum(values) / len(values)
-        return (sum((v - mean) ** 2 for v in values) / len(values)) ** 0.5
-
     def on_bar(self, bar: Dict, account_state: Dict) -> None:
         symbol = bar["symbol"]
-        history = self.bars.setdefault(symbol, deque(maxlen=self.window))
-        history.append(bar)
-        if len(history) < self.window:
+        features = self.features(bar)
+        if self.bars_seen(symbol) < self.window:
             return
-        vwap = self._vwap(history)
-        prices = [row["close"] for row in history]
-        std = self._std(prices)
+        vwap_name, std_name = self.feature_specs
+        vwap = features[vwap_name]
+        std = features[std_name]
         upper = vwap + self.std_mult * std
         lower = vwap - self.std_mult * std
         position = account_state.get("positions", {}).get(symbol, 0)
@@ -42,6 +34,18 @@ class VWAPReversionStrategy(Strategy):
         elif bar["close"] > upper and position >= 0:
             self.pending.append(OrderIntent(symbol, "SELL", 1, "market", tag="vwap_short"))
 
+    def generate_signals(self, frame: BarFrame) -> Signals:
+        close = frame["close"]
+        volume = frame["volume"]
+        total_volume = kernels.rolling_sum(volume, self.window)
+        total_volume = np.where(total_volume == 0, 1.0, total_volume)
+        vwap = kernels.rolling_sum(volume * close, self.window) / total_volume
+        std = kernels.rolling_std(close, self.window)
+        upper = vwap + self.std_mult * std
+        lower = vwap - self.std_mult * std
+        side = np.where(close < lower, 1, np.where(close > upper, -1, 0))
+        return Signals(side.astype(np.int8))
+
     def get_orders(self) -> List[OrderIntent]:
         orders, self.pending = self.pending, []
         return orders
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+import numpy as np
+
+from ..core.cross_section import CrossSection
+from ..core.utils import OrderIntent
+from .base import CrossSectionalStrategy
+
+
+class CrossSectionalMomentum(CrossSectionalStrategy):
+    """Holds the ``top_n`` symbols by return over the last ``lookback`` timestamps.
+
+    Every ``rebalance`` timestamps the universe is ranked by that return: the ``top_n`` best
+    are held ``qty`` long, the ``bottom_n`` worst (none by default) ``qty`` short, and names that
+    dropped out are closed. Symbols without a bar ``lookback`` timestamps ago are not ranked.
+    """
+
+    warm_fields = ("history", "steps", "targets")
+
+    def __init__(self, name: str, config: Dict | None = None) -> None:
+        super().__init__(name, config)
+        self.lookback = self.config.get("lookback", 60)
+        self.top_n = self.config.get("top_n", 10)
+        self.bottom_n = self.config.get("bottom_n", 0)
+        self.rebalance = self.config.get("rebalance", 30)
+        self.qty = self.config.get("qty", 1)
+        self.warmup_bars = self.lookback + 1
+        # closes of the last lookback + 1 timestamps, one row per timestamp
+        self.history = np.full((self.lookback + 1, 0), np.nan)
+        self.steps = 0
+        self.targets: Dict[str, float] = {}
+        self.pending: List[OrderIntent] = []
+
+    def on_cross_section(self, section: CrossSection, account_state: Dict) -> None:
+        close = section.close
+        history = self.history
+        if history.shape[1] < len(close):
+            grown = np.full((history.shape[0], len(close)), np.nan)
+            grown[:, : history.shape[1]] = history
+            history = self.history = grown
+        row = self.steps % history.shape[0]
+        history[row] = close
+        self.steps += 1
+        if self.steps <= self.lookback or (self.steps - self.lookback - 1) % self.rebalance:
+            return
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = close / history[self.steps % history.shape[0]] - 1.0
+        symbols = section.symbols
+        targets = {symbols[slot]: self.qty for slot in section.top(returns, self.top_n).tolist()}
+        for slot in section.bottom(returns, self.bottom_n).tolist():
+            targets.setdefault(symbols[slot], -self.qty)
+        positions = account_state.get("positions", {})
+        for symbol in [*self.targets, *(s for s in targets if s not in self.targets)]:
+            delta = targets.get(symbol, 0) - positions.get(symbol, 0)
+            if delta:
+                side = "BUY" if delta > 0 else "SELL"
+                self.pending.append(OrderIntent(symbol, side, abs(delta), "market", tag="xsec"))
+        self.targets = targets
+
+    def get_orders(self) -> List[OrderIntent]:
+        orders, self.pending = self.pending, []
+        return orders
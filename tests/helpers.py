@@ -0,0 +1,18 @@
+"""Shared test data builders; conftest puts the repo root on ``sys.path`` for this import."""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def write_bars_csv(path: Path, bars: int = 200) -> Path:
+    lines = ["timestamp,open,high,low,close,volume"]
+    start = datetime(2024, 1, 2, 9, 30)
+    for i in range(bars):
+        price = 100 + 5 * math.sin(i / 7) + i * 0.01
+        ts = (start + timedelta(minutes=i)).isoformat()
+        lines.append(f"{ts},{price},{price + 0.5},{price - 0.5},{price},1000")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from leekbot.backtest import cache as cache_module
+from leekbot.backtest.cache import BacktestCache, cache_key, run_backtest
+from leekbot.backtest.orderbook import ExecutionModel
+from leekbot.storage.barstore import BarStore
+from tests.helpers import write_bars_csv
+
+STRATEGIES = {"momentum_1m": {"lookback": 20}}
+
+
+def test_hit_returns_same_result(tmp_path) -> None:
+    paths = {"SPY": write_bars_csv(tmp_path / "SPY.csv")}
+    cache = BacktestCache(tmp_path / "cache")
+    first, hit = run_backtest(paths, STRATEGIES, cache=cache)
+    assert not hit
+    second, hit = run_backtest(paths, STRATEGIES, cache=cache)
+    assert hit
+    assert second.trades == first.trades
+    assert second.metrics == first.metrics
+    assert (cache.session.hits, cache.session.misses) == (1, 1)
+    assert BacktestCache(tmp_path / "cache").stats().hits == 1
+
+
+def test_engine_version_invalidates_cached_results(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    paths = {"SPY": write_bars_csv(tmp_path / "SPY.csv")}
+    cache = BacktestCache(tmp_path / "cache")
+    run_backtest(paths, STRATEGIES, cache=cache)
+    monkeypatch.setattr(cache_module, "ENGINE_VERSION", cache_module.ENGINE_VERSION + ".next")
+    _, hit = run_backtest(paths, STRATEGIES, cache=cache)
+    assert not hit
+
+
+def test_key_tracks_data_config_and_execution(tmp_path) -> None:
+    csv_path = write_bars_csv(tmp_path / "SPY.csv")
+    paths = {"SPY": csv_path}
+    key = cache_key(paths, STRATEGIES)
+    assert cache_key(paths, {"momentum_1m": {"lookback": 30}}) != key
+    assert cache_key(paths, STRATEGIES, ExecutionModel(slippage_bps=1)) != key
+    assert cache_key(paths, STRATEGIES, vectorized=True) != key
+    write_bars_csv(csv_path, bars=201)
+    assert cache_key(paths, STRATEGIES) != key
+
+    store = BarStore(tmp_path / "store")
+    store.ingest_csv("SPY", csv_path)
+    stored = cache_key({"SPY": store.path("SPY")}, STRATEGIES)
+    store.ingest_csv("SPY", csv_path, chunk_rows=7)
+    assert cache_key({"SPY": store.path("SPY")}, STRATEGIES) == stored
+
+
+def test_rewritten_pairs_file_misses_the_cache(tmp_path) -> None:
+    paths = {
+        "A": write_bars_csv(tmp_path / "A.csv"),
+        "B": write_bars_csv(tmp_path / "B.csv", bars=150),
+    }
+    pairs_file = tmp_path / "pairs.yaml"
+    pairs_file.write_text("pairs:\n- {a: A, b: B, hedge: 1.0}\n", encoding="utf-8")
+    strategies = {"pairs_stat_arb": {"pairs_file": str(pairs_file), "window": 20}}
+    cache = BacktestCache(tmp_path / "cache")
+    run_backtest(paths, strategies, cache=cache)
+    assert run_backtest(paths, strategies, cache=cache)[1]
+    # a new `leek pairs scan` result under the same path is a new backtest
+    pairs_file.write_text("pairs:\n- {a: A, b: B, hedge: 0.75}\n", encoding="utf-8")
+    _, hit = run_backtest(paths, strategies, cache=cache)
+    assert not hit
+
+
+def test_eviction_drops_least_recently_used(tmp_path) -> None:
+    paths = {"SPY": write_bars_csv(tmp_path / "SPY.csv")}
+    cache = BacktestCache(tmp_path / "cache")
+    configs = [{"momentum_1m": {"lookback": n}} for n in (10, 20, 30)]
+    for stamp, config in enumerate(configs):
+        run_backtest(paths, config, cache=cache)
+        for entry in cache._entries():
+            if cache_key(paths, config) in entry.name:
+                os.utime(entry, ns=(stamp * 10**9, stamp * 10**9))
+    run_backtest(paths, configs[0], cache=cache)
+    cache.max_bytes = cache.size() - 1
+    assert cache.evict() == 1
+    assert run_backtest(paths, configs[0], cache=cache)[1]
+    assert not run_backtest(paths, configs[1], cache=cache)[1]
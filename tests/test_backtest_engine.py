@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import pickle
 from datetime import datetime
 
+import pytest
+
 from leekbot.backtest.engine import BacktestEngine
-from leekbot.core.dataframe import MiniDataFrame, date_range
+from leekbot.backtest.timeline import Timeline
+from leekbot.bench.allocations import ReaderStrategy
+from leekbot.core.dataframe import BarFrame, MiniDataFrame, date_range
+from leekbot.core.events import BarEvent, BarSlice, EventType
+from leekbot.exec.runner import LiveRunner
+from leekbot.strat.base import Strategy, batched
 from leekbot.strat.momentum_1m import MomentumStrategy
 
 
@@ -24,3 +32,92 @@ def test_backtest_runs():
     result = engine.run()
     assert "pnl" in result.metrics
     assert isinstance(result.trades, list)
+
+
+def test_timeline_merges_unaligned_symbols_in_order():
+    spy = BarFrame.from_columns(
+        date_range(datetime(2024, 1, 1, 9, 30), periods=3), {"close": [1.0, 2.0, 3.0]}
+    )
+    qqq = BarFrame.from_columns(
+        date_range(datetime(2024, 1, 1, 9, 31), periods=3), {"close": [4.0, 5.0, 6.0]}
+    )
+    slices = list(Timeline({"SPY": spy, "QQQ": qqq}))
+    assert [len(members) for _, members in slices] == [1, 2, 2, 1]
+    assert slices[1][1] == [(0, 1), (1, 0)]
+    assert [epoch for epoch, _ in slices] == sorted(epoch for epoch, _ in slices)
+
+
+def test_strategies_share_one_immutable_bar_per_symbol_and_timestamp():
+    index = date_range(datetime(2024, 1, 1, 9, 30), periods=40)
+    closes = [100.0 + i for i in range(40)]
+    spy = BarFrame.from_columns(
+        index,
+        {"open": closes, "high": closes, "low": closes, "close": closes, "volume": closes},
+    )
+    # a frame with extra columns keeps them on its bars
+    vix = BarFrame.from_columns(index, {"close": closes, "term": [0.5] * 40})
+    readers = {name: ReaderStrategy(name, {"keep": True}) for name in ("a", "b")}
+    BacktestEngine({"SPY": spy, "VIX": vix}, readers).run()
+    first, second = readers["a"].kept, readers["b"].kept
+    assert len(first) == 80 and all(x is y for x, y in zip(first, second))
+    assert first[0] == {
+        "symbol": "SPY",
+        "timestamp": index[0],
+        "open": 100.0,
+        "high": 100.0,
+        "low": 100.0,
+        "close": 100.0,
+        "volume": 100.0,
+    }
+    bar = first[-1]
+    assert (bar.symbol, bar.close, bar["term"], bar.timeframe) == ("VIX", 139.0, 0.5, None)
+    with pytest.raises(TypeError):
+        bar["close"] = 0.0
+    with pytest.raises(TypeError):
+        bar.update(close=0.0)
+    assert pickle.loads(pickle.dumps(bar)) == bar and dict(bar) == bar
+
+
+class SliceRecorder(Strategy):
+    def __init__(self, name: str, config: dict | None = None) -> None:
+        super().__init__(name, config)
+        self.slices: list = []
+
+    def on_bar(self, bar: dict, account_state: dict) -> None:
+        raise AssertionError("base bars go to on_bars")
+
+    def on_bars(self, bars: BarSlice, account_state: dict) -> None:
+        self.slices.append((bars.timestamp, bars.symbols, bars.column("close").tolist()))
+
+    def get_orders(self) -> list:
+        return []
+
+
+def test_batched_strategies_get_one_call_per_timestamp():
+    spy = BarFrame.from_columns(
+        date_range(datetime(2024, 1, 1, 9, 30), periods=3), {"close": [1.0, 2.0, 3.0]}
+    )
+    qqq = BarFrame.from_columns(
+        date_range(datetime(2024, 1, 1, 9, 31), periods=3), {"close": [4.0, 5.0, 6.0]}
+    )
+    recorder, reader = SliceRecorder("batch"), ReaderStrategy("reader", {"keep": True})
+    assert batched(recorder) and not batched(reader)
+    BacktestEngine({"SPY": spy, "QQQ": qqq}, {"batch": recorder, "reader": reader}).run()
+    assert [(symbols, closes) for _, symbols, closes in recorder.slices] == [
+        (["SPY"], [1.0]),
+        (["SPY", "QQQ"], [2.0, 4.0]),
+        (["SPY", "QQQ"], [3.0, 5.0]),
+        (["QQQ"], [6.0]),
+    ]
+    assert len(reader.kept) == 6 and recorder.slices[1][0] == spy.timestamp(1)
+
+    recorder = SliceRecorder("batch")
+    runner = LiveRunner({"batch": recorder, "reader": ReaderStrategy("reader")})
+    for frame, symbol, pos in ((spy, "SPY", 0), (spy, "SPY", 1), (qqq, "QQQ", 0), (qqq, "QQQ", 1)):
+        close = frame["close"][pos]
+        ts = frame.timestamp(pos)
+        runner.on_bar(BarEvent(EventType.BAR, ts, symbol, close, close, close, close, 1.0, "1m"))
+    # a timestamp is handed over once a later one starts, the last one on flush()
+    assert [symbols for _, symbols, _ in recorder.slices] == [["SPY"], ["SPY", "QQQ"]]
+    runner.flush()
+    assert recorder.slices[-1][1:] == (["QQQ"], [5.0])
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+
+from leekbot.backtest.engine import BacktestEngine
+from leekbot.core.dataframe import read_csv_bars
+from leekbot.storage.barstore import BarStore, is_store_dir, load_bars
+from leekbot.strat.base import load_strategy
+from tests.helpers import write_bars_csv
+
+
+def test_ingest_roundtrip_in_chunks(tmp_path) -> None:
+    csv_path = write_bars_csv(tmp_path / "SPY.csv", bars=250)
+    store = BarStore(tmp_path / "store")
+    meta = store.ingest_csv("SPY", csv_path, chunk_rows=64)
+    assert meta["rows"] == 250
+    assert store.symbols() == ["SPY"]
+    assert is_store_dir(store.path("SPY"))
+
+    expected = read_csv_bars(csv_path)
+    frame = store.open("SPY")
+    assert not frame.epochs.flags.writeable
+    np.testing.assert_array_equal(frame.epochs, expected.epochs)
+    for name in expected.field_names:
+        np.testing.assert_array_equal(frame[name], expected[name])
+
+
+def test_range_open_is_a_view_of_the_mapping(tmp_path) -> None:
+    store = BarStore(tmp_path / "store")
+    store.ingest_csv("SPY", write_bars_csv(tmp_path / "SPY.csv", bars=100))
+    full = store.open("SPY")
+    window = store.open("SPY", full.index[10], full.index[19], columns=["close"])
+    assert len(window) == 10
+    assert window.field_names == ["close"]
+    assert not window["close"].flags.owndata
+    np.testing.assert_array_equal(window["close"], full["close"][10:20])
+    assert window.index[0] == full.index[10]
+
+
+def test_unsorted_ingest_is_sorted_and_digest_is_stable(tmp_path) -> None:
+    csv_path = write_bars_csv(tmp_path / "SPY.csv", bars=50)
+    header, *rows = csv_path.read_text(encoding="utf-8").splitlines()
+    shuffled = tmp_path / "shuffled.csv"
+    shuffled.write_text("\n".join([header] + rows[25:] + rows[:25]) + "\n", encoding="utf-8")
+
+    store = BarStore(tmp_path / "store")
+    ordered = store.ingest_csv("A", csv_path, chunk_rows=10)
+    unordered = store.ingest_csv("B", shuffled, chunk_rows=10)
+    assert unordered["segment"] == ordered["segment"]
+    assert np.all(np.diff(store.open("B").epochs) > 0)
+
+
+def test_engine_runs_from_store(tmp_path) -> None:
+    csv_path = write_bars_csv(tmp_path / "SPY.csv")
+    store = BarStore(tmp_path / "store")
+    store.ingest_csv("SPY", csv_path)
+    assert len(load_bars(store.path("SPY"))) == len(load_bars(csv_path))
+
+    strategy = load_strategy("momentum_1m", {"lookback": 20})
+    from_csv = BacktestEngine({"SPY": read_csv_bars(csv_path)}, {"momentum_1m": strategy}).run()
+    from_store = BacktestEngine.from_store(store.root, {"momentum_1m": {"lookback": 20}}).run()
+    assert from_store.trades == from_csv.trades
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from leekbot.bench import suite
+
+
+def test_scenario_reports_every_stage() -> None:
+    results = suite.run_scenario(2, 300, strategies=["momentum_1m"], memory=False)
+    assert [r.stage for r in results] == [
+        "ingest",
+        "event_loop",
+        "strategy:momentum_1m",
+        "metrics",
+    ]
+    assert all(r.bars == 600 and r.seconds > 0 for r in results)
+    assert "on_bar_ns" in results[2].extra
+
+
+def test_compare_flags_slowdowns_and_memory_growth(tmp_path) -> None:
+    baseline = {
+        "results": [
+            {"scenario": "1x10", "stage": "event_loop", "ns_per_bar": 100.0, "peak_mb": 1.0},
+            {"scenario": "1x10", "stage": "metrics", "ns_per_bar": 100.0, "peak_mb": None},
+        ]
+    }
+    suite.save(baseline, tmp_path / "base.json")
+    current = {
+        "results": [
+            {"scenario": "1x10", "stage": "event_loop", "ns_per_bar": 105.0, "peak_mb": 2.0},
+            {"scenario": "1x10", "stage": "metrics", "ns_per_bar": 150.0, "peak_mb": 1.0},
+        ]
+    }
+    regressions = suite.compare(current, suite.load(tmp_path / "base.json"), threshold=0.1)
+    assert [(r.name, r.metric) for r in regressions] == [
+        ("1x10/event_loop", "peak_mb"),
+        ("1x10/metrics", "ns_per_bar"),
+    ]
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from leekbot.backtest.cache import run_backtest
+from leekbot.backtest.engine import BacktestEngine, BacktestResult
+from leekbot.core.utils import OrderIntent
+from leekbot.storage.barstore import load_bars
+from leekbot.strat.base import Strategy
+from leekbot.strat.momentum_1m import MomentumStrategy
+from tests.helpers import write_bars_csv
+
+
+class DipBuyer(Strategy):
+    """Rests a limit below each close so checkpoints carry open orders."""
+
+    def __init__(self, name: str, config: Dict | None = None) -> None:
+        super().__init__(name, config)
+        self.pending: List[OrderIntent] = []
+        self.crash_at: int | None = None
+        self.seen = 0
+
+    def on_bar(self, bar: Dict, account_state: Dict) -> None:
+        self.seen += 1
+        if self.crash_at is not None and self.seen >= self.crash_at:
+            raise RuntimeError("killed")
+        side = "BUY" if account_state["positions"].get(bar["symbol"], 0) <= 0 else "SELL"
+        offset = -0.8 if side == "BUY" else 0.8
+        self.pending.append(OrderIntent(bar["symbol"], side, 1, "limit", bar["close"] + offset))
+
+    def get_orders(self) -> List[OrderIntent]:
+        orders, self.pending = self.pending, []
+        return orders
+
+
+def _data(tmp_path: Path) -> Dict:
+    return {
+        "SPY": load_bars(write_bars_csv(tmp_path / "SPY.csv", 300)),
+        "QQQ": load_bars(write_bars_csv(tmp_path / "QQQ.csv", 250)),
+    }
+
+
+def _strategies() -> Dict[str, Strategy]:
+    return {
+        "mom": MomentumStrategy("mom", {"fast": 2, "slow": 5}),
+        "dip": DipBuyer("dip"),
+    }
+
+
+def _same(a: BacktestResult, b: BacktestResult) -> None:
+    assert a.trades == b.trades
+    assert a.metrics == b.metrics
+    assert a.attribution == b.attribution
+    assert a.equity_curve == b.equity_curve
+
+
+def test_resume_after_crash_matches_uninterrupted_run(tmp_path: Path) -> None:
+    data = _data(tmp_path)
+    expected = BacktestEngine(data, _strategies()).run()
+
+    strategies = _strategies()
+    strategies["dip"].crash_at = 400
+    engine = BacktestEngine(data, strategies)
+    checkpoint = tmp_path / "run.ckpt"
+    with pytest.raises(RuntimeError):
+        engine.run(checkpoint=checkpoint, checkpoint_every=50)
+
+    resumed = BacktestEngine.resume(checkpoint, _data(tmp_path))
+    assert 0 < sum(resumed.cursors) < 550
+    assert len(resumed.book) > 0
+    resumed.strategies["dip"].crash_at = None
+    _same(resumed.run(), expected)
+    assert resumed.finished
+
+
+def test_run_until_then_continue(tmp_path: Path) -> None:
+    data = _data(tmp_path)
+    expected = BacktestEngine(data, _strategies()).run()
+    engine = BacktestEngine(data, _strategies())
+    midway = int(data["SPY"].epochs[120])
+    engine.run(until=midway)
+    assert engine.cursors == [120, 120]
+    _same(engine.run(), expected)
+
+
+def test_fork_applies_overrides_to_warmed_strategies(tmp_path: Path) -> None:
+    data = _data(tmp_path)
+    start = int(data["SPY"].epochs[100])
+    base = BacktestEngine(data, _strategies())
+    base.run(trade_from=start, until=start)
+
+    variants = [base.fork({"mom": {"adx_threshold": t}}) for t in (5, 40)]
+    results = [variant.run() for variant in variants]
+    for threshold, result in zip((5, 40), results):
+        strategies = _strategies()
+        strategies["mom"].adx_threshold = threshold
+        _same(result, BacktestEngine(data, strategies).run(trade_from=start))
+    assert results[0].trades != results[1].trades
+    assert base.trades == [] and base.cursors == [100, 100]
+
+
+def test_checkpoint_rejects_other_data(tmp_path: Path) -> None:
+    engine = BacktestEngine(_data(tmp_path), _strategies())
+    engine.run(until=int(engine.data["SPY"].epochs[10]))
+    engine.checkpoint(tmp_path / "run.ckpt")
+    other = {"SPY": load_bars(write_bars_csv(tmp_path / "other.csv", 100))}
+    with pytest.raises(ValueError):
+        BacktestEngine.resume(tmp_path / "run.ckpt", other)
+
+
+def test_run_backtest_checkpoints_and_cleans_up(tmp_path: Path) -> None:
+    paths = {"SPY": write_bars_csv(tmp_path / "SPY.csv", 300)}
+    strategies = {"momentum_1m": {"fast": 2, "slow": 5}}
+    plain, _ = run_backtest(paths, strategies)
+    result, _ = run_backtest(paths, strategies, checkpoints=tmp_path / "ckpt", checkpoint_every=7)
+    _same(result, plain)
+    assert list((tmp_path / "ckpt").iterdir()) == []
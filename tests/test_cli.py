@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import ast
+import math
+import pickle
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List
+
+import pytest
+import yaml
+from typer.testing import CliRunner
+
+from leekbot.cli import app
+from leekbot.core.events import EventType, TickEvent
+from leekbot.data.exchange_ws import CryptoWebSocketClient
+from tests.helpers import write_bars_csv
+
+
+def _config(tmp_path: Path, extra: Dict | None = None) -> Path:
+    cfg = {
+        "global": {"log_dir": str(tmp_path / "logs")},
+        "data": {"SPY": {"path": str(write_bars_csv(tmp_path / "SPY.csv"))}},
+        "strategies": {"vwap_reversion": {"window": 10, "std_mult": 1.0}},
+        "cache": {"dir": str(tmp_path / "cache")},
+        **(extra or {}),
+    }
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(cfg), encoding="utf-8")
+    return path
+
+
+def test_backtest_runs_only_the_requested_range(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    config = _config(tmp_path)
+    window = ["--from-date", "2024-01-02T10:00:00", "--to", "2024-01-02T11:00:00"]
+    result = CliRunner().invoke(app, ["backtest", "--config", str(config), *window])
+    assert result.exit_code == 0, result.output
+    assert "'samples': 61.0" in result.output
+    trades = (tmp_path / "backtest_trades.csv").read_text().splitlines()[1:]
+    assert trades and all("2024-01-02 10:" in row for row in trades)
+    # another range is another cache entry
+    window[1] = "2024-01-02T10:30:00"
+    result = CliRunner().invoke(app, ["backtest", "--config", str(config), *window])
+    assert "cache miss" in result.output and "'samples': 31.0" in result.output
+
+
+def _stream(minutes: range) -> Callable[[CryptoWebSocketClient], AsyncIterator[TickEvent]]:
+    """A recorded BTCUSD trade stream, one tick per minute after the CSV history ends."""
+
+    async def stream(self: CryptoWebSocketClient) -> AsyncIterator[TickEvent]:
+        start = datetime(2024, 1, 2, 9, 30, tzinfo=timezone.utc)
+        for minute in minutes:
+            price = 100 + 5 * math.sin(minute / 7) + minute * 0.01
+            ts = start + timedelta(minutes=minute)
+            yield TickEvent(EventType.TICK, ts, "BTCUSD", price - 0.5, price + 0.5, price, 1.0)
+
+    return stream
+
+
+def _live_config(tmp_path: Path, extra: Dict | None = None) -> Path:
+    data = {
+        "BTCUSD": {"path": str(write_bars_csv(tmp_path / "BTCUSD.csv"))},
+        "crypto": {"provider": "exchange_ws", "venues": ["kraken"], "bar": "1m"},
+    }
+    accounts = [{"name": "paper", "venue": "kraken", "strategies": ["vwap_reversion"]}]
+    return _config(tmp_path, {"data": data, "accounts": accounts, **(extra or {})})
+
+
+def _budget_rows(output: str) -> Dict[str, Dict]:
+    rows: List[Dict] = [
+        ast.literal_eval(line.removeprefix("budget "))
+        for line in output.splitlines()
+        if line.startswith("budget ")
+    ]
+    return {row["strategy"]: row for row in rows}
+
+
+def test_run_trades_the_live_stream_and_resumes_from_its_warm_state(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    config = _live_config(tmp_path)
+    state = tmp_path / "warm.pkl"
+    args = ["run", "--config", str(config), "--warm-state", str(state)]
+    monkeypatch.setattr(CryptoWebSocketClient, "stream", _stream(range(200, 230)))
+    result = CliRunner().invoke(app, [*args, "--warm-up"])
+    assert result.exit_code == 0, result.output
+    assert "Warmed up on 10 timestamps" in result.output and state.exists()
+    with open(state, "rb") as fh:
+        assert pickle.load(fh)["features"].count("BTCUSD") == 10 + 30
+    # a restart continues from the saved state instead of warming up again
+    monkeypatch.setattr(CryptoWebSocketClient, "stream", _stream(range(230, 260)))
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 0, result.output
+    assert "Resuming after 2024-01-02 13:19:00+00:00" in result.output
+    with open(state, "rb") as fh:
+        assert pickle.load(fh)["features"].count("BTCUSD") == 10 + 30 + 30
+
+
+def test_run_needs_a_streaming_provider(tmp_path: Path) -> None:
+    result = CliRunner().invoke(app, ["run", "--config", str(_config(tmp_path))])
+    assert result.exit_code != 0 and "No streaming data provider" in result.output
+
+
+def test_run_enforces_the_configured_latency_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(CryptoWebSocketClient, "stream", _stream(range(200, 260)))
+    accounts = [
+        {"name": "paper", "venue": "kraken", "strategies": ["vwap_reversion", "orb_breakout"]}
+    ]
+    # no turn fits in a nanosecond; every orb_breakout turn fits in a minute
+    budget = {"limit_us": 60e6, "limits": {"vwap_reversion": 0.001}, "strikes": 2, "cooldown": 5}
+    config = _live_config(tmp_path, {"accounts": accounts, "budget": budget})
+    result = CliRunner().invoke(app, ["run", "--config", str(config)])
+    assert result.exit_code == 0, result.output
+    rows = _budget_rows(result.output)
+    assert rows["vwap_reversion"]["throttles"] > 0 and rows["vwap_reversion"]["conflated"] > 0
+    assert rows["orb_breakout"]["overruns"] == 0 and rows["orb_breakout"]["turns"] == 60
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from leekbot.backtest.engine import BacktestEngine
+from leekbot.bench.synthetic import synthetic_universe
+from leekbot.core.cross_section import CrossSection
+from leekbot.core.events import BarEvent, EventType, FillEvent
+from leekbot.exec.runner import LiveRunner
+from leekbot.strat.base import load_strategy
+
+
+def test_section_tracks_latest_bars_and_ranks() -> None:
+    section = CrossSection(["A", "B"])
+    section.begin(1)
+    section.write([1], [{"open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10}])
+    assert math.isnan(section.close[0]) and section.close[1] == 1.5
+    section.begin(2)
+    assert not section.updated.any()
+    for i in range(40):
+        section.set_bar(f"S{i}", 1, 1, 1, float(i % 7), 1)
+    assert len(section) == 42 and section.fresh == list(range(2, 42))
+    assert section.close[1] == 1.5
+    close = section.close
+    top = section.top(close, 3)
+    assert close[top].tolist() == [6.0, 6.0, 6.0] and list(top) == sorted(top)
+    bottom = section.bottom(close, 2, section.updated)
+    assert close[bottom].tolist() == [0.0, 0.0]
+    assert 1 not in section.bottom(close, 50, section.updated)
+    assert section.top(close, 0).size == 0
+
+
+def test_engine_hands_the_universe_to_cross_sectional_strategies(tmp_path: Path) -> None:
+    data = synthetic_universe(30, 120)
+    config = {"lookback": 20, "top_n": 3, "bottom_n": 2, "rebalance": 25}
+    strat = load_strategy("xsec_momentum", dict(config))
+    engine = BacktestEngine(data, {"xsec": strat})
+    engine.run(until=int(next(iter(data.values())).epochs[60]))
+    engine.checkpoint(tmp_path / "run.ckpt")
+    result = engine.run()
+    # rebalances at timestamps 21, 46, 71, 96: the targets are the ranked returns of the last one
+    closes = np.array([frame["close"] for frame in data.values()])
+    returns = closes[:, 95] / closes[:, 75] - 1
+    order = np.argsort(-returns, kind="stable")
+    symbols = list(data)
+    want = {symbols[i]: 1 for i in order[:3]} | {symbols[i]: -1 for i in order[-2:]}
+    assert strat.targets == want
+    held = {sym: qty for sym, qty in engine.positions.items() if qty}
+    assert held == want
+    assert {trade["strategy"] for trade in result.trades} == {"xsec"}
+
+    resumed = BacktestEngine.resume(tmp_path / "run.ckpt", data)
+    assert resumed.run().trades == result.trades
+
+
+def test_runner_flushes_one_cross_section_per_timestamp() -> None:
+    strat = load_strategy("xsec_momentum", {"lookback": 1, "top_n": 1, "rebalance": 1})
+    seen = []
+    scan = strat.on_cross_section
+
+    def record(section: CrossSection, account_state: dict) -> None:
+        seen.append((section.epoch, list(section.fresh)))
+        scan(section, account_state)
+
+    strat.on_cross_section = record
+    runner = LiveRunner({"xsec": strat, "mom": load_strategy("momentum_1m", {"lookback": 2})})
+    fills = []
+    on_fill = runner.on_fill
+
+    def record_fill(fill: FillEvent, strategy: str | None = None) -> None:
+        if strategy == "xsec":
+            fills.append((fill.symbol, fill.price))
+        on_fill(fill, strategy)
+
+    runner.on_fill = record_fill
+    start = datetime(2024, 1, 2, 14, 30)
+    prices = {"A": [10.0, 11.0, 12.0], "B": [10.0, 10.5, 9.0]}
+    for minute in range(3):
+        for symbol, path in prices.items():
+            price = path[minute]
+            runner.on_bar(
+                BarEvent(
+                    EventType.BAR,
+                    start + timedelta(minutes=minute),
+                    symbol,
+                    price,
+                    price,
+                    price,
+                    price,
+                    1.0,
+                    "1m",
+                )
+            )
+        if minute == 1:
+            runner.flush()
+    assert [fresh for _, fresh in seen] == [[0, 1], [0, 1]]
+    runner.flush()
+    assert len(seen) == 3
+    # long the leader after each scan, filled at its own close rather than the last bar's
+    assert fills == [("A", 11.0)]
+    assert runner.features.count("A") == 3
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from leekbot.backtest.engine import BacktestEngine
+from leekbot.core.dataframe import BarFrame, date_range, read_csv_bars
+
+
+def _frame(periods: int = 10) -> BarFrame:
+    index = date_range(datetime(2024, 1, 1, 9, 30), periods=periods)
+    closes = [100.0 + i for i in range(periods)]
+    columns = {
+        "open": closes,
+        "high": [c + 1 for c in closes],
+        "low": [c - 1 for c in closes],
+        "close": closes,
+        "volume": [1000.0] * periods,
+    }
+    return BarFrame.from_columns(index, columns)
+
+
+def test_bar_frame_loc_and_iteration() -> None:
+    frame = _frame()
+    ts = frame.index[3]
+    assert frame.loc[ts]["close"] == 103.0
+    assert ts in frame
+    assert [row["close"] for row in frame][:2] == [100.0, 101.0]
+
+
+def test_bar_frame_between_is_zero_copy() -> None:
+    frame = _frame()
+    window = frame.between(frame.index[2], frame.index[5])
+    assert len(window) == 4
+    assert np.shares_memory(window["close"], frame["close"])
+    assert window.index[0] == frame.index[2]
+
+
+def test_unordered_index_is_sorted_or_rejected() -> None:
+    index = date_range(datetime(2024, 1, 1, 9, 30), periods=4)
+    shuffled = [index[2], index[0], index[3], index[1]]
+    frame = BarFrame.from_columns(shuffled, {"close": [2.0, 0.0, 3.0, 1.0]})
+    assert list(frame["close"]) == [0.0, 1.0, 2.0, 3.0]
+    assert frame.loc[index[1]]["close"] == 1.0
+    assert list(frame.between(index[1], index[2])["close"]) == [1.0, 2.0]
+    with pytest.raises(ValueError, match="row 1 is not after row 0"):
+        BarFrame(frame.epochs[::-1], {"close": frame["close"]})
+    with pytest.raises(ValueError, match="strictly increase"):
+        BarFrame.from_columns([index[0], index[1], index[1]], {"close": [0.0, 1.0, 2.0]})
+    with pytest.raises(ValueError, match="strictly increase"):
+        BarFrame.from_rows([{"close": 0.0}, {"close": 1.0}], [index[0], index[0]])
+
+
+def test_read_csv_bars_feeds_engine(tmp_path) -> None:
+    path = tmp_path / "SPY.csv"
+    lines = ["timestamp,open,high,low,close,volume"]
+    for ts, row in zip(_frame().index, _frame()):
+        lines.append(
+            f"{ts.isoformat()},{row['open']},{row['high']},{row['low']},{row['close']},1000"
+        )
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    frame = read_csv_bars(path)
+    assert frame.index == _frame().index
+    engine = BacktestEngine.from_csv({"SPY": path}, {"momentum_1m": {"lookback": 5}})
+    assert "pnl" in engine.run().metrics
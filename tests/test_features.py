@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from leekbot.backtest.engine import BacktestEngine
+from leekbot.core.events import BarEvent, EventType
+from leekbot.core.features import FeatureStore, parse_feature
+from leekbot.core.indicators import ATR, RollingMean
+from leekbot.exec.runner import LiveRunner
+from leekbot.storage.barstore import load_bars
+from leekbot.strat.base import load_strategy
+from tests.helpers import write_bars_csv
+
+
+def test_parse_feature_canonicalizes_and_rejects_unknown() -> None:
+    assert parse_feature(" close_mean( 20 )").name == "close_mean(20)"
+    assert parse_feature("atr(14)").source is None
+    for bad in ("close_mean", "close_median(5)", "bid_mean(5)", "foo(3)", "close_std(0)"):
+        with pytest.raises(ValueError):
+            parse_feature(bad)
+
+
+def test_store_computes_features_once_and_is_read_only() -> None:
+    store = FeatureStore(["close_mean(3)", "atr(2)"])
+    assert store.register(["close_mean(3)", "move_mean(2)"]) == ["close_mean(3)", "move_mean(2)"]
+    assert len(store) == 3
+    mean, atr, moves = RollingMean(3), ATR(2), RollingMean(2)
+    closes = [10.0, 11.0, 9.5, 12.0]
+    for i, close in enumerate(closes):
+        values = store.update(
+            {"symbol": "SPY", "close": close, "high": close + 1, "low": close - 1}
+        )
+        if i:
+            moves.update(abs(close - closes[i - 1]))
+        assert values["close_mean(3)"] == pytest.approx(mean.update(close), nan_ok=True)
+        assert values["atr(2)"] == pytest.approx(
+            atr.update(close + 1, close - 1, close), nan_ok=True
+        )
+        assert values["move_mean(2)"] == pytest.approx(moves.value, nan_ok=True)
+    assert store.count("SPY") == 4 and store.count("QQQ") == 0
+    with pytest.raises(TypeError):
+        store.get("SPY")["close_mean(3)"] = 0.0
+    assert math.isnan(
+        FeatureStore(["close_std(5)"]).update({"symbol": "X", "close": 1.0})["close_std(5)"]
+    )
+
+
+def test_engine_shares_one_store_across_strategies(tmp_path: Path) -> None:
+    data = {"SPY": load_bars(write_bars_csv(tmp_path / "SPY.csv", 200))}
+    configs = {
+        "momentum_1m": {"fast": 5, "slow": 20, "lookback": 20},
+        "vwap_reversion": {"window": 20},
+        "breakout_volexp": {"window": 20},
+    }
+    strategies = {name: load_strategy(name, dict(cfg)) for name, cfg in configs.items()}
+    engine = BacktestEngine(data, strategies)
+    assert strategies["momentum_1m"].feature_store is engine.features
+    assert set(engine.features.specs) == {
+        "close_mean(5)",
+        "close_mean(20)",
+        "move_mean(5)",
+        "vwap(20)",
+        "close_std(20)",
+    }
+    engine.run()
+    private = FeatureStore(strategies["vwap_reversion"].feature_specs)
+    frame = data["SPY"]
+    for row in range(len(frame)):
+        private.update({**frame.row(row), "symbol": "SPY"})
+    shared = engine.features.get("SPY")
+    assert all(shared[name] == value for name, value in private.get("SPY").items())
+    assert engine.features.count("SPY") == len(frame)
+
+
+def test_runner_updates_the_store_once_per_bar() -> None:
+    strategies = {
+        "a": load_strategy("momentum_1m", {"fast": 2, "slow": 3, "lookback": 3}),
+        "b": load_strategy("momentum_1m", {"fast": 2, "slow": 3, "lookback": 3}),
+    }
+    runner = LiveRunner(strategies)
+    start = datetime(2024, 1, 2, 14, 30)
+    for i in range(5):
+        price = 100.0 + i
+        runner.on_bar(
+            BarEvent(
+                EventType.BAR,
+                start + timedelta(minutes=i),
+                "SPY",
+                price,
+                price,
+                price,
+                price,
+                1.0,
+                "1m",
+            )
+        )
+    assert len(runner.features) == 3 and runner.features.count("SPY") == 5
+    assert runner.features.get("SPY")["close_mean(3)"] == pytest.approx(103.0)
+
+
+def test_restore_carries_shared_features_and_starts_new_ones_cold() -> None:
+    saved = FeatureStore(["close_mean(3)", "move_ema(2)"])
+    for price in (1.0, 2.0, 3.0, 4.0):
+        saved.update({"symbol": "SPY", "close": price, "high": price, "low": price})
+    store = FeatureStore(["close_mean(3)", "close_max(2)"])
+    assert saved.warmup == 8 and store.warmup == 3
+    store.restore(saved)
+    assert store.count("SPY") == 4 and store.get("SPY")["close_mean(3)"] == pytest.approx(3.0)
+    assert math.isnan(store.get("SPY")["close_max(2)"])
+    values = store.update({"symbol": "SPY", "close": 5.0, "high": 5.0, "low": 5.0})
+    assert values["close_mean(3)"] == pytest.approx(4.0) and math.isnan(values["close_max(2)"])
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from leekbot.bench.indicators import run as bench_indicators
+from leekbot.core import indicators, kernels, utils
+
+
+def _prices(n: int = 3000, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 1000 + np.cumsum(rng.normal(0, 1, n))
+
+
+def _feed(indicator: object, values: np.ndarray) -> np.ndarray:
+    return np.array([indicator.update(float(v)) for v in values])
+
+
+@pytest.mark.parametrize("window", [1, 2, 17, 500])
+def test_rolling_indicators_match_batch_kernels(window: int) -> None:
+    x = _prices()
+    close = dict(rtol=1e-9, atol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(
+        _feed(indicators.RollingMean(window), x), kernels.rolling_mean(x, window), **close
+    )
+    np.testing.assert_allclose(
+        _feed(indicators.RollingSum(window), x), kernels.rolling_sum(x, window), **close
+    )
+    np.testing.assert_allclose(
+        np.sqrt(_feed(indicators.RollingVariance(window), x)),
+        kernels.rolling_std(x, window),
+        **close,
+    )
+    np.testing.assert_array_equal(
+        _feed(indicators.RollingMax(window), x), kernels.rolling_max(x, window)
+    )
+    np.testing.assert_array_equal(
+        _feed(indicators.RollingMin(window), x), kernels.rolling_min(x, window)
+    )
+    if window > 1:
+        z = (x - kernels.rolling_mean(x, window)) / kernels.rolling_std(x, window)
+        np.testing.assert_allclose(_feed(indicators.ZScore(window), x), z, rtol=1e-6, atol=1e-6)
+
+
+def test_vwap_ema_and_atr() -> None:
+    x = _prices()
+    volume = np.random.default_rng(1).integers(0, 50, len(x)).astype(float)
+    vwap = indicators.RollingVWAP(20)
+    got = np.array([vwap.update(p, v) for p, v in zip(x, volume)])
+    total = kernels.rolling_sum(volume, 20)
+    want = kernels.rolling_sum(x * volume, 20) / np.where(total == 0, 1.0, total)
+    np.testing.assert_allclose(got, want, rtol=1e-9, equal_nan=True)
+
+    ema = indicators.EMA(12)
+    np.testing.assert_allclose(_feed(ema, x), utils.ema(x.tolist(), 12))
+    assert ema.ready
+
+    atr = indicators.ATR(2)
+    atr.update(10, 9, 9.5)
+    assert not atr.ready
+    # gap up: the true range reaches back to the previous close
+    assert atr.update(13, 12, 12.5) == pytest.approx((1 + 3.5) / 2)
+    plain = indicators.ATR(2, true_range=False)
+    plain.update(10, 9, 9.5)
+    assert plain.update(13, 12, 12.5) == 1.0
+
+
+def test_long_runs_do_not_drift() -> None:
+    x = _prices(200_000) * 1e3
+    mean = indicators.RollingMean(50)
+    stats = indicators.RollingVariance(50)
+    for value in x:
+        mean.update(value)
+        stats.update(value)
+    assert mean.value == pytest.approx(x[-50:].mean(), rel=1e-12)
+    assert stats.std == pytest.approx(x[-50:].std(), rel=1e-9)
+
+
+def test_utils_rolling_helpers() -> None:
+    assert utils.rolling_mean([1, 2, 3, 4], 2) == [1.5, 2.5, 3.5]
+    assert utils.rolling_std([1, 3, 1, 3], 2) == [1.0, 1.0, 1.0]
+    assert utils.rolling_mean([1.0], 3) == []
+
+
+def test_indicator_benchmark_runs() -> None:
+    stats = bench_indicators(window=100, updates=500, naive=False)
+    assert "deque_std" not in stats and all(value > 0 for value in stats.values())
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import statistics
+
+import numpy as np
+import pytest
+
+from leekbot.bench.kernels import run as bench_kernels
+from leekbot.core import indicators, kernels, utils
+
+
+def _matrix(symbols: int = 4, bars: int = 2000, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    prices = 1000 + np.cumsum(rng.normal(0, 1, (symbols, bars)), axis=1)
+    prices[1, :150] = np.nan  # listed late
+    prices[2, 900] = np.nan  # one missing bar
+    return prices
+
+
+def _feed(indicator: object, *columns: np.ndarray) -> np.ndarray:
+    return np.array([indicator.update(*map(float, values)) for values in zip(*columns)])
+
+
+@pytest.mark.parametrize("window", [1, 3, 64, 700])
+def test_rolling_kernels_match_streaming_per_row(window: int) -> None:
+    prices = _matrix()
+    close = dict(rtol=1e-9, atol=1e-9, equal_nan=True)
+    mean = kernels.sma(prices, window)
+    std = kernels.rolling_std(prices, window)
+    high = kernels.rolling_max(prices, window)
+    for row in (0, 3):
+        np.testing.assert_allclose(
+            mean[row], _feed(indicators.RollingMean(window), prices[row]), **close
+        )
+        streamed = np.sqrt(_feed(indicators.RollingVariance(window), prices[row]))
+        np.testing.assert_allclose(std[row], streamed, rtol=1e-6, atol=1e-9, equal_nan=True)
+        np.testing.assert_array_equal(high[row], _feed(indicators.RollingMax(window), prices[row]))
+    # a window touching a missing bar is NaN; the first full window after it is not
+    for result in (mean, std, high):
+        assert np.isnan(result[1, : 150 + window - 1]).all()
+        assert not np.isnan(result[1, 150 + window - 1])
+        assert np.isnan(result[2, 900 : 900 + window]).all()
+        assert not np.isnan(result[2, 900 + window :]).any()
+    if window > 1:
+        t = 150 + window + 10
+        assert std[1, t] == pytest.approx(
+            statistics.pstdev(prices[1, t - window + 1 : t + 1]), rel=1e-12
+        )
+
+
+def test_out_buffers_are_filled_and_returned() -> None:
+    prices = _matrix()
+    out = np.full(prices.shape, 7.0)
+    assert kernels.rolling_std(prices, 20, out=out) is out
+    np.testing.assert_array_equal(out, kernels.rolling_std(prices, 20))
+    short = np.zeros((2, 5))
+    assert np.isnan(kernels.rolling_mean(np.ones((2, 5)), 10, out=short)).all()
+    with pytest.raises(ValueError):
+        kernels.zscore(prices, 20, out=np.empty(3))
+    with pytest.raises(ValueError):
+        kernels.rolling_sum(prices, 0)
+
+
+def test_ema_matches_streaming_and_skips_missing_bars() -> None:
+    prices = _matrix()
+    result = kernels.ema(prices, 12)
+    np.testing.assert_array_equal(result[0], _feed(indicators.EMA(12), prices[0]))
+    np.testing.assert_allclose(result[3], utils.ema(prices[3].tolist(), 12))
+    np.testing.assert_array_equal(kernels.ema(prices[0], 12), result[0])
+    listed = prices[1, 150:]
+    np.testing.assert_array_equal(result[1, 150:], _feed(indicators.EMA(12), listed))
+    assert np.isnan(result[2, 900])
+    expected = _feed(indicators.EMA(12), np.delete(prices[2], 900))
+    np.testing.assert_array_equal(np.delete(result[2], 900), expected)
+
+
+def test_atr_vwap_and_zscores_match_streaming() -> None:
+    prices = _matrix()[[0, 3]]
+    rng = np.random.default_rng(1)
+    high = prices + rng.uniform(0, 2, prices.shape)
+    low = prices - rng.uniform(0, 2, prices.shape)
+    volume = rng.integers(0, 5, prices.shape).astype(float)
+    close = dict(rtol=1e-9, atol=1e-9, equal_nan=True)
+    for flag in (True, False):
+        result = kernels.atr(high, low, prices, 14, true_range=flag)
+        streamed = _feed(indicators.ATR(14, true_range=flag), high[1], low[1], prices[1])
+        np.testing.assert_allclose(result[1], streamed, **close)
+    vwap = kernels.vwap(prices, volume, 3)
+    np.testing.assert_allclose(
+        vwap[0], _feed(indicators.RollingVWAP(3), prices[0], volume[0]), **close
+    )
+    idle = kernels.rolling_sum(volume, 3) == 0
+    assert idle.any() and (vwap[idle] == 0).all()
+    z = kernels.zscore(prices, 30, eps=1e-9)
+    np.testing.assert_allclose(
+        z[0], _feed(indicators.ZScore(30, 1e-9), prices[0]), rtol=1e-6, equal_nan=True
+    )
+    assert np.isnan(kernels.zscore(np.ones(10), 3)[2:]).all()
+
+    upper, lower = kernels.breakout_bands(high, low, 20)
+    np.testing.assert_array_equal(upper, kernels.rolling_max(high, 20))
+    np.testing.assert_array_equal(lower, kernels.rolling_min(low, 20))
+
+    spreads = kernels.spread_zscore(prices, [(0, 1), (1, 0)], 25, hedge=[1.0, 0.5])
+    assert spreads.shape == (2, prices.shape[1])
+    np.testing.assert_allclose(
+        spreads[0], _feed(indicators.ZScore(25), prices[0] - prices[1]), rtol=1e-6, equal_nan=True
+    )
+    np.testing.assert_allclose(
+        spreads[1], kernels.zscore(prices[1] - 0.5 * prices[0], 25), equal_nan=True
+    )
+
+
+def test_long_rows_do_not_lose_precision() -> None:
+    x = (1000 + np.cumsum(np.random.default_rng(2).normal(0, 1, 300_000))) * 1e3
+    assert kernels.sma(x, 50)[-1] == pytest.approx(x[-50:].mean(), rel=1e-12)
+    assert kernels.rolling_std(x, 50)[-1] == pytest.approx(x[-50:].std(), rel=1e-9)
+
+
+def test_kernel_benchmark_runs() -> None:
+    stats = bench_kernels(symbols=4, bars=200, window=10, naive=False)
+    assert "window_std" not in stats and all(value > 0 for value in stats.values())
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import pytest
+
+from leekbot.core.dataframe import BarFrame
+from leekbot.core.events import BarEvent, EventType
+from leekbot.core.utils import OrderIntent
+from leekbot.exec import budget as budget_module
+from leekbot.exec.budget import LatencyBudget
+from leekbot.exec.runner import LiveRunner
+from leekbot.monitor import monitor
+from leekbot.strat.base import Strategy
+
+CLOCK = [0]
+
+
+class Costly(Strategy):
+    """Records its bars; each call costs ``cost_us`` on the test clock."""
+
+    def __init__(self, name: str, config: Dict | None = None) -> None:
+        super().__init__(name, config)
+        self.cost_ns = int(self.config.get("cost_us", 0) * 1000)
+        self.seen: List[tuple] = []
+
+    def on_bar(self, bar: Dict, account_state: Dict) -> None:
+        CLOCK[0] += self.cost_ns
+        self.seen.append((bar["symbol"], bar["close"]))
+
+    def get_orders(self) -> List[OrderIntent]:
+        return []
+
+
+def _feed(runner: LiveRunner, minutes: int) -> None:
+    start = datetime(2024, 1, 2, 14, 30)
+    for minute in range(minutes):
+        for symbol in ("A", "B"):
+            price = float(minute)
+            runner.on_bar(
+                BarEvent(
+                    EventType.BAR,
+                    start + timedelta(minutes=minute),
+                    symbol,
+                    price,
+                    price,
+                    price,
+                    price,
+                    1.0,
+                    "1m",
+                )
+            )
+
+
+@pytest.fixture(autouse=True)
+def _clock(monkeypatch: pytest.MonkeyPatch) -> None:
+    CLOCK[0] = 0
+    monkeypatch.setattr(budget_module, "perf_counter_ns", lambda: CLOCK[0])
+    monitor.reset()
+
+
+def test_repeat_offender_gets_conflated_bars_and_others_every_bar() -> None:
+    slow = Costly("slow", {"cost_us": 5000})
+    fast = Costly("fast", {"cost_us": 10})
+    budget = LatencyBudget(limit_us=100, limits={"slow": 1000}, strikes=2, cooldown=5)
+    runner = LiveRunner({"slow": slow, "fast": fast}, budget=budget)
+    _feed(runner, 6)
+    assert len(fast.seen) == 12
+    # two slow turns throttle it for five bars: A1..A3 are withheld, A3 reaches it before B3
+    # (B2, the latest held B, is superseded by B3), and two more slow turns throttle it again
+    assert slow.seen == [("A", 0.0), ("B", 0.0), ("A", 3.0), ("B", 3.0), ("A", 4.0)]
+    events = [event.payload for event in monitor.snapshot() if event.category == "strategy.overrun"]
+    assert {event["strategy"] for event in events} == {"slow"}
+    assert [event["throttled"] for event in events[:2]] == [False, True]
+    assert events[0]["elapsed_us"] == 5000 and events[0]["limit_us"] == 1000
+    row = {row["strategy"]: row for row in budget.rows()}["slow"]
+    assert row["throttles"] == 2 and row["conflated"] == 5 and row["skipped"] == 0
+    assert row["overruns"] == len(events) == 4 and row["cooling_down"]
+
+
+def test_skip_mode_drops_bars_and_warm_up_is_not_throttled() -> None:
+    slow = Costly("slow", {"cost_us": 5000})
+    budget = LatencyBudget(limit_us=1000, strikes=1, cooldown=3, mode="skip")
+    runner = LiveRunner({"slow": slow}, budget=budget)
+    _feed(runner, 3)
+    assert slow.seen == [("A", 0.0), ("A", 2.0)]
+    assert budget.strategies["slow"].skipped == 4
+    slow.warmup_bars = 3
+    frame = BarFrame.from_rows(
+        [{"open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0}] * 3,
+        [datetime(2024, 1, 3, 14, 30) + timedelta(minutes=i) for i in range(3)],
+    )
+    assert runner.warm_up({"A": frame}) == 3
+    assert slow.seen[-3:] == [("A", 1.0)] * 3
+    with pytest.raises(ValueError, match="budget mode"):
+        LatencyBudget(mode="drop")
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from leekbot.api.app import app
+from leekbot.backtest.engine import BacktestEngine
+from leekbot.backtest.metrics import MetricsAccumulator
+from leekbot.bench.synthetic import synthetic_universe
+from leekbot.core.events import BarEvent, EventType
+from leekbot.exec.runner import LiveRunner
+from leekbot.strat.base import load_strategy
+from leekbot.strat.momentum_1m import MomentumStrategy
+
+MINUTE = 60 * 10**9
+
+
+def test_running_stats_match_full_series() -> None:
+    rng = np.random.default_rng(3)
+    equity = 100000.0 + np.cumsum(rng.normal(0, 50, 500))
+    acc = MetricsAccumulator(100000.0, periods_per_year=252)
+    for i, value in enumerate(equity):
+        acc.cash = value
+        acc.sample(i * MINUTE)
+    returns = np.diff(np.concatenate(([100000.0], equity))) / np.concatenate(
+        ([100000.0], equity[:-1])
+    )
+    stats = acc.snapshot()
+    assert stats["sharpe"] == pytest.approx(returns.mean() / returns.std() * np.sqrt(252))
+    peaks = np.maximum.accumulate(np.concatenate(([100000.0], equity)))[1:]
+    assert stats["max_dd"] == pytest.approx((equity - peaks).min())
+
+    batch = MetricsAccumulator(100000.0, periods_per_year=252)
+    batch.sample_batch(np.arange(200) * MINUTE, equity[:200])
+    batch.sample_batch(np.arange(200, 500) * MINUTE, equity[200:])
+    batch.cash = equity[-1]
+    for key, value in stats.items():
+        assert batch.snapshot()[key] == pytest.approx(value), key
+
+
+def test_fills_are_marked_and_attributed() -> None:
+    acc = MetricsAccumulator(1000.0)
+    acc.mark("SPY", 10.0)
+    acc.on_fill("a", "SPY", "BUY", 2, 10.0)
+    acc.on_fill("b", "SPY", "SELL", 1, 10.0)
+    acc.mark("SPY", 12.0)
+    acc.sample(MINUTE)
+    assert acc.snapshot()["pnl"] == pytest.approx(2.0)
+    acc.on_fill("a", "SPY", "SELL", 2, 13.0)
+    acc.sample(2 * MINUTE)
+    books = acc.attribution()
+    assert books["a"]["realized"] == pytest.approx(6.0)
+    assert books["b"]["pnl"] == pytest.approx(-2.0)
+    assert acc.snapshot()["win_rate"] == 1.0
+    assert acc.snapshot()["turnover"] == pytest.approx(56.0 / 1000.0)
+
+
+def test_equity_curve_memory_is_bounded() -> None:
+    acc = MetricsAccumulator(100.0, max_points=64)
+    for i in range(10_000):
+        acc.sample(i * MINUTE)
+    assert len(acc.equity_curve) <= 64
+    assert acc.equity_curve[0][0] == 0
+    assert acc.snapshot()["samples"] == 10_000
+
+
+def test_live_runner_metrics_are_served_by_api() -> None:
+    strategy = MomentumStrategy(
+        "momentum_1m", {"lookback": 5, "fast": 2, "slow": 5, "adx_threshold": 0}
+    )
+    runner = LiveRunner({"momentum_1m": strategy})
+    start = datetime(2024, 1, 2, 9, 30)
+    runner.run_bars(
+        BarEvent(EventType.BAR, start + timedelta(minutes=i), "SPY", p, p + 1, p - 1, p, 100, "1m")
+        for i, p in enumerate([100.0, 101, 102, 103, 104, 105, 104, 103, 102, 101])
+    )
+    assert runner.metrics.snapshot()["fills"] > 0
+    body = TestClient(app).get("/metrics").json()
+    assert body["metrics"]["fills"] == runner.metrics.snapshot()["fills"]
+    assert "momentum_1m" in body["strategies"]
+
+
+def test_live_runner_samples_once_per_timestamp_like_the_backtest() -> None:
+    data = synthetic_universe(4, 300)
+    config = {"window": 20, "std_mult": 1.0}
+    result = BacktestEngine(data, {"vwap": load_strategy("vwap_reversion", config)}).run()
+    runner = LiveRunner({"vwap": load_strategy("vwap_reversion", config)})
+    events = []
+    for row in range(300):
+        for symbol, frame in data.items():
+            bar = frame.row(row)
+            events.append(
+                BarEvent(
+                    EventType.BAR,
+                    frame.timestamp(row),
+                    symbol,
+                    bar["open"],
+                    bar["high"],
+                    bar["low"],
+                    bar["close"],
+                    bar["volume"],
+                    "1m",
+                )
+            )
+    runner.run_bars(events)
+    live = runner.metrics.snapshot()
+    assert live["samples"] == 300 and live["fills"] > 0
+    for key, value in result.metrics.items():
+        assert live[key] == pytest.approx(value), key
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, List
+
+import pytest
+
+from leekbot.backtest.engine import BacktestEngine
+from leekbot.backtest.orderbook import ExecutionModel, OrderBook
+from leekbot.core.dataframe import BarFrame, date_range
+from leekbot.core.utils import OrderIntent
+from leekbot.strat.base import Strategy
+
+
+def _bar(open_: float, high: float, low: float, close: float, volume: float = 100.0) -> Dict:
+    return {"open": open_, "high": high, "low": low, "close": close, "volume": volume}
+
+
+def test_stops_and_limits_trigger_on_bar_range() -> None:
+    book = OrderBook()
+    last = _bar(100, 101, 99, 100)
+    book.submit("s", OrderIntent("SPY", "BUY", 1, "stop", stop=103), last)
+    book.submit("s", OrderIntent("SPY", "SELL", 1, "stop", stop=95), last)
+    book.submit("s", OrderIntent("SPY", "BUY", 1, "limit", price=98), last)
+    _, fills = book.submit("s", OrderIntent("SPY", "SELL", 1, "limit", price=99), last)
+    assert [f.price for f in fills] == [100]
+    assert len(book) == 3
+
+    assert book.match("SPY", _bar(100, 102, 99, 101)) == []
+    fills = book.match("SPY", _bar(104, 106, 97, 98))
+    assert sorted((f.order.side, f.order.order_type, f.price) for f in fills) == [
+        ("BUY", "limit", 98),
+        ("BUY", "market", 104),
+    ]
+    assert len(book) == 1
+
+
+def test_cancel_slippage_and_commission() -> None:
+    book = OrderBook(ExecutionModel(slippage_bps=10, commission_per_unit=0.5, min_commission=1))
+    order, _ = book.submit("s", OrderIntent("SPY", "SELL", 4, "stop", stop=90), _bar(1, 1, 1, 100))
+    assert book.cancel(order.order_id)
+    assert book.match("SPY", _bar(80, 80, 80, 80)) == []
+    _, fills = book.submit("s", OrderIntent("SPY", "BUY", 1, "market"), _bar(1, 1, 1, 100))
+    assert fills[0].price == pytest.approx(100.1)
+    assert fills[0].commission == 1.0
+
+
+def test_partial_fills_follow_bar_volume() -> None:
+    book = OrderBook(ExecutionModel(participation=0.1))
+    order, fills = book.submit("s", OrderIntent("SPY", "BUY", 25, "market"), _bar(1, 1, 1, 10, 100))
+    assert [f.qty for f in fills] == [10]
+    fills = book.match("SPY", _bar(11, 12, 10, 11, 100))
+    assert [(f.qty, f.price) for f in fills] == [(10, 11)]
+    assert [f.qty for f in book.match("SPY", _bar(12, 12, 12, 12, 100))] == [5]
+    assert order.remaining == 0 and len(book) == 0
+
+
+def test_match_only_touches_triggered_orders() -> None:
+    book = OrderBook()
+    last = _bar(100, 100, 100, 100)
+    for i in range(20_000):
+        book.submit(
+            "s", OrderIntent(f"S{i % 50}", "BUY", 1, "limit", price=50 + (i // 50) % 40), last
+        )
+    assert book.match("S0", _bar(95, 95, 90, 92)) == []
+    fills = book.match("S0", _bar(89, 90, 87.5, 88))
+    assert len(fills) == 20
+    assert {f.price for f in fills} == {88, 89}
+    assert len(book) == 20_000 - 20
+
+
+class _LimitBuyer(Strategy):
+    def __init__(self, name: str, config: Dict | None = None) -> None:
+        super().__init__(name, config)
+        self.pending: List[OrderIntent] = []
+        self.fills: List[Dict] = []
+
+    def on_bar(self, bar: Dict, account_state: Dict) -> None:
+        if not self.fills and not self.pending and bar["close"] == 100:
+            self.pending.append(OrderIntent(bar["symbol"], "BUY", 1, "limit", price=97))
+
+    def on_fill(self, fill: Dict, account_state: Dict) -> None:
+        self.fills.append(fill)
+
+    def get_orders(self) -> List[OrderIntent]:
+        orders, self.pending = self.pending, []
+        return orders
+
+
+def test_engine_rests_limit_orders_until_reached() -> None:
+    closes = [100.0, 99.0, 98.0, 96.0, 97.0]
+    index = date_range(datetime(2024, 1, 1, 9, 30), periods=len(closes))
+    frame = BarFrame.from_columns(
+        index,
+        {
+            "open": closes,
+            "high": [c + 0.5 for c in closes],
+            "low": [c - 0.5 for c in closes],
+            "close": closes,
+            "volume": [100.0] * len(closes),
+        },
+    )
+    strategy = _LimitBuyer("limit")
+    result = BacktestEngine({"SPY": frame}, {"limit": strategy}).run()
+    assert [(t["timestamp"], t["price"]) for t in result.trades] == [(index[3], 96.0)]
+    assert strategy.fills[0]["price"] == 96.0
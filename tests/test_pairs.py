@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from leekbot.core.dataframe import BarFrame
+from leekbot.core.indicators import BatchRollingCovariance, BatchRollingVariance, RollingVariance
+from leekbot.core.pairs import (
+    ADF_CRITICAL,
+    ScanCriteria,
+    align_closes,
+    load_pairs,
+    save_pairs,
+    scan_pairs,
+)
+from leekbot.strat.pairs_stat_arb import PairsStatArb
+
+
+def test_batch_variance_matches_scalar_bit_for_bit() -> None:
+    rng = np.random.default_rng(0)
+    values = 100 + np.cumsum(rng.normal(0, 1, (6, 400)), axis=1)
+    batch = BatchRollingVariance(6, 9)
+    scalars = [RollingVariance(9) for _ in range(6)]
+    for t in range(values.shape[1]):
+        idx = np.flatnonzero(rng.random(6) < 0.6)
+        got = batch.update(idx, values[idx, t])
+        want = [scalars[i].update(float(values[i, t])) for i in idx]
+        np.testing.assert_array_equal(got, want)
+        np.testing.assert_array_equal(batch.mean[idx], [scalars[i].mean for i in idx])
+
+
+def test_batch_covariance_tracks_the_rolling_slope() -> None:
+    rng = np.random.default_rng(1)
+    x = 50 + np.cumsum(rng.normal(0, 1, (3, 500)), axis=1)
+    y = np.array([[0.5], [1.0], [2.5]]) * x + rng.normal(0, 0.1, x.shape)
+    cov = BatchRollingCovariance(3, 30)
+    idx = np.arange(3)
+    for t in range(x.shape[1]):
+        beta = cov.update(idx, x[:, t], y[:, t])
+        if t < 29:
+            assert np.isnan(beta).all()
+    want = [np.polyfit(x[i, -30:], y[i, -30:], 1)[0] for i in range(3)]
+    np.testing.assert_allclose(beta, want, rtol=1e-9)
+
+
+def _feed(strat: PairsStatArb, closes: dict, positions: dict | None = None) -> list:
+    state = {"positions": positions or {}}
+    for symbol, close in closes.items():
+        strat.on_bar({"symbol": symbol, "close": close}, state)
+    return strat.get_orders()
+
+
+def test_pairs_trade_the_spread_and_only_touch_their_legs() -> None:
+    strat = PairsStatArb(
+        "pairs", {"pairs": [("A", "B"), ("C", "D"), ("A", "A")], "window": 5, "threshold": 1.5}
+    )
+    assert [pos for pos, _ in strat.legs["A"]] == [0, 2]
+    for i in range(5):
+        assert _feed(strat, {"A": 100.0 + i % 2, "B": 100.0, "C": 50.0, "D": 50.0}) == []
+    # only A moved: its pair with B trades, C/D stay flat and A/A has a zero spread
+    orders = _feed(strat, {"A": 110.0, "B": 100.0, "C": 50.0, "D": 50.0})
+    assert [(o.symbol, o.side, o.tag) for o in orders] == [
+        ("A", "SELL", "pairs_short_a"),
+        ("B", "BUY", "pairs_long_b"),
+    ]
+    # a leg without its partner samples nothing
+    assert _feed(strat, {"C": 10.0}) == [] and strat.sampled == []
+
+
+def test_rolling_hedge_ratio_scores_the_hedged_spread() -> None:
+    rng = np.random.default_rng(2)
+    b = 100 + np.cumsum(rng.normal(0, 1, 200))
+    a = 2 * b + rng.normal(0, 0.05, 200)
+    strat = PairsStatArb(
+        "pairs", {"pairs": [("A", "B")], "window": 20, "hedge_window": 40, "threshold": 3.0}
+    )
+    for t in range(200):
+        _feed(strat, {"A": a[t], "B": b[t]}, {"A": 0, "B": 0})
+    assert strat.spreads.count[0] == 20
+    beta = strat.betas.beta(np.array([0]))[0]
+    assert abs(beta - 2.0) < 0.01
+    # a jump in a alone is far outside the hedged spread's band
+    orders = _feed(strat, {"A": a[-1] + 5.0, "B": b[-1]}, {"A": 0, "B": 0})
+    assert [o.side for o in orders] == ["SELL", "BUY"]
+
+
+def _universe() -> dict:
+    rng = np.random.default_rng(3)
+    n = 1500
+    epochs = np.arange(n, dtype=np.int64) * 60_000_000_000
+    base = 100 + np.cumsum(rng.normal(0, 1, n))
+    spread = np.zeros(n)
+    for t in range(1, n):
+        spread[t] = 0.8 * spread[t - 1] + rng.normal(0, 0.5)
+    closes = {
+        "KO": base,
+        "PEP": 0.5 * base + 20 + spread,
+        "XOM": 80 + np.cumsum(rng.normal(0, 1, n)),
+        "CVX": 90 + np.cumsum(rng.normal(0, 1, n)),
+    }
+    # one symbol starts late and misses bars: it only narrows the shared period
+    frames = {symbol: BarFrame(epochs, {"close": close}) for symbol, close in closes.items()}
+    late = np.r_[200:700, 701:n]
+    frames["CVX"] = BarFrame(epochs[late], {"close": closes["CVX"][late]})
+    return frames
+
+
+def test_scan_finds_the_cointegrated_pair(tmp_path: Path) -> None:
+    frames = _universe()
+    criteria = ScanCriteria(min_corr=0.3, top_k=2)
+    pairs = scan_pairs(frames, criteria, processes=1)
+    assert {pairs[0].a, pairs[0].b} == {"KO", "PEP"}
+    best = pairs[0] if pairs[0].a == "PEP" else None
+    assert best is not None and abs(best.hedge - 0.5) < 0.02
+    assert best.adf < ADF_CRITICAL[0.01] and 2 < best.half_life < 8
+    assert scan_pairs(frames, criteria, processes=2) == pairs
+
+    path = tmp_path / "pairs.yaml"
+    save_pairs(path, pairs)
+    assert load_pairs(path, 1) == [(best.a, best.b, best.hedge)]
+    strat = PairsStatArb("pairs", {"pairs_file": str(path), "max_pairs": 1})
+    assert strat.pairs == [("PEP", "KO")] and strat.hedge[0] == best.hedge
+
+    symbols, closes = align_closes(frames)
+    assert closes.shape == (4, 1300) and symbols[-1] == "CVX"
+    assert closes[3, 500] == closes[3, 499]  # the missing bar carries the last close
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from leekbot.backtest.engine import BacktestEngine
+from leekbot.core.events import BarEvent, EventType
+from leekbot.core.profiler import CallStats, StrategyProfiler, compare, format_rows
+from leekbot.exec.runner import LiveRunner
+from leekbot.storage.barstore import load_bars
+from leekbot.strat.momentum_1m import MomentumStrategy
+from tests.helpers import write_bars_csv
+
+
+def _engine(tmp_path: Path, profiler: StrategyProfiler | None = None) -> BacktestEngine:
+    data = {
+        "SPY": load_bars(write_bars_csv(tmp_path / "SPY.csv", 120)),
+        "QQQ": load_bars(write_bars_csv(tmp_path / "QQQ.csv", 120)),
+    }
+    strategies = {"mom": MomentumStrategy("mom", {"fast": 2, "slow": 5, "qty": 1})}
+    return BacktestEngine(data, strategies, profiler=profiler)
+
+
+def test_profiled_run_counts_calls_and_matches_plain_run(tmp_path: Path) -> None:
+    profiler = StrategyProfiler(allocations=True)
+    profiled = _engine(tmp_path, profiler).run()
+    plain = _engine(tmp_path).run()
+    assert profiled.trades == plain.trades
+    assert profiled.metrics == plain.metrics
+
+    records = profiler.records
+    assert records[("mom", "on_bar", "SPY")].calls == 120
+    assert records[("mom", "on_bar", "QQQ")].calls == 120
+    assert records[("mom", "get_orders", "*")].calls == 120
+    fills = sum(stats.calls for key, stats in records.items() if key[1] == "on_fill")
+    assert fills == len(plain.trades)
+
+    rows = profiler.rows(sort="calls")
+    assert [(row["strategy"], row["method"]) for row in rows][:1] == [("mom", "on_bar")]
+    assert rows[0]["calls"] == 240
+    by_symbol = profiler.rows(by_symbol=True)
+    assert {row["symbol"] for row in by_symbol if row["method"] == "on_bar"} == {"SPY", "QQQ"}
+    assert "on_bar" in format_rows(rows, top=2)
+
+
+def test_histogram_quantiles() -> None:
+    stats = CallStats()
+    for elapsed in [100] * 98 + [10_000, 1_000_000]:
+        stats.add(elapsed)
+    assert stats.quantile(0.5) == 127
+    assert stats.quantile(0.99) == 16383
+    assert stats.summary()["max_us"] == 1000.0
+
+
+def test_profile_roundtrip_and_compare(tmp_path: Path) -> None:
+    baseline = StrategyProfiler()
+    baseline.stats("mom", "on_bar", "SPY").add(1000)
+    current = StrategyProfiler()
+    current.stats("mom", "on_bar", "SPY").add(1500)
+    current.stats("new", "on_bar", "SPY").add(10)
+
+    baseline.save(tmp_path / "base.json")
+    loaded = StrategyProfiler.load(tmp_path / "base.json")
+    assert loaded.records == baseline.records
+
+    changes = compare(loaded, current)
+    assert len(changes) == 1
+    assert changes[0]["change"] == 0.5
+
+
+def test_live_runner_dispatches_through_profiler() -> None:
+    profiler = StrategyProfiler()
+    strategies = {"mom": MomentumStrategy("mom", {"fast": 2, "slow": 5, "qty": 1})}
+    runner = LiveRunner(strategies, profiler=profiler)
+    start = datetime(2024, 1, 2, 9, 30)
+    runner.run_bars(
+        BarEvent(EventType.BAR, start + timedelta(minutes=i), "SPY", p, p + 1, p - 1, p, 100, "1m")
+        for i, p in enumerate(100.0 + i % 7 for i in range(30))
+    )
+    assert runner.strategies["mom"] is strategies["mom"]
+    assert profiler.records[("mom", "on_bar", "SPY")].calls == 30
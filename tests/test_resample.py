@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+from leekbot.backtest.engine import BacktestEngine
+from leekbot.core.dataframe import BarFrame, date_range, parse_freq
+from leekbot.core.events import BarEvent, EventType
+from leekbot.core.resample import Resampler, resample
+from leekbot.core.utils import OrderIntent
+from leekbot.strat.base import Strategy
+
+_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def _minutes(start: datetime, periods: int, seed: int = 0) -> BarFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, periods))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    return BarFrame.from_columns(
+        date_range(start, periods=periods),
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + 0.05,
+            "low": np.minimum(open_, close) - 0.05,
+            "close": close,
+            "volume": rng.integers(1, 100, periods).astype(float),
+        },
+    )
+
+
+def _stream(frame: BarFrame, timeframe: str, calendar: str | None = None) -> BarFrame:
+    resampler = Resampler([timeframe], calendar)
+    done = []
+    for pos, row in enumerate(frame):
+        done += resampler.update("SPY", int(frame.epochs[pos]), *(row[k] for k in _FIELDS))
+    done += resampler.flush()
+    return BarFrame(
+        np.array([bar.start for bar in done], dtype=np.int64),
+        {name: [getattr(bar, name) for bar in done] for name in _FIELDS},
+    )
+
+
+def _assert_same(a: BarFrame, b: BarFrame) -> None:
+    assert a.epochs.tolist() == b.epochs.tolist()
+    for name in _FIELDS:
+        np.testing.assert_allclose(a[name], b[name])
+
+
+def test_parse_freq_and_date_range() -> None:
+    assert parse_freq("15m") == parse_freq("15min") == timedelta(minutes=15)
+    assert parse_freq("1H") == timedelta(hours=1)
+    assert parse_freq("1d") == timedelta(days=1)
+    index = date_range(datetime(2024, 1, 1), datetime(2024, 1, 1, 2), freq="30min")
+    assert len(index) == 5
+    with pytest.raises(ValueError):
+        parse_freq("1mo")
+
+
+@pytest.mark.parametrize("timeframe", ["5m", "15m", "1h", "1d"])
+def test_streaming_matches_batch_without_calendar(timeframe: str) -> None:
+    frame = _minutes(datetime(2024, 1, 2, 23, 3), 3000)
+    batch = resample(frame, timeframe)
+    _assert_same(_stream(frame, timeframe), batch)
+    first = batch.epochs[1] - batch.epochs[0]
+    assert first == parse_freq(timeframe) // timedelta(microseconds=1) * 1000
+    assert batch["volume"].sum() == frame["volume"].sum()
+
+
+def test_session_aligned_buckets() -> None:
+    # 8:00 to 17:59 New York time (EST, UTC-5) on a Friday and the following Monday
+    frame = BarFrame(
+        np.concatenate(
+            [
+                _minutes(datetime(2024, 1, 5, 13), 600).epochs,
+                _minutes(datetime(2024, 1, 8, 13), 600).epochs,
+            ]
+        ),
+        {name: np.tile(_minutes(datetime(2024, 1, 5, 13), 600)[name], 2) for name in _FIELDS},
+    )
+    hourly = resample(frame, "1h", "XNYS")
+    _assert_same(_stream(frame, "1h", "XNYS"), hourly)
+    stamps = [ts.strftime("%d %H:%M") for ts in hourly.index]
+    assert stamps[:7] == [f"05 {h}:30" for h in range(14, 21)]
+    assert stamps[7] == "08 14:30" and len(stamps) == 14
+    assert hourly["volume"][6] == frame.between(datetime(2024, 1, 5, 20, 30))["volume"][:30].sum()
+
+    daily = resample(frame, "1d", "XNYS")
+    _assert_same(_stream(frame, "1d", "XNYS"), daily)
+    assert len(daily) == 2
+    session = frame.between(datetime(2024, 1, 5, 14, 30), datetime(2024, 1, 5, 20, 59))
+    assert daily["open"][0] == session["open"][0]
+    assert daily["close"][0] == session["close"][-1]
+    assert daily["high"][0] == session["high"].max()
+
+
+def test_bucket_completes_on_its_last_base_bar() -> None:
+    resampler = Resampler(["5m", "15m"])
+    start = datetime(2024, 1, 2, 9, 30)
+    emitted: List[List[str]] = []
+    for i in range(15):
+        event = BarEvent(
+            EventType.BAR, start + timedelta(minutes=i), "SPY", 1, 2, 0.5, 1.5, 10, "1m"
+        )
+        emitted.append([bar.timeframe for bar in resampler.on_event(event)])
+    assert [i for i, tfs in enumerate(emitted) if tfs] == [4, 9, 14]
+    assert emitted[14] == ["5m", "15m"]
+    assert resampler.flush() == []
+
+
+class _Recorder(Strategy):
+    def __init__(self, name: str, config: Dict | None = None) -> None:
+        super().__init__(name, config)
+        self.seen: List[Dict] = []
+
+    def on_bar(self, bar: Dict, account_state: Dict) -> None:
+        self.seen.append(bar)
+
+    def get_orders(self) -> List[OrderIntent]:
+        return []
+
+
+def test_engine_delivers_subscribed_timeframes() -> None:
+    frame = _minutes(datetime(2024, 1, 2, 9, 30), 60)
+    plain = _Recorder("plain")
+    multi = _Recorder("multi", {"timeframes": ["5m", "15m"]})
+    BacktestEngine({"SPY": frame}, {"plain": plain, "multi": multi}).run()
+    assert len(plain.seen) == 60
+    higher = [bar for bar in multi.seen if "timeframe" in bar]
+    assert [bar["timeframe"] for bar in higher].count("5m") == 12
+    assert [bar["timeframe"] for bar in higher].count("15m") == 4
+    first = higher[0]
+    assert first["timestamp"] == datetime(2024, 1, 2, 9, 30)
+    assert first["close"] == multi.seen[4]["close"]
+    assert multi.seen[5]["timeframe"] == "5m"
+
+
+def test_engine_flushes_the_trailing_partial_bucket(tmp_path) -> None:
+    frame = _minutes(datetime(2024, 1, 2, 9, 30), 62)
+    multi = _Recorder("multi", {"timeframes": ["5m", "15m"]})
+    BacktestEngine({"SPY": frame}, {"multi": multi}).run()
+    higher = [bar for bar in multi.seen if "timeframe" in bar]
+    for timeframe in ("5m", "15m"):
+        got = [bar for bar in higher if bar["timeframe"] == timeframe]
+        want = resample(frame, timeframe)
+        assert [bar["close"] for bar in got] == pytest.approx(want["close"].tolist())
+    assert higher[-2:][0]["timestamp"] == datetime(2024, 1, 2, 10, 30)
+
+    engine = BacktestEngine({"SPY": frame}, {"multi": _Recorder("multi", multi.config)})
+    engine.run(until=int(frame.epochs[31]))
+    engine.checkpoint(tmp_path / "run.ckpt")
+    resumed = BacktestEngine.resume(tmp_path / "run.ckpt", {"SPY": frame})
+    resumed.run()
+    assert resumed.strategies["multi"].seen == multi.seen
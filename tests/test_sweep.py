@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from leekbot.backtest.sweep import SearchSpace, run_sweep
+from tests.helpers import write_bars_csv
+
+
+def test_search_space_grid_and_random() -> None:
+    grid = SearchSpace.from_dict(
+        {"strategy": "vol_trend_vix", "grid": {"window": [5, 10, 15]}, "params": {"x": 1}}
+    )
+    assert [c["window"] for c in grid.candidates()] == [5, 10, 15]
+    assert all(c["x"] == 1 for c in grid.candidates())
+    rand = SearchSpace.from_dict(
+        {
+            "strategy": "vwap_reversion",
+            "random": {"window": {"low": 5, "high": 30}, "std_mult": {"low": 1.0, "high": 3.0}},
+            "samples": 4,
+            "seed": 3,
+        }
+    )
+    draws = list(rand.candidates())
+    assert len(draws) == 4
+    assert draws == list(rand.candidates())
+    assert all(isinstance(d["window"], int) and 1.0 <= d["std_mult"] <= 3.0 for d in draws)
+
+
+def test_run_sweep_ranks_by_objective(tmp_path) -> None:
+    path = write_bars_csv(tmp_path / "SPY.csv")
+    space = SearchSpace.from_dict(
+        {"strategy": "vol_reversion_vix", "grid": {"window": [10, 20], "limit": [1.0, 2.0]}}
+    )
+    streamed = []
+    parallel = run_sweep(
+        {"SPY": path}, space, objective="pnl", processes=2, on_result=streamed.append
+    )
+    serial = run_sweep({"SPY": path}, space, objective="pnl", processes=1)
+    assert len(parallel) == len(streamed) == 4
+    pnls = [result.metrics["pnl"] for result in parallel]
+    assert pnls == sorted(pnls, reverse=True)
+    assert sorted(pnls) == sorted(result.metrics["pnl"] for result in serial)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List
+
+import pytest
+
+from leekbot.core.dataframe import to_epoch_ns
+from leekbot.core.events import EventType, TickEvent
+from leekbot.core.ticks import TickAggregator, aggregate
+from leekbot.exec.runner import LiveRunner
+from leekbot.strat.momentum_1m import MomentumStrategy
+
+START = datetime(2024, 1, 2, 9, 30)
+
+
+def _tick(seconds: float, symbol: str, price: float, size: float = 1.0) -> TickEvent:
+    ts = START + timedelta(seconds=seconds)
+    return TickEvent(EventType.TICK, ts, symbol, price - 0.01, price + 0.01, price, size)
+
+
+def test_time_bars_close_on_any_later_tick() -> None:
+    agg = TickAggregator("time", "1m")
+    assert agg.on_tick(_tick(1, "BTC", 100, 2)) == []
+    assert agg.on_tick(_tick(20, "BTC", 103)) == []
+    assert agg.on_tick(_tick(30, "ETH", 10)) == []
+    assert agg.on_tick(_tick(59, "BTC", 99)) == []
+    closed = agg.on_tick(_tick(61, "ETH", 11))
+    assert sorted(bar.symbol for bar in closed) == ["BTC", "ETH"]
+    btc = next(bar for bar in closed if bar.symbol == "BTC")
+    assert (btc.open, btc.high, btc.low, btc.close, btc.volume) == (100, 103, 99, 99, 4)
+    assert btc.timestamp == START and btc.timeframe == "1m"
+    assert len(agg) == 1
+    assert [bar.symbol for bar in agg.close_due(to_epoch_ns(START + timedelta(minutes=2)))] == [
+        "ETH"
+    ]
+
+
+def test_volume_and_dollar_bars() -> None:
+    volume = TickAggregator("volume", 10)
+    closed = [bar for i in range(25) for bar in volume.on_tick(_tick(i, "BTC", 100 + i, 1))]
+    assert [bar.volume for bar in closed] == [10, 10]
+    assert [bar.open for bar in closed] == [100, 110]
+    assert [bar.volume for bar in volume.flush()] == [5]
+
+    dollar = TickAggregator("dollar", 1000)
+    closed = [bar for i in range(30) for bar in dollar.on_tick(_tick(i, "ETH", 100, 3))]
+    # 4 ticks of 300 reach 1000; the fourth is not split
+    assert [bar.volume for bar in closed] == [12] * 7
+    assert closed[0].timeframe == "dollar:1000"
+    with pytest.raises(ValueError):
+        TickAggregator("range", 5)
+
+
+def test_aggregated_stream_feeds_live_runner() -> None:
+    async def ticks() -> AsyncIterator[TickEvent]:
+        for i in range(600):
+            yield _tick(i * 5, "BTC", 100 + (i % 40) * 0.5 - (i // 40) * 0.3)
+
+    async def main() -> List[int]:
+        runner = LiveRunner({"mom": MomentumStrategy("mom", {"fast": 2, "slow": 5})})
+        seen = []
+        async for bar in aggregate(ticks(), TickAggregator("time", "1m")):
+            runner.on_bar(bar)
+            seen.append(to_epoch_ns(bar.timestamp))
+        return seen
+
+    seen = asyncio.run(main())
+    assert len(seen) == 50
+    assert seen == sorted(seen)
+
+
+def test_exchange_ticks_and_their_bars_are_utc(monkeypatch: pytest.MonkeyPatch) -> None:
+    from leekbot.data import exchange_ws
+
+    async def no_wait(delay: float) -> None:
+        return None
+
+    monkeypatch.setattr(exchange_ws.asyncio, "sleep", no_wait)
+
+    async def first_ticks() -> List[TickEvent]:
+        stream = exchange_ws.CryptoWebSocketClient(["kraken"]).stream()
+        return [await stream.__anext__() for _ in range(3)]
+
+    ticks = asyncio.run(first_ticks())
+    assert all(tick.timestamp.tzinfo is not None for tick in ticks)
+    agg = TickAggregator("volume", 1e-9)
+    bars = [bar for tick in ticks for bar in agg.on_tick(tick)]
+    assert len(bars) == 3 and bars[0].timestamp == ticks[0].timestamp
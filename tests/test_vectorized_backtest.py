@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from leekbot.backtest.engine import BacktestEngine
+from leekbot.backtest.vectorized import VectorizedBacktestEngine, position_path
+from leekbot.core.dataframe import BarFrame, to_epoch_ns
+from leekbot.strat.base import load_strategy
+
+
+def _frame(seed: int, bars: int = 600) -> BarFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.3, bars))
+    spread = np.abs(rng.normal(0, 0.2, bars))
+    epochs = to_epoch_ns(datetime(2024, 1, 2, 9, 30)) + np.arange(bars) * 60_000_000_000
+    columns = {
+        "open": close - rng.normal(0, 0.1, bars),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.integers(100, 1000, bars).astype(float),
+    }
+    return BarFrame(epochs, columns)
+
+
+def test_position_path_steps_toward_signal() -> None:
+    side = np.array([1, 1, 0, -1, -1, -1, 1, 0, 1])
+    assert position_path(side).tolist() == [1, 1, 1, 0, -1, -1, 0, 0, 1]
+
+
+@pytest.mark.parametrize(
+    "name, config",
+    [
+        ("momentum_1m", {"lookback": 20, "fast": 5, "slow": 15, "adx_threshold": 10}),
+        ("vwap_reversion", {"window": 20, "std_mult": 1.5}),
+        ("orb_breakout", {"open_window": 5, "atr_window": 14}),
+        ("breakout_volexp", {"window": 30}),
+        ("vol_trend_vix", {"window": 15}),
+        ("vol_reversion_vix", {"window": 20, "limit": 1.5}),
+    ],
+)
+def test_vectorized_trades_match_event_engine(name: str, config: dict) -> None:
+    _assert_parity({"SPY": _frame(1), "QQQ": _frame(2)}, name, config)
+
+
+@pytest.mark.parametrize(
+    "bars, config",
+    [
+        # shorter than the opening range
+        (3, {"open_window": 5, "atr_window": 2}),
+        # an opening range longer than the history the strategy keeps never forms
+        (300, {"open_window": 120, "atr_window": 14}),
+    ],
+)
+def test_orb_short_history_matches_event_engine(bars: int, config: dict) -> None:
+    data = {"SPY": _frame(1, bars)}
+    signals = load_strategy("orb_breakout", config).generate_signals(data["SPY"])
+    assert not signals.side.any()
+    _assert_parity(data, "orb_breakout", config)
+
+
+def test_breakout_volexp_smallest_window_matches_event_engine() -> None:
+    # window 2 averages a single close-to-close move; window 1 has none to average
+    _assert_parity({"SPY": _frame(1)}, "breakout_volexp", {"window": 2})
+    with pytest.raises(ValueError, match="at least 2"):
+        load_strategy("breakout_volexp", {"window": 1})
+
+
+def _assert_parity(data: dict, name: str, config: dict) -> None:
+    event = BacktestEngine(data, {name: load_strategy(name, config)}).run()
+    batch = VectorizedBacktestEngine(data, {name: load_strategy(name, config)}).run()
+    assert len(batch.trades) == len(event.trades)
+    for got, want in zip(batch.trades, event.trades):
+        assert (got["timestamp"], got["symbol"], got["side"], got["qty"]) == (
+            want["timestamp"],
+            want["symbol"],
+            want["side"],
+            want["qty"],
+        )
+        assert got["price"] == pytest.approx(want["price"])
+    for key in ("pnl", "sharpe", "sortino", "max_dd", "max_dd_duration", "turnover", "win_rate"):
+        assert batch.metrics[key] == pytest.approx(event.metrics[key], rel=1e-6, abs=1e-9)
+    assert len(batch.equity_curve) == len(event.equity_curve)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import numpy as np
+
+from leekbot.backtest.engine import BacktestEngine
+from leekbot.backtest.metrics import MetricsAccumulator
+from leekbot.backtest.sweep import SearchSpace
+from leekbot.backtest.walkforward import WalkForwardRunner, make_folds
+from leekbot.core.dataframe import to_epoch_ns
+from leekbot.storage.barstore import load_bars
+from leekbot.strat.base import load_strategy
+from tests.helpers import write_bars_csv
+
+
+def test_make_folds_rolls_out_of_sample_windows() -> None:
+    epochs = np.arange(100, dtype=np.int64)
+    folds = make_folds(epochs, train_bars=40, test_bars=20)
+    assert [(f.train_start, f.test_start, f.test_end) for f in folds] == [
+        (0, 40, 59),
+        (20, 60, 79),
+        (40, 80, 99),
+    ]
+
+
+def test_walk_forward_stitches_out_of_sample_trades(tmp_path) -> None:
+    path = write_bars_csv(tmp_path / "SPY.csv", bars=400)
+    space = SearchSpace.from_dict(
+        {"strategy": "vol_reversion_vix", "grid": {"window": [10, 20], "limit": [1.0, 1.5]}}
+    )
+    runner = WalkForwardRunner(
+        {"SPY": path}, space, train_bars=100, test_bars=50, objective="pnl", processes=1
+    )
+    result = runner.run()
+    assert len(result.folds) == 6
+    for fold_result in result.folds:
+        assert fold_result.params in list(space.candidates())
+    assert result.trades
+    for trade in result.trades:
+        epoch = to_epoch_ns(trade["timestamp"])
+        assert any(f.fold.test_start <= epoch <= f.fold.test_end for f in result.folds)
+    assert len(result.equity_curve) == 6 * 50
+    assert result.metrics["fills"] == len(result.trades)
+    parallel = WalkForwardRunner(
+        {"SPY": path}, space, train_bars=100, test_bars=50, objective="pnl", processes=2
+    ).run()
+    assert [f.params for f in parallel.folds] == [f.params for f in result.folds]
+    assert parallel.metrics == result.metrics
+
+
+def test_contiguous_folds_with_the_same_params_match_one_continuous_run(tmp_path) -> None:
+    path = write_bars_csv(tmp_path / "SPY.csv", bars=400)
+    space = SearchSpace.from_dict({"strategy": "vwap_reversion", "grid": {"window": [20]}})
+    result = WalkForwardRunner(
+        {"SPY": path}, space, train_bars=100, test_bars=50, objective="pnl", processes=1
+    ).run()
+    assert len(result.folds) == 6
+    data = {"SPY": load_bars(path)}
+    metrics = MetricsAccumulator(100000.0)
+    strategy = load_strategy("vwap_reversion", {"window": 20})
+    engine = BacktestEngine(data, {"vwap_reversion": strategy}, metrics=metrics)
+    continuous = engine.run(trade_from=int(data["SPY"].epochs[100]))
+    # the features stay warm across folds, so no fold starts idle
+    assert result.trades and result.trades == continuous.trades
+    assert result.metrics == metrics.snapshot()
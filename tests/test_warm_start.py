@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List
+
+from leekbot.bench.synthetic import synthetic_universe
+from leekbot.core.dataframe import BarFrame
+from leekbot.core.events import BarEvent, EventType, FillEvent
+from leekbot.exec.runner import LiveRunner
+from leekbot.strat.base import load_strategy
+
+CONFIGS = {
+    "vol_reversion_vix": {"window": 20, "limit": 1.5},
+    "orb_breakout": {"open_window": 5, "atr_window": 14},
+    "vwap_reversion": {"window": 20, "std_mult": 1.0},
+    "xsec_momentum": {"lookback": 10, "top_n": 2, "rebalance": 7},
+}
+
+
+class _Recording(LiveRunner):
+    def __init__(self, configs: Dict[str, Dict] = CONFIGS, **kwargs: object) -> None:
+        strategies = {name: load_strategy(name, dict(config)) for name, config in configs.items()}
+        super().__init__(strategies, **kwargs)
+        self.fills: List[tuple] = []
+
+    def on_fill(self, fill: FillEvent, strategy: str | None = None) -> None:
+        self.fills.append((strategy, fill.timestamp, fill.symbol, fill.side, fill.qty, fill.price))
+        super().on_fill(fill, strategy)
+
+
+def _events(data: Dict[str, BarFrame], start: int, stop: int) -> List[BarEvent]:
+    events = []
+    for row in range(start, stop):
+        for symbol, frame in data.items():
+            bar = frame.row(row)
+            events.append(
+                BarEvent(
+                    EventType.BAR,
+                    frame.timestamp(row),
+                    symbol,
+                    bar["open"],
+                    bar["high"],
+                    bar["low"],
+                    bar["close"],
+                    bar["volume"],
+                    "1m",
+                )
+            )
+    return events
+
+
+def test_restarted_runner_continues_from_its_snapshot(tmp_path: Path) -> None:
+    data = synthetic_universe(6, 400)
+    whole = _Recording()
+    whole.run_bars(_events(data, 0, 400))
+    path = tmp_path / "warm.pkl"
+    first = _Recording(warm_state=path)
+    first.run_bars(_events(data, 0, 200))
+    assert path.exists()
+
+    restarted = _Recording(warm_state=path)
+    restarted.positions = dict(first.positions)
+    assert restarted.features.count("SYM0000") == 200
+    restarted.run_bars(_events(data, 200, 400))
+    cut = data["SYM0000"].timestamp(200)
+    later = [fill for fill in whole.fills if fill[1] >= cut]
+    assert later and restarted.fills == later
+    assert {fill[0] for fill in later} == set(CONFIGS)
+
+    changed = dict(CONFIGS["vol_reversion_vix"], window=21)
+    runner = LiveRunner({"vol_reversion_vix": load_strategy("vol_reversion_vix", changed)})
+    assert runner.load_warm_state(path) == []
+    assert not runner.strategies["vol_reversion_vix"].zscores
+
+
+def test_warm_up_replays_only_the_needed_history() -> None:
+    # the rebalance phase of xsec_momentum counts timestamps since its start, so leave it out
+    configs = {name: config for name, config in CONFIGS.items() if name != "xsec_momentum"}
+    data = synthetic_universe(6, 400)
+    whole = _Recording(configs)
+    whole.run_bars(_events(data, 0, 400))
+
+    cold = _Recording(configs)
+    assert cold.warmup_bars() == 100
+    history = {symbol: frame.slice_rows(0, 250) for symbol, frame in data.items()}
+    assert cold.warm_up(history) == 100
+    assert cold.fills == [] and cold.features.count("SYM0000") == 100
+    cut = data["SYM0000"].timestamp(250)
+    for _, ts, symbol, side, qty, _ in whole.fills:
+        if ts < cut:
+            cold.positions[symbol] = cold.positions.get(symbol, 0) + (
+                qty if side == "BUY" else -qty
+            )
+    cold.run_bars(_events(data, 250, 400))
+    later = [fill for fill in whole.fills if fill[1] >= cut]
+    assert later and cold.fills == later